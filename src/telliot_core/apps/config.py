@@ -1,10 +1,16 @@
 """telliot_core.apps.config module"""
+import copy
 import json
 import logging
+import marshal
+import os
 from datetime import datetime
 from pathlib import Path
+from typing import Any
+from typing import Dict
 from typing import Literal
 from typing import Optional
+from typing import Tuple
 from typing import Type
 from typing import Union
 
@@ -12,8 +18,14 @@ import yaml
 from clamfig import deserialize
 from clamfig import Serializable
 from clamfig import serialize
-from yaml import Dumper as Dumper
-from yaml import Loader as Loader
+
+try:
+    # libyaml bindings are much faster than the pure Python parser
+    from yaml import CDumper as Dumper
+    from yaml import CLoader as Loader
+except ImportError:
+    from yaml import Dumper  # type: ignore
+    from yaml import Loader  # type: ignore
 
 from telliot_core.utils.home import telliot_homedir
 
@@ -21,6 +33,15 @@ logger = logging.getLogger(__name__)
 
 config_formats = Literal["yaml", "json"]
 
+#: Folder (in the config folder) holding compiled snapshots of config files
+SNAPSHOT_DIR = ".snapshots"
+
+#: Bumped when the snapshot layout changes
+SNAPSHOT_VERSION = 1
+
+#: Parsed config file contents by path, with the file's (mtime_ns, size) when parsed
+_state_cache: Dict[Path, Tuple[Tuple[int, int], Any]] = {}
+
 
 class ConfigOptions(Serializable):
     """An object used to manage configuration options
@@ -43,12 +64,17 @@ class ConfigFile:
     def config_file(self) -> Path:
         return self.config_dir / f"{self.name}.{self.config_format}"
 
+    @property
+    def snapshot_file(self) -> Path:
+        return self.config_dir / SNAPSHOT_DIR / f"{self.name}.{self.config_format}.marshal"
+
     def __init__(
         self,
         name: str,
         config_type: Type[ConfigOptions],
         config_dir: Optional[Union[str, Path]] = None,
         config_format: config_formats = "yaml",
+        snapshot: bool = False,
     ) -> None:
         """Construct a new ConfigFile object
 
@@ -62,8 +88,15 @@ class ConfigFile:
             config_format:
                 Format of config file ('yaml' or 'json')
 
+            snapshot:
+                Keep a compiled (marshal) copy of the parsed file, so later
+                processes skip parsing while the file is unchanged
+
         """
 
+        #: Use a compiled snapshot of the file
+        self.snapshot = snapshot
+
         #: Configuration Name
         self.name = name
 
@@ -90,28 +123,63 @@ class ConfigFile:
     def get_config(self) -> ConfigOptions:
         """Load Configuration from a .yaml file"""
 
-        if self.config_format == "yaml":
+        if self.config_format not in ("yaml", "json"):
+            raise AttributeError(f"Invalid config file type: {self.config_format}")
 
-            with open(self.config_file, "r") as f:
-                try:
-                    state = yaml.load(f, Loader=Loader)
-                    config = deserialize(state)
-                except Exception:
-                    raise Exception(f"Error reading config file {self.config_file}")
+        try:
+            # Deserializing may modify the state, so the cached copy is left untouched
+            config = deserialize(copy.deepcopy(self._read_state()))
+        except Exception:
+            raise Exception(f"Error reading config file {self.config_file}")
+
+        return config  # type: ignore
 
-        elif self.config_format == "json":
+    def _read_state(self) -> Any:
+        """Parsed file contents, reused while the file's mtime and size are unchanged"""
 
-            with open(self.config_file, "r") as f:
-                try:
+        path = self.config_file
+        stat = path.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+
+        cached = _state_cache.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        state = self._read_snapshot(key) if self.snapshot else None
+        if state is None:
+            with open(path, "r") as f:
+                if self.config_format == "yaml":
+                    state = yaml.load(f, Loader=Loader)
+                else:
                     state = json.load(f)
-                    config = deserialize(state)
-                except Exception:
-                    raise Exception(f"Error reading config file {self.config_file}")
 
-        else:
-            raise AttributeError(f"Invalid config file type: {self.config_format}")
+            if self.snapshot:
+                self._write_snapshot(key, state)
 
-        return config  # type: ignore
+        _state_cache[path] = (key, state)
+        return state
+
+    def _read_snapshot(self, key: Tuple[int, int]) -> Any:
+        try:
+            snapshot = marshal.loads(self.snapshot_file.read_bytes())
+        except (OSError, ValueError, EOFError, TypeError):
+            return None
+
+        if not isinstance(snapshot, tuple) or len(snapshot) != 3 or snapshot[:2] != (SNAPSHOT_VERSION, key):
+            return None
+
+        return snapshot[2]
+
+    def _write_snapshot(self, key: Tuple[int, int], state: Any) -> None:
+        # Write to a temporary file first so concurrent readers never see a partial snapshot
+        tmp_file = self.snapshot_file.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.snapshot_file.parent.mkdir(exist_ok=True)
+            tmp_file.write_bytes(marshal.dumps((SNAPSHOT_VERSION, key, state)))
+            os.replace(tmp_file, self.snapshot_file)
+        except (OSError, ValueError) as e:
+            # Unwritable folder or contents marshal can't store: parse the file next time
+            logger.debug(f"Unable to write config snapshot {self.snapshot_file}: {e!r}")
 
     def save_config(self, config: ConfigOptions) -> None:
 
@@ -122,6 +190,8 @@ class ConfigFile:
             # Make sure folder exists
             self.config_file.parent.mkdir(parents=True, exist_ok=True)
 
+            _state_cache.pop(self.config_file, None)
+
             # Back up existing file
             if self.config_file.exists():
                 dt_str = datetime.now().strftime("%Y%M%d-%H%M%S")
@@ -3,6 +3,7 @@ from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from traceback import format_tb
+from typing import Dict
 from typing import Optional
 from typing import Union
 
@@ -10,11 +11,18 @@ import aiohttp
 from chained_accounts import ChainedAccount
 from chained_accounts import find_accounts
 
+from telliot_core.apps.endpoint_pool import EndpointPool
+from telliot_core.apps.endpoint_pool import is_poolable
 from telliot_core.apps.session_manager import ClientSessionManager
 from telliot_core.apps.telliot_config import TelliotConfig
 from telliot_core.contract.contract import Contract
 from telliot_core.contract.listener import Listener
-from telliot_core.directory import contract_directory
+from telliot_core.contract.listener import PollingListener
+from telliot_core.contract.receipt_poller import shutdown_receipt_pollers
+from telliot_core.directory import get_contract_directory
+from telliot_core.gas.gas_oracle import GasOracle
+from telliot_core.gas.gas_oracle import get_gas_oracle
+from telliot_core.gas.gas_oracle import shutdown_gas_oracles
 from telliot_core.logs import init_logging
 from telliot_core.model.endpoints import RPCEndpoint
 from telliot_core.tellor.tellor360.autopay import Tellor360AutopayContract
@@ -140,12 +148,15 @@ class TelliotCore:
 
             oracle = TellorFlexOracleContract(node=self.endpoint, account=account)
             oracle.connect()
+            oracle.pool = self.endpoint_pool
 
             token = TokenContract(node=self.endpoint, account=account)
             token.connect()
+            token.pool = self.endpoint_pool
 
             autopay = TellorFlexAutopayContract(node=self.endpoint, account=account)
             autopay.connect()
+            autopay.pool = self.endpoint_pool
 
             self._tellorflex = TellorFlexContractSet(oracle=oracle, token=token, autopay=autopay)
 
@@ -161,9 +172,11 @@ class TelliotCore:
 
             master = TellorxMasterContract(node=self.endpoint, account=account)
             master.connect()
+            master.pool = self.endpoint_pool
 
             oracle = TellorxOracleContract(node=self.endpoint, account=account)
             oracle.connect()
+            oracle.pool = self.endpoint_pool
 
             self._tellorx = TellorxContractSet(
                 master=master,
@@ -184,12 +197,15 @@ class TelliotCore:
 
             oracle = Tellor360OracleContract(node=self.endpoint, account=account)
             oracle.connect()
+            oracle.pool = self.endpoint_pool
 
             autopay = Tellor360AutopayContract(node=self.endpoint, account=account)
             autopay.connect()
+            autopay.pool = self.endpoint_pool
 
             token = TokenContract(node=self.endpoint, account=account)
             token.connect()
+            token.pool = self.endpoint_pool
 
             self._tellor360 = Tellor360ContractSet(oracle=oracle, autopay=autopay, token=token)
 
@@ -210,14 +226,26 @@ class TelliotCore:
 
     @property
     def listener(self) -> Listener:
-        """Get or create listener object"""
+        """Get or create listener object
+
+        Endpoints with a `ws_url` use eth_subscribe over a websocket,
+        others are polled over HTTP.
+        """
         if not self._listener:
-            self._listener = Listener(session=self.shared_session, ws_url=self.endpoint.url)
+            if self.endpoint.ws_url:
+                self._listener = Listener(session=self.shared_session, ws_url=self.endpoint.ws_url)
+            else:
+                self._listener = PollingListener(self.endpoint)
 
         return self._listener
 
     _listener: Optional[Listener]
 
+    @property
+    def gas_oracle(self) -> GasOracle:
+        """Gas oracle for the current endpoint (call `start()` to refresh in the background)"""
+        return get_gas_oracle(self.endpoint)
+
     @property
     def endpoint(self) -> RPCEndpoint:
         """Get or create the endpoint for the current configuration"""
@@ -227,10 +255,23 @@ class TelliotCore:
             if not connected:
                 raise Exception(f"Could not connect to endpoint: {self._endpoint.url}")
 
+            # Enable native async reads once the shared session is open
+            if self._session_manager.is_open:
+                self._endpoint.set_session(self.shared_session)
+
         return self._endpoint
 
     _endpoint: Optional[RPCEndpoint]
 
+    @property
+    def endpoint_pool(self) -> Optional[EndpointPool]:
+        """Endpoint pool used by contracts of this core, if enabled with `main.endpoint_pool`"""
+        if not self.config.main.endpoint_pool:
+            return None
+        return self.get_endpoint_pool()
+
+    _endpoint_pools: Dict[int, Optional[EndpointPool]]
+
     @property
     def log(self) -> logging.Logger:
         """Provide access to the main telliot logger"""
@@ -248,6 +289,7 @@ class TelliotCore:
         self._homedir = telliot_homedir(homedir)
         self._config = config or TelliotConfig(config_dir=self.homedir)
         self._endpoint = None
+        self._endpoint_pools = {}
         self._listener = None
         self._tellorx = None
         self._tellorflex = None
@@ -283,6 +325,12 @@ class TelliotCore:
 
         await self._session_manager.open()
 
+        if self._endpoint:
+            self._endpoint.set_session(self.shared_session)
+        for pool in self._endpoint_pools.values():
+            if pool is not None:
+                pool.set_session(self.shared_session)
+
         msg = f"Connected to {NETWORKS[chain_id]} [default account: {account.name}], time: {datetime.now()}"
         self.log.info(msg)
 
@@ -302,6 +350,31 @@ class TelliotCore:
 
         return endpoints[0]  # type: ignore
 
+    def get_endpoint_pool(self, *, chain_id: Optional[int] = None) -> Optional[EndpointPool]:
+        """Get or create a pool of every configured HTTP endpoint for a chain
+
+        If `main.endpoint_pool` is enabled, contracts created by `TelliotCore`
+        route their async reads through the pool for latency-aware routing
+        and failover.  Writes always go to the configured endpoint.  Returns
+        None if the chain has no endpoint the pool can use.
+        """
+
+        if not chain_id:
+            chain_id = self.config.main.chain_id
+
+        if chain_id not in self._endpoint_pools:
+            endpoints = self.config.endpoints.find(chain_id=chain_id)
+            if len(endpoints) == 0:
+                raise Exception("No endpoints found")
+
+            pooled = [ep for ep in endpoints if is_poolable(ep)]
+            pool = EndpointPool(pooled) if pooled else None
+            if pool is not None and self._session_manager.is_open:
+                pool.set_session(self.shared_session)
+            self._endpoint_pools[chain_id] = pool
+
+        return self._endpoint_pools[chain_id]
+
     def get_contract(
         self,
         *,
@@ -321,7 +394,7 @@ class TelliotCore:
         if not account:
             account = self.get_account()
 
-        entries = contract_directory.find(org=org, name=name, address=address, chain_id=chain_id)
+        entries = get_contract_directory().find(org=org, name=name, address=address, chain_id=chain_id)
         if len(entries) > 1:
             raise Exception("More than one contract found.")
         elif len(entries) == 0:
@@ -341,6 +414,7 @@ class TelliotCore:
             account=account,
         )
         contract.connect()
+        contract.pool = self.endpoint_pool
         return contract
 
     def get_account(
@@ -379,12 +453,23 @@ class TelliotCore:
 
         # Release/close endpoint
         if self._endpoint:
+            self._endpoint.set_session(None)
             self._endpoint = None
+        for pool in self._endpoint_pools.values():
+            if pool is not None:
+                pool.set_session(None)
+        self._endpoint_pools = {}
 
         # SHut down listeners
         if self._listener:
             await self._listener.shutdown()
 
+        # Stop waiting for pending transaction receipts
+        await shutdown_receipt_pollers()
+
+        # Stop refreshing gas prices
+        await shutdown_gas_oracles()
+
         # Close aiohttp session
         await self._session_manager.close()
 
@@ -0,0 +1,292 @@
+"""
+Latency-aware routing and failover across the RPC endpoints of one chain
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import aiohttp
+from web3.exceptions import ContractLogicError
+
+from telliot_core.model.endpoints import RPCEndpoint
+
+logger = logging.getLogger(__name__)
+
+
+def is_poolable(endpoint: RPCEndpoint) -> bool:
+    """True if the pool can send requests to an endpoint
+
+    Requests are sent as HTTP POSTs, so websocket URLs and URLs with an
+    unfilled placeholder (e.g. `{INFURA_API_KEY}`) are left out.
+    """
+    return endpoint.url.startswith(("http://", "https://")) and "{" not in endpoint.url
+
+
+@dataclass
+class EndpointStats:
+    """Rolling latency and error statistics for one endpoint"""
+
+    #: Exponentially weighted moving average of request latency (seconds)
+    latency: Optional[float] = None
+
+    #: Exponentially weighted moving average of the failure rate (0 to 1)
+    error_rate: float = 0.0
+
+    requests: int = 0
+    errors: int = 0
+
+    #: Number of races won by this endpoint
+    wins: int = 0
+
+    #: Monotonic time of the last failure
+    last_error: Optional[float] = None
+
+    def record_success(self, latency: float, alpha: float) -> None:
+        self.requests += 1
+        self.latency = latency if self.latency is None else alpha * latency + (1 - alpha) * self.latency
+        self.error_rate = (1 - alpha) * self.error_rate
+
+    def record_error(self, alpha: float) -> None:
+        self.requests += 1
+        self.errors += 1
+        self.error_rate = alpha + (1 - alpha) * self.error_rate
+        self.last_error = time.monotonic()
+
+
+class EndpointPool:
+    """Pool of every configured RPC endpoint for one chain
+
+    Requests go to the fastest healthy endpoint and fail over to the next
+    one on errors or timeouts.  Endpoints whose rolling error rate exceeds
+    `max_error_rate` are skipped until `retry_after` seconds have passed
+    since their last failure.  Endpoints without a latency measurement,
+    and failed ones that have rested, are probed in the background with
+    `eth_blockNumber` rather than sent live requests.  If `hedge_after` is
+    set, a request that has not completed after that many seconds is also
+    sent to the next-best endpoint and the first successful answer wins.
+
+    Contract reverts are returned to the caller immediately, since every
+    node would give the same answer.
+    """
+
+    def __init__(
+        self,
+        endpoints: List[RPCEndpoint],
+        *,
+        hedge_after: Optional[float] = None,
+        timeout: float = 10.0,
+        alpha: float = 0.2,
+        max_error_rate: float = 0.5,
+        retry_after: float = 30.0,
+    ):
+        for ep in endpoints:
+            if not is_poolable(ep):
+                logger.debug(f"Leaving {ep.url} out of the endpoint pool")
+        endpoints = [ep for ep in endpoints if is_poolable(ep)]
+        if not endpoints:
+            raise ValueError("EndpointPool requires at least one HTTP endpoint")
+
+        chain_ids = {ep.chain_id for ep in endpoints}
+        if len(chain_ids) > 1:
+            raise ValueError(f"EndpointPool endpoints must share a chain_id (found {chain_ids})")
+
+        self.endpoints = list(endpoints)
+        self.hedge_after = hedge_after
+        self.timeout = timeout
+        self.alpha = alpha
+        self.max_error_rate = max_error_rate
+        self.retry_after = retry_after
+
+        self.stats: Dict[str, EndpointStats] = {ep.url: EndpointStats() for ep in self.endpoints}
+
+        self._probes: Dict[str, "asyncio.Task[Any]"] = {}
+
+    @property
+    def chain_id(self) -> Optional[int]:
+        return self.endpoints[0].chain_id
+
+    @property
+    def async_enabled(self) -> bool:
+        """True if any endpoint in the pool can send async requests"""
+        return any(ep.async_enabled for ep in self.endpoints)
+
+    def set_session(self, session: Optional[aiohttp.ClientSession]) -> None:
+        """Attach (or detach with None) a shared aiohttp session to every endpoint"""
+        for ep in self.endpoints:
+            ep.set_session(session)
+        if session is None:
+            for task in self._probes.values():
+                task.cancel()
+
+    def is_healthy(self, endpoint: RPCEndpoint) -> bool:
+        stats = self.stats[endpoint.url]
+        if stats.error_rate <= self.max_error_rate:
+            return True
+        # Give failing endpoints another chance once they have rested
+        assert stats.last_error is not None
+        return time.monotonic() - stats.last_error > self.retry_after
+
+    def is_measured(self, endpoint: RPCEndpoint) -> bool:
+        """True if the endpoint is healthy with a known latency"""
+        stats = self.stats[endpoint.url]
+        return stats.latency is not None and stats.error_rate <= self.max_error_rate
+
+    def ranked(self) -> List[RPCEndpoint]:
+        """Endpoints ordered by preference
+
+        Measured healthy endpoints come first, fastest first, followed by
+        unmeasured endpoints and failed endpoints that have rested.
+        Unhealthy endpoints are kept at the end as a last resort.
+        """
+
+        measured = [ep for ep in self.endpoints if self.is_measured(ep)]
+        untested = [ep for ep in self.endpoints if self.is_healthy(ep) and not self.is_measured(ep)]
+        unhealthy = [ep for ep in self.endpoints if not self.is_healthy(ep)]
+
+        return (
+            sorted(measured, key=lambda ep: self.stats[ep.url].latency or 0.0)
+            + untested
+            + sorted(unhealthy, key=lambda ep: self.stats[ep.url].error_rate)
+        )
+
+    def _probe(self, skip: List[RPCEndpoint]) -> None:
+        """Measure unmeasured and rested endpoints in the background"""
+
+        def _done(task: "asyncio.Task[Any]") -> None:
+            self._probes.pop(task.get_name(), None)
+            if not task.cancelled():
+                task.exception()  # failures are already recorded in the stats
+
+        for ep in self.endpoints:
+            if ep in skip or ep.url in self._probes or self.is_measured(ep) or not self.is_healthy(ep):
+                continue
+            task = asyncio.create_task(self._timed_request(ep, "eth_blockNumber", []), name=ep.url)
+            task.add_done_callback(_done)
+            self._probes[ep.url] = task
+
+    @property
+    def best(self) -> RPCEndpoint:
+        """The currently preferred endpoint"""
+        return self.ranked()[0]
+
+    async def _timed_request(self, endpoint: RPCEndpoint, method: str, params: List[Any]) -> Any:
+        """Send a request to one endpoint and record its latency or failure"""
+        start = time.monotonic()
+        try:
+            result = await asyncio.wait_for(endpoint.request(method, params), timeout=self.timeout)
+        except ContractLogicError:
+            # The node answered; the call itself reverted
+            self.stats[endpoint.url].record_success(time.monotonic() - start, self.alpha)
+            raise
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.stats[endpoint.url].record_error(self.alpha)
+            logger.debug(f"Request {method} failed on {endpoint.url}: {e!r}")
+            raise
+
+        self.stats[endpoint.url].record_success(time.monotonic() - start, self.alpha)
+        return result
+
+    async def request(self, method: str, params: List[Any]) -> Any:
+        """Send a JSON-RPC request to the best endpoint, failing over on errors
+
+        returns:
+            The `result` field of the JSON-RPC response
+        """
+
+        candidates = self.ranked()
+        self._probe(skip=candidates[:1])
+        last_error: Optional[Exception] = None
+
+        while candidates:
+            endpoint = candidates.pop(0)
+            try:
+                if self.hedge_after is not None and candidates:
+                    return await self._hedged_request(endpoint, candidates.pop(0), method, params)
+                return await self._timed_request(endpoint, method, params)
+            except ContractLogicError:
+                raise
+            except Exception as e:
+                last_error = e
+                logger.warning(f"Endpoint {endpoint.url} failed for {method}, trying next endpoint")
+
+        assert last_error is not None
+        raise last_error
+
+    async def race(self, method: str, params: List[Any], num_endpoints: int = 2) -> Tuple[Any, RPCEndpoint]:
+        """Send the same request to several endpoints and keep the first answer
+
+        The request goes to the `num_endpoints` best endpoints at once.
+        The first successful response wins and the rest are cancelled.
+
+        returns:
+            (result, winning endpoint) tuple
+        """
+
+        async def _entry(endpoint: RPCEndpoint) -> Tuple[Any, RPCEndpoint]:
+            return await self._timed_request(endpoint, method, params), endpoint
+
+        racers = self.ranked()[: max(num_endpoints, 1)]
+        self._probe(skip=racers)
+        result, winner = await first_successful([asyncio.create_task(_entry(ep)) for ep in racers])
+        self.stats[winner.url].wins += 1
+
+        return result, winner
+
+    async def _hedged_request(
+        self, primary: RPCEndpoint, secondary: RPCEndpoint, method: str, params: List[Any]
+    ) -> Any:
+        """Send to the primary endpoint, adding the secondary if it is slow
+
+        If the primary fails before the hedge delay, the secondary is
+        tried on its own.
+        """
+
+        first = asyncio.create_task(self._timed_request(primary, method, params))
+        try:
+            done, _ = await asyncio.wait({first}, timeout=self.hedge_after)
+        except asyncio.CancelledError:
+            first.cancel()
+            raise
+        if done:
+            e = first.exception()
+            if e is None or isinstance(e, ContractLogicError):
+                return first.result()
+            return await self._timed_request(secondary, method, params)
+
+        logger.debug(f"Hedging slow {method} request from {primary.url} to {secondary.url}")
+        second = asyncio.create_task(self._timed_request(secondary, method, params))
+
+        return await first_successful([first, second])
+
+
+async def first_successful(tasks: List["asyncio.Task[Any]"]) -> Any:
+    """Return the result of the first task to succeed and cancel the rest
+
+    Contract reverts count as an answer.  If every task fails, the last
+    error is raised.
+    """
+
+    pending = set(tasks)
+    last_error: Optional[BaseException] = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                e = task.exception()
+                if e is None or isinstance(e, ContractLogicError):
+                    return task.result()
+                last_error = e
+    finally:
+        for task in pending:
+            task.cancel()
+
+    assert last_error is not None
+    raise last_error
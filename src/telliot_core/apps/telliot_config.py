@@ -6,9 +6,6 @@ from typing import Literal
 from typing import Optional
 from typing import Union
 
-from chained_accounts import ChainedAccount
-from chained_accounts import find_accounts
-
 from telliot_core.apps.config import ConfigFile
 from telliot_core.apps.config import ConfigOptions
 from telliot_core.model.api_keys import ApiKeyList
@@ -28,6 +25,9 @@ class MainConfig(ConfigOptions):
     #: Select chain id
     chain_id: int = 5
 
+    #: Route contract reads through a pool of all HTTP endpoints configured for the chain
+    endpoint_pool: bool = False
+
 
 @dataclass
 class TelliotConfig(Base):
@@ -65,6 +65,7 @@ class TelliotConfig(Base):
             config_type=EndpointList,
             config_format="yaml",
             config_dir=self.config_dir,
+            snapshot=True,
         )
         self._api_keys_config_file = ConfigFile(
             name="api_keys",
@@ -77,6 +78,7 @@ class TelliotConfig(Base):
             config_type=ChainList,
             config_format="json",
             config_dir=self.config_dir,
+            snapshot=True,
         )
 
         self.main = self._main_config_file.get_config()
@@ -102,6 +104,8 @@ def override_test_config(cfg: TelliotConfig, write: bool = False) -> TelliotConf
     Overrides the current configuration with rinkeby test config.
     Also handles overrides for github secret keys.
     """
+    from chained_accounts import ChainedAccount
+    from chained_accounts import find_accounts
 
     # Override configuration for rinkeby testnet
     override_main = False
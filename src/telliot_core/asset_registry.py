@@ -40,4 +40,19 @@ class AssetRegistry(Base):
         return self.assets.get(asset_id)
 
 
-asset_registry = AssetRegistry.from_file(TELLIOT_CORE_ROOT / "data/assets.json")
+_asset_registry: Optional[AssetRegistry] = None
+
+
+def get_asset_registry() -> AssetRegistry:
+    """Registry of known assets, loaded on first use"""
+    global _asset_registry
+    if _asset_registry is None:
+        _asset_registry = AssetRegistry.from_file(TELLIOT_CORE_ROOT / "data/assets.json")
+    return _asset_registry
+
+
+def __getattr__(name: str) -> AssetRegistry:
+    # `asset_registry` is kept as a lazily loaded module attribute
+    if name == "asset_registry":
+        return get_asset_registry()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
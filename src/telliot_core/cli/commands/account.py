@@ -1,6 +1,4 @@
 import click
-from chained_accounts import ChainedAccount
-from chained_accounts import find_accounts
 
 from telliot_core.cli.commands.read import get_staker_info
 from telliot_core.cli.utils import async_run
@@ -20,6 +18,9 @@ def account(ctx: click.Context, name: str) -> None:
 @async_run
 async def status(ctx: click.Context) -> None:
     """Get on-chain staker status."""
+    from chained_accounts import ChainedAccount
+    from chained_accounts import find_accounts
+
     cfg = cli_config(ctx)
     account_name = ctx.obj["ACCOUNT_NAME"]
     if account_name:
@@ -4,8 +4,6 @@ import click
 
 from telliot_core.cli.utils import async_run
 from telliot_core.cli.utils import cli_core
-from telliot_core.contract.listener import event_logger
-from telliot_core.directory import contract_directory
 
 
 @click.command()
@@ -13,6 +11,8 @@ from telliot_core.directory import contract_directory
 @async_run
 async def listen(ctx: click.Context) -> None:
     """Listen for Tellor network events."""
+    from telliot_core.contract.listener import event_logger
+    from telliot_core.directory import get_contract_directory
 
     async with cli_core(ctx) as core:
 
@@ -20,8 +20,8 @@ async def listen(ctx: click.Context) -> None:
 
         if chain_id in [1, 4]:
 
-            master = contract_directory.find(name="tellorx-master", chain_id=chain_id)[0]
-            oracle = contract_directory.find(name="tellorx-oracle", chain_id=chain_id)[0]
+            master = get_contract_directory().find(name="tellorx-master", chain_id=chain_id)[0]
+            oracle = get_contract_directory().find(name="tellorx-oracle", chain_id=chain_id)[0]
 
         # elif chain_id in [137, 80001]:
         #     oracle = contract_directory.find(name='tellorflex-oracle', chain_id=chain_id)[0]
@@ -6,14 +6,19 @@ or in the configuration file.
 """
 import click
 
-from telliot_core.cli.commands.account import account
-from telliot_core.cli.commands.config import config
-from telliot_core.cli.commands.listen import listen
-from telliot_core.cli.commands.read import read
+from telliot_core.cli.utils import LazyGroup
 from telliot_core.utils.versions import show_telliot_versions
 
+# Command modules are imported only when their command is used
+COMMANDS = {
+    "account": "telliot_core.cli.commands.account:account",
+    "config": "telliot_core.cli.commands.config:config",
+    "listen": "telliot_core.cli.commands.listen:listen",
+    "read": "telliot_core.cli.commands.read:read",
+}
 
-@click.group(invoke_without_command=True)
+
+@click.group(cls=LazyGroup, lazy_subcommands=COMMANDS, invoke_without_command=True)
 @click.pass_context
 @click.option(
     "--chain_id",
@@ -39,10 +44,5 @@ def main(ctx: click.Context, version: bool, chain_id: int, test_config: bool) ->
         print(ctx.command.get_help(ctx))
 
 
-main.add_command(config)
-main.add_command(read)
-main.add_command(account)
-main.add_command(listen)
-
 if __name__ == "__main__":
     main()
@@ -1,11 +1,39 @@
 import asyncio
+import importlib
 from functools import wraps
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import TYPE_CHECKING
 
 import click
 
-from telliot_core.apps.core import TelliotCore
-from telliot_core.apps.telliot_config import override_test_config
-from telliot_core.apps.telliot_config import TelliotConfig
+# Imported when a command runs, to keep CLI startup fast
+if TYPE_CHECKING:
+    from telliot_core.apps.core import TelliotCore
+    from telliot_core.apps.telliot_config import TelliotConfig
+
+
+class LazyGroup(click.Group):
+    """Click group that imports its subcommands only when they are invoked
+
+    `lazy_subcommands` maps each command name to "module:attribute".
+    """
+
+    def __init__(self, *args: Any, lazy_subcommands: Optional[Dict[str, str]] = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted(super().list_commands(ctx) + list(self.lazy_subcommands))
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if cmd_name in self.lazy_subcommands:
+            module_name, attr = self.lazy_subcommands[cmd_name].split(":")
+            command: click.Command = getattr(importlib.import_module(module_name), attr)
+            return command
+        return super().get_command(ctx, cmd_name)
 
 
 def async_run(f):  # type: ignore
@@ -20,8 +48,11 @@ def async_run(f):  # type: ignore
     return wrapper
 
 
-def cli_config(ctx: click.Context) -> TelliotConfig:
+def cli_config(ctx: click.Context) -> "TelliotConfig":
     """Return a telliot configuration using the CLI context"""
+    from telliot_core.apps.telliot_config import override_test_config
+    from telliot_core.apps.telliot_config import TelliotConfig
+
     if ctx.obj["TEST_CONFIG"]:
         cfg = override_test_config(TelliotConfig())
 
@@ -33,11 +64,13 @@ def cli_config(ctx: click.Context) -> TelliotConfig:
     return cfg
 
 
-def cli_core(ctx: click.Context) -> TelliotCore:
+def cli_core(ctx: click.Context) -> "TelliotCore":
     """Returns a TelliotCore configured with the CLI context
 
     The returned object should be used as a context manager for CLI commands
     """
+    from telliot_core.apps.core import TelliotCore
+
     account_name = ctx.obj.get("ACCOUNT_NAME", None)
 
     cfg = cli_config(ctx)
@@ -0,0 +1,255 @@
+"""
+Contract ABIs parsed once and shared by every contract using them
+"""
+import hashlib
+import json
+import logging
+import marshal
+import mmap
+import os
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import cast
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Tuple
+from typing import Type
+from typing import Union
+from weakref import WeakKeyDictionary
+
+from eth_abi.codec import ABICodec
+from eth_utils import event_abi_to_log_topic
+from eth_utils import function_abi_to_4byte_selector
+from hexbytes import HexBytes
+from web3 import Web3
+from web3._utils.abi import build_default_registry
+from web3._utils.abi import get_abi_output_types
+from web3._utils.events import get_event_data
+from web3.contract import Contract as Web3Contract
+from web3.types import ABIFunction
+
+from telliot_core.utils.home import telliot_homedir
+
+logger = logging.getLogger(__name__)
+
+#: Folder (in the telliot home folder) holding the binary ABI caches
+CACHE_DIR = "abi_registry"
+
+#: Bumped when the cache layout changes
+CACHE_VERSION = 1
+
+codec = ABICodec(build_default_registry())
+
+
+def abi_digest(abi: List[Dict[str, Any]]) -> str:
+    """Hash identifying an ABI regardless of formatting"""
+    return hashlib.sha256(json.dumps(abi, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+def decode_log(events: Mapping[HexBytes, Dict[str, Any]], log: Any) -> Any:
+    """Decode a formatted log with the event ABI of its topic, or return it as is if the topic is unknown"""
+    abi = events.get(HexBytes(log["topics"][0])) if log["topics"] else None
+    return get_event_data(codec, abi, log) if abi else log
+
+
+def event_decoder(events: Mapping[HexBytes, Dict[str, Any]]) -> Callable[[Any], Any]:
+    """Decoder for logs of the given events (by topic), leaving other logs as is"""
+
+    def decode(log: Any) -> Any:
+        return decode_log(events, log)
+
+    return decode
+
+
+class AbiEntry:
+    """A parsed ABI with its function selectors, event topics and decoders
+
+    Entries are shared by every contract using the same ABI, on any chain,
+    and must not be modified.
+    """
+
+    def __init__(
+        self,
+        abi: List[Dict[str, Any]],
+        digest: str,
+        selector_index: Optional[Dict[bytes, int]] = None,
+        topic_index: Optional[Dict[bytes, int]] = None,
+    ):
+        self.abi = abi
+        self.digest = digest
+
+        if selector_index is None:
+            selector_index = {
+                bytes(function_abi_to_4byte_selector(item)): i
+                for i, item in enumerate(abi)
+                if item.get("type") == "function"
+            }
+        if topic_index is None:
+            topic_index = {
+                bytes(event_abi_to_log_topic(item)): i
+                for i, item in enumerate(abi)
+                if item.get("type") == "event" and not item.get("anonymous")
+            }
+        self._selector_index = selector_index
+        self._topic_index = topic_index
+
+        #: Function ABI for each 4 byte selector
+        self.selectors: Dict[bytes, Dict[str, Any]] = {s: abi[i] for s, i in selector_index.items()}
+
+        #: Event ABI for each log topic
+        self.topics: Dict[HexBytes, Dict[str, Any]] = {HexBytes(t): abi[i] for t, i in topic_index.items()}
+
+        self._output_types: Dict[Union[str, bytes], List[str]] = {}
+        self._factories: "WeakKeyDictionary[Web3, Type[Web3Contract]]" = WeakKeyDictionary()
+
+    def output_types(self, function: Union[str, bytes]) -> List[str]:
+        """Return types of a function, by 4 byte selector or by name (the first one, if overloaded)"""
+        if function not in self._output_types:
+            if isinstance(function, bytes):
+                item = self.selectors.get(function)
+            else:
+                functions = (i for i in self.abi if i.get("type") == "function" and i.get("name") == function)
+                item = next(functions, None)
+            if item is None:
+                raise ValueError(f"function {function!r} not found in contract abi")
+            self._output_types[function] = get_abi_output_types(cast(ABIFunction, item))
+
+        return self._output_types[function]
+
+    def decode_output(self, function: Union[str, bytes], data: bytes) -> Tuple[Any, ...]:
+        """Decode the return data of a call to a function (by selector or name)"""
+        return tuple(codec.decode_abi(self.output_types(function), data))
+
+    def events(self, event_names: Optional[Iterable[str]] = None) -> Dict[HexBytes, Dict[str, Any]]:
+        """Event ABIs by log topic, for all events or only the named ones
+
+        raises:
+            ValueError if a named event is not in the ABI
+        """
+        if event_names is None:
+            return dict(self.topics)
+
+        names = set(event_names)
+        events = {topic: abi for topic, abi in self.topics.items() if abi["name"] in names}
+
+        missing = names - {abi["name"] for abi in events.values()}
+        if missing:
+            raise ValueError(f"Events not found in ABI: {', '.join(sorted(missing))}")
+
+        return events
+
+    def decode_log(self, log: Any) -> Any:
+        """Decode a formatted log into an event, or return it as is if the topic is unknown"""
+        return decode_log(self.topics, log)
+
+    def contract_factory(self, web3: Web3) -> Type[Web3Contract]:
+        """web3 contract class for this ABI, built once per Web3 instance"""
+        factory = self._factories.get(web3)
+        if factory is None:
+            factory = web3.eth.contract(abi=self.abi)
+            self._factories[web3] = factory
+        return factory
+
+    def cache_state(self, mtime_ns: int, size: int) -> Tuple[Any, ...]:
+        return CACHE_VERSION, mtime_ns, size, self.digest, self.abi, self._selector_index, self._topic_index
+
+
+class AbiRegistry:
+    """Parse each ABI once and share it
+
+    ABI files are parsed on first use, with selectors and topic hashes
+    precomputed.  The result is saved as a marshal file in the telliot home
+    folder (or `cache_dir`) and memory-mapped by later processes, as long
+    as the JSON file is unchanged.  ABIs with the same content share one
+    `AbiEntry`, whatever file or contract they come from.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None) -> None:
+
+        #: Folder of the binary ABI caches (default: in the telliot home folder)
+        self.cache_dir = cache_dir
+
+        self._by_digest: Dict[str, AbiEntry] = {}
+        self._by_path: Dict[str, AbiEntry] = {}
+        self._by_id: Dict[int, AbiEntry] = {}
+
+        #: Number of ABI files loaded from the binary cache
+        self.cache_loads = 0
+
+        #: Number of ABI files parsed from JSON
+        self.parses = 0
+
+    def _add(self, entry: AbiEntry) -> AbiEntry:
+        entry = self._by_digest.setdefault(entry.digest, entry)
+        self._by_id[id(entry.abi)] = entry
+        return entry
+
+    def register(self, abi: Union[List[Dict[str, Any]], str]) -> AbiEntry:
+        """Shared entry for an ABI (a list, or a JSON string)"""
+        if not isinstance(abi, str):
+            entry = self._by_id.get(id(abi))
+            if entry is not None and entry.abi is abi:
+                return entry
+        else:
+            abi = json.loads(abi)
+
+        assert isinstance(abi, list)
+        return self._add(AbiEntry(abi, abi_digest(abi)))
+
+    def load_file(self, path: Union[str, Path]) -> AbiEntry:
+        """Shared entry for an ABI JSON file"""
+        path = Path(path)
+        key = str(path)
+        if key in self._by_path:
+            return self._by_path[key]
+
+        stat = path.stat()
+        entry = self._read_cache(path, stat.st_mtime_ns, stat.st_size)
+        if entry is None:
+            abi = json.loads(path.read_bytes())
+            entry = AbiEntry(abi, abi_digest(abi))
+            self.parses += 1
+            self._write_cache(path, entry.cache_state(stat.st_mtime_ns, stat.st_size))
+
+        entry = self._add(entry)
+        self._by_path[key] = entry
+        return entry
+
+    def cache_path(self, path: Path) -> Path:
+        """Binary cache of an ABI file, named after the file and a hash of its location"""
+        cache_dir = self.cache_dir if self.cache_dir is not None else telliot_homedir() / CACHE_DIR
+        location = hashlib.sha256(str(path.resolve()).encode()).hexdigest()[:16]
+        return cache_dir / f"{path.stem}-{location}.marshal"
+
+    def _read_cache(self, path: Path, mtime_ns: int, size: int) -> Optional[AbiEntry]:
+        try:
+            with open(self.cache_path(path), "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                state = marshal.loads(m)
+        except (OSError, ValueError, EOFError, TypeError):
+            return None
+
+        if not isinstance(state, tuple) or len(state) != 7 or state[:3] != (CACHE_VERSION, mtime_ns, size):
+            return None
+
+        _, _, _, digest, abi, selector_index, topic_index = state
+        self.cache_loads += 1
+        return AbiEntry(abi, digest, selector_index, topic_index)
+
+    def _write_cache(self, path: Path, state: Tuple[Any, ...]) -> None:
+        cache_path = self.cache_path(path)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(marshal.dumps(state))
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            # e.g. read-only installation: keep working from the JSON files
+            logger.debug(f"Unable to write ABI cache {cache_path}: {e!r}")
+
+
+#: ABI registry shared by the whole process
+abi_registry = AbiRegistry()
@@ -3,18 +3,42 @@ Utils for connecting to an EVM contract
 """
 import asyncio
 import logging
+from dataclasses import dataclass
+from dataclasses import field
 from typing import Any
+from typing import cast
 from typing import Dict
 from typing import List
+from typing import Literal
 from typing import Optional
+from typing import Sequence
 from typing import Tuple
+from typing import Type
 from typing import Union
 
 from chained_accounts import ChainedAccount
+from eth_account import Account
+from eth_account.datastructures import SignedTransaction
+from eth_account.signers.local import LocalAccount
 from eth_typing.evm import ChecksumAddress
 from eth_utils.address import to_checksum_address
+from hexbytes import HexBytes
+from web3._utils.abi import map_abi_data
+from web3._utils.normalizers import BASE_RETURN_NORMALIZERS
+from web3.contract import Contract as Web3Contract
+from web3.contract import ContractFunction
 from web3.datastructures import AttributeDict
-
+from web3.exceptions import BadFunctionCallOutput
+from web3.exceptions import TimeExhausted
+
+from telliot_core.apps.endpoint_pool import EndpointPool
+from telliot_core.contract.abi_registry import abi_registry
+from telliot_core.contract.nonce_manager import nonce_manager
+from telliot_core.contract.read_cache import ReadCache
+from telliot_core.contract.receipt_poller import get_receipt_poller
+from telliot_core.contract.receipt_poller import ReceiptFuture
+from telliot_core.gas.gas_limit import gas_limit_estimator
+from telliot_core.gas.gas_limit import gas_limit_key
 from telliot_core.model.endpoints import RPCEndpoint
 from telliot_core.utils.key_helpers import lazy_key_getter
 from telliot_core.utils.response import error_status
@@ -22,6 +46,55 @@ from telliot_core.utils.response import ResponseStatus
 
 logger = logging.getLogger(__name__)
 
+#: Candidate gas price in gwei: a legacy gas price,
+#: or a (max_fee_per_gas, max_priority_fee_per_gas) tuple
+GasCandidate = Union[float, Tuple[float, float]]
+
+
+@dataclass
+class PresignedTransactions:
+    """Signed alternatives of one transaction, one per candidate gas price
+
+    All alternatives share one nonce, so at most one of them can be mined.
+    """
+
+    func_name: str
+
+    nonce: int
+
+    #: Signed transactions by candidate gas price
+    transactions: Dict[GasCandidate, SignedTransaction]
+
+    #: True if the nonce was reserved from the shared nonce manager
+    reserved_nonce: bool = True
+
+    #: Function arguments, used to learn the gas limit from the receipt
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+
+
+def decode_function_output(function: ContractFunction, return_data: bytes) -> Any:
+    """Decode raw `eth_call` return data for a bound contract function
+
+    Mirrors the decoding done by `ContractFunction.call()` so that the
+    native async path returns identical values.  Output types are looked
+    up by selector in the shared ABI registry.
+    """
+    entry = abi_registry.register(cast(List[Dict[str, Any]], function.contract_abi))
+    selector = bytes(HexBytes(function.selector))
+    output_types = entry.output_types(selector)
+    try:
+        output_data = entry.decode_output(selector, return_data)
+    except Exception as e:
+        msg = f"Could not decode contract function call to {function.fn_name} with return data: {return_data!r}"
+        raise BadFunctionCallOutput(msg) from e
+
+    normalized_data = map_abi_data(BASE_RETURN_NORMALIZERS, output_types, output_data)
+
+    if len(normalized_data) == 1:
+        return normalized_data[0]
+    else:
+        return normalized_data
+
 
 class Contract:
     """Convenience wrapper for connecting to an Ethereum contract"""
@@ -32,14 +105,35 @@ class Contract:
         abi: Union[List[Dict[str, Any]], str],
         node: RPCEndpoint,
         account: Optional[ChainedAccount] = None,
+        cache: Optional[ReadCache] = None,
+        pool: Optional[EndpointPool] = None,
     ):
 
         self.address = to_checksum_address(address)
         self.abi = abi
         self.node = node
-        self.contract = None
+        self.contract: Optional[Web3Contract] = None
         self.account = account
         self._private_key: Optional[bytes] = None
+        self._local_account: Optional[LocalAccount] = None
+        self._chain_id: Optional[int] = None
+
+        # Contract functions by name, built at connect() time
+        self._functions: Dict[str, Type[ContractFunction]] = {}
+
+        #: Optional block-scoped cache for reads (opt-in)
+        self.cache = cache
+
+        #: Optional pool of endpoints used to route async reads (opt-in)
+        self.pool = pool
+
+        #: Endpoint that answered the most recent `read_race`
+        self.last_race_winner: Optional[RPCEndpoint] = None
+
+    @property
+    def rpc(self) -> Union[RPCEndpoint, EndpointPool]:
+        """Target for native async JSON-RPC requests"""
+        return self.pool if self.pool is not None else self.node
 
     def connect(self) -> ResponseStatus:
         """Connect to EVM contract through an RPC Endpoint"""
@@ -49,12 +143,48 @@ class Contract:
             return ResponseStatus(ok=False, error=msg)
 
         self.node.connect()
-        self.contract = self.node.web3.eth.contract(address=self.address, abi=self.abi)
+        # The contract class is shared by every contract with the same ABI on this node
+        factory = abi_registry.register(self.abi).contract_factory(self.node.web3)
+        contract = factory(address=self.address)
+        self.contract = contract
+
+        # Precompute the function table so calls skip the ABI search.
+        # Overloaded names are left out and resolved by web3 on each call.
+        names = [f.fn_name for f in contract.all_functions()]
+        self._functions = {name: contract.get_function_by_name(name) for name in set(names) if names.count(name) == 1}
+
         return ResponseStatus(ok=True)
 
+    def get_function(self, func_name: str) -> Type[ContractFunction]:
+        """Look up a contract function by name
+
+        raises:
+            ValueError if the function is not in the contract ABI
+        """
+        function = self._functions.get(func_name)
+        if function is None:
+            assert self.contract is not None
+            function = self.contract.get_function_by_name(func_name)
+        return function
+
+    @property
+    def chain_id(self) -> int:
+        """Chain ID reported by the node, fetched once and used to sign transactions"""
+        if self._chain_id is None:
+            self._chain_id = int(self.node.web3.eth.chain_id)
+        return self._chain_id
+
     async def read(self, func_name: str, *args: Any, **kwargs: Any) -> Tuple[Any, ResponseStatus]:
         """
         Reads data from contract
+
+        If the node (or endpoint pool) has an open aiohttp session attached,
+        the call is sent natively over it so that many reads can be in
+        flight at once.
+        Otherwise the blocking web3 provider is used as a fallback.
+        If a read cache is set, successful reads are served from it
+        until a new block arrives.
+
         inputs:
         func_name (str): name of contract function to call
 
@@ -62,10 +192,49 @@ class Contract:
         ResponseStatus: standard response for contract data
         """
 
+        return await self._read(func_name, args, kwargs)
+
+    async def read_race(
+        self, func_name: str, *args: Any, num_endpoints: int = 2, **kwargs: Any
+    ) -> Tuple[Any, ResponseStatus]:
+        """
+        Reads data from contract by racing several endpoints
+
+        The same `eth_call` is sent to the `num_endpoints` best endpoints
+        of the pool at once.  The first successful answer is returned, the
+        other requests are cancelled, and the winning endpoint is stored
+        in `last_race_winner`.  Use this for reads where tail latency
+        matters more than request count.
+
+        Without an endpoint pool and an open session, this is the same
+        as `read()`.
+        """
+
+        return await self._read(func_name, args, kwargs, num_endpoints=num_endpoints)
+
+    async def _read(
+        self, func_name: str, args: Tuple[Any, ...], kwargs: Dict[str, Any], num_endpoints: int = 1
+    ) -> Tuple[Any, ResponseStatus]:
+
         if self.contract:
+            block_identifier: Union[Literal["latest"], int] = "latest"
+            if self.cache is not None:
+                hit, output = self.cache.get(self.address, func_name, args, kwargs)
+                if hit:
+                    return output, ResponseStatus(ok=True)
+                block_number = self.cache.block_number
+                if block_number is not None:
+                    # Read the block the value will be cached for
+                    block_identifier = block_number
             try:
-                contract_function = self.contract.get_function_by_name(func_name)
-                output = contract_function(*args, **kwargs).call()
+                contract_function = self.get_function(func_name)
+                function = contract_function(*args, **kwargs)
+                if self.rpc.async_enabled:
+                    output = await self.eth_call(function, block_identifier, num_endpoints=num_endpoints)
+                else:
+                    output = function.call(block_identifier=block_identifier)
+                if self.cache is not None:
+                    self.cache.set(self.address, func_name, args, kwargs, output, block_number=block_number)
                 return output, ResponseStatus(ok=True)
             except ValueError as e:
                 msg = f"function '{func_name}' not found in contract abi"
@@ -80,6 +249,32 @@ class Contract:
             msg = "no instance of contract"
             return None, ResponseStatus(ok=False, error=msg)
 
+    async def eth_call(
+        self,
+        function: ContractFunction,
+        block_identifier: Union[str, int] = "latest",
+        num_endpoints: int = 1,
+    ) -> Any:
+        """Execute a bound contract function using a native async `eth_call`
+
+        If `num_endpoints` > 1 and an endpoint pool is set, the call is
+        raced across that many endpoints.
+        """
+
+        if isinstance(block_identifier, int):
+            block_identifier = hex(block_identifier)
+
+        tx = {"to": self.address, "data": function._encode_transaction_data()}
+        if num_endpoints > 1 and self.pool is not None:
+            return_data, self.last_race_winner = await self.pool.race(
+                "eth_call", [tx, block_identifier], num_endpoints=num_endpoints
+            )
+            logger.debug(f"{function.fn_name} race won by {self.last_race_winner.url}")
+        else:
+            return_data = await self.rpc.request("eth_call", [tx, block_identifier])
+
+        return decode_function_output(function, HexBytes(return_data))
+
     @property
     def private_key(self) -> bytes:
 
@@ -88,22 +283,67 @@ class Contract:
 
         return self._private_key
 
+    @property
+    def local_account(self) -> LocalAccount:
+        """Signing account derived from the private key, derived once"""
+
+        if not self._local_account:
+            self._local_account = Account.from_key(self.private_key)
+
+        return self._local_account
+
     async def write(
         self,
         func_name: str,
         gas_limit: int,
-        legacy_gas_price: Optional[int] = None,
-        max_priority_fee_per_gas: Optional[int] = None,
-        max_fee_per_gas: Optional[int] = None,
+        legacy_gas_price: Optional[float] = None,
+        max_priority_fee_per_gas: Optional[float] = None,
+        max_fee_per_gas: Optional[float] = None,
         acc_nonce: Optional[int] = None,
         **kwargs: Any,
     ) -> Tuple[Optional[AttributeDict[Any, Any]], ResponseStatus]:
         """For submitting any contract transaction once without retries
 
-        gas price measured in gwei
+        gas prices measured in gwei (fractions are allowed)
 
         """
 
+        receipt_future, status = await self.submit(
+            func_name,
+            gas_limit=gas_limit,
+            legacy_gas_price=legacy_gas_price,
+            max_priority_fee_per_gas=max_priority_fee_per_gas,
+            max_fee_per_gas=max_fee_per_gas,
+            acc_nonce=acc_nonce,
+            **kwargs,
+        )
+        if receipt_future is None:
+            return None, status
+
+        return await self.confirm(func_name, receipt_future)
+
+    async def submit(
+        self,
+        func_name: str,
+        gas_limit: int,
+        legacy_gas_price: Optional[float] = None,
+        max_priority_fee_per_gas: Optional[float] = None,
+        max_fee_per_gas: Optional[float] = None,
+        acc_nonce: Optional[int] = None,
+        **kwargs: Any,
+    ) -> Tuple[Optional[ReceiptFuture], ResponseStatus]:
+        """Submit a contract transaction without waiting for it to be mined
+
+        Takes the same arguments as `write()`.  If no nonce is given, one is
+        reserved from the shared nonce manager, so several transactions from
+        one account can be in flight at once.  The receipt is awaited by a
+        background poller shared by all pending transactions.
+
+        returns:
+            Future resolving to the transaction receipt (use `confirm()` to
+            await it with the usual status handling)
+        """
+
         # Validate inputs
         if (legacy_gas_price is not None) and ((max_fee_per_gas is not None) or (max_priority_fee_per_gas is not None)):
             raise ValueError(
@@ -114,12 +354,6 @@ class Contract:
         if (legacy_gas_price is None) and (max_fee_per_gas is None) and (max_priority_fee_per_gas is None):
             raise ValueError("no gas strategy selected!")
 
-        status = ResponseStatus()
-
-        if not acc_nonce:
-            acc = self.node.web3.eth.account.from_key(self.private_key)
-            acc_nonce = self.node.web3.eth.get_transaction_count(acc.address)
-
         if not self.contract:
             msg = f"Contract.write({func_name}) error: Unable to connect to contract"
             return None, error_status(msg, log=logger.error)
@@ -129,25 +363,199 @@ class Contract:
             return None, error_status(msg, log=logger.error)
 
         if self.private_key:
-            acc = self.node.web3.eth.account.from_key(self.private_key)
+            acc = self.local_account
         else:
             msg = f"Contract.write({func_name}) error: Private key missing"
             return None, error_status(msg, log=logger.error)
 
+        reserved_nonce = acc_nonce is None
+        if acc_nonce is None:
+            acc_nonce = await nonce_manager.reserve(self.node, acc.address)
+
+        tx_signed, status = self._sign_transaction(
+            func_name,
+            gas_limit=gas_limit,
+            legacy_gas_price=legacy_gas_price,
+            max_priority_fee_per_gas=max_priority_fee_per_gas,
+            max_fee_per_gas=max_fee_per_gas,
+            acc_nonce=acc_nonce,
+            **kwargs,
+        )
+        if tx_signed is None:
+            if reserved_nonce:
+                nonce_manager.reset(self.node.chain_id, acc.address)
+            return None, status
+
+        try:
+            logger.debug(f"Sending transaction: {func_name}")
+            tx_hash = await self.send_raw_transaction(tx_signed.rawTransaction)
+
+        except Exception as e:
+            if reserved_nonce:
+                nonce_manager.reset(self.node.chain_id, acc.address)
+            note = "Send transaction failed"
+            return None, error_status(note, log=logger.error, e=e)
+
+        receipt_future = get_receipt_poller(self.node).track(tx_hash)
+        self._learn_gas_used(func_name, kwargs, receipt_future)
+
+        return receipt_future, ResponseStatus()
+
+    async def presign(
+        self,
+        func_name: str,
+        gas_prices: Sequence[GasCandidate],
+        gas_limit: Optional[int] = None,
+        acc_nonce: Optional[int] = None,
+        **kwargs: Any,
+    ) -> Tuple[Optional[PresignedTransactions], ResponseStatus]:
+        """Prepare and sign a transaction ahead of time for each candidate gas price
+
+        Gas is estimated once (if `gas_limit` is None) and the next nonce is
+        reserved, so that once the decision to send is made, `broadcast()`
+        only needs a single `eth_sendRawTransaction`.  Use this for
+        latency-critical transactions such as `submitValue`.
+
+        Args:
+            func_name: Contract function name
+            gas_prices: Candidate gas prices in gwei.  Each is either a legacy
+                gas price or a (max_fee_per_gas, max_priority_fee_per_gas) tuple.
+            gas_limit: Gas limit, estimated if None
+            acc_nonce: Nonce to use, reserved from the nonce manager if None
+        """
+
+        if not self.contract:
+            msg = f"Contract.presign({func_name}) error: Unable to connect to contract"
+            return None, error_status(msg, log=logger.error)
+
+        if not self.private_key:
+            msg = f"Contract.presign({func_name}) error: Private key missing"
+            return None, error_status(msg, log=logger.error)
+
+        if not gas_prices:
+            raise ValueError("no candidate gas prices provided")
+
+        acc = self.local_account
+
+        reserved_nonce = acc_nonce is None
+        if acc_nonce is None:
+            acc_nonce = await nonce_manager.reserve(self.node, acc.address)
+
+        if gas_limit is None:
+            try:
+                transaction = self.get_function(func_name)(**kwargs)
+                gas_limit = self._gas_limit(func_name, transaction, {"from": acc.address, "nonce": acc_nonce}, kwargs)
+            except Exception as e:
+                if reserved_nonce:
+                    nonce_manager.reset(self.node.chain_id, acc.address)
+                msg = f"Contract.presign({func_name}) error: Unable to estimate gas"
+                return None, error_status(msg, e=e, log=logger.error)
+
+        transactions: Dict[GasCandidate, SignedTransaction] = {}
+        for gas_price in gas_prices:
+            if isinstance(gas_price, tuple):
+                max_fee_per_gas, max_priority_fee_per_gas = gas_price
+                tx_signed, status = self._sign_transaction(
+                    func_name,
+                    gas_limit=gas_limit,
+                    legacy_gas_price=None,
+                    max_priority_fee_per_gas=max_priority_fee_per_gas,
+                    max_fee_per_gas=max_fee_per_gas,
+                    acc_nonce=acc_nonce,
+                    **kwargs,
+                )
+            else:
+                tx_signed, status = self._sign_transaction(
+                    func_name,
+                    gas_limit=gas_limit,
+                    legacy_gas_price=gas_price,
+                    max_priority_fee_per_gas=None,
+                    max_fee_per_gas=None,
+                    acc_nonce=acc_nonce,
+                    **kwargs,
+                )
+
+            if tx_signed is None:
+                if reserved_nonce:
+                    nonce_manager.reset(self.node.chain_id, acc.address)
+                return None, status
+
+            transactions[gas_price] = tx_signed
+
+        presigned = PresignedTransactions(
+            func_name=func_name,
+            nonce=acc_nonce,
+            transactions=transactions,
+            reserved_nonce=reserved_nonce,
+            kwargs=kwargs,
+        )
+        return presigned, ResponseStatus()
+
+    async def broadcast(
+        self, presigned: PresignedTransactions, gas_price: GasCandidate
+    ) -> Tuple[Optional[ReceiptFuture], ResponseStatus]:
+        """Send the presigned transaction for the chosen gas price
+
+        returns:
+            Future resolving to the transaction receipt (see `submit()`)
+        """
+
+        tx_signed = presigned.transactions.get(gas_price)
+        if tx_signed is None:
+            msg = f"Contract.broadcast({presigned.func_name}) error: No transaction signed for gas price {gas_price}"
+            return None, error_status(msg, log=logger.error)
+
+        try:
+            logger.debug(f"Broadcasting presigned transaction: {presigned.func_name}")
+            tx_hash = await self.send_raw_transaction(tx_signed.rawTransaction)
+
+        except Exception as e:
+            self.discard(presigned)
+            note = "Send transaction failed"
+            return None, error_status(note, log=logger.error, e=e)
+
+        receipt_future = get_receipt_poller(self.node).track(tx_hash)
+        self._learn_gas_used(presigned.func_name, presigned.kwargs, receipt_future)
+
+        return receipt_future, ResponseStatus()
+
+    def discard(self, presigned: PresignedTransactions) -> None:
+        """Give up on presigned transactions that will not be broadcast
+
+        The nonce manager re-syncs so the unused nonce is handed out again.
+        """
+        if presigned.reserved_nonce:
+            nonce_manager.reset(self.node.chain_id, self.local_account.address)
+
+    def _sign_transaction(
+        self,
+        func_name: str,
+        gas_limit: Optional[int],
+        legacy_gas_price: Optional[float],
+        max_priority_fee_per_gas: Optional[float],
+        max_fee_per_gas: Optional[float],
+        acc_nonce: int,
+        **kwargs: Any,
+    ) -> Tuple[Optional[SignedTransaction], ResponseStatus]:
+        """Build and sign a contract transaction with the given nonce and gas settings"""
+
+        assert self.contract is not None
+        acc = self.local_account
+
         try:
             # build transaction
-            contract_function = self.contract.get_function_by_name(func_name)
+            contract_function = self.get_function(func_name)
             transaction = contract_function(**kwargs)
 
             # start tx dict with static elements
-            tx_dict = {
+            tx_dict: Dict[str, Any] = {
                 "from": acc.address,
                 "nonce": acc_nonce,
             }
             # Estimate gas_limit if not provided
             if gas_limit is None:
                 try:
-                    gas_limit = transaction.estimateGas(tx_dict)
+                    gas_limit = self._gas_limit(func_name, transaction, tx_dict, kwargs)
                 except Exception as e:
                     msg = f"Contract.write({func_name}) error: Unable to estimate gas"
                     return None, error_status(msg, e=e, log=logger.error)
@@ -191,28 +599,75 @@ class Contract:
                             must provide either legacy
                             or EIP-1559 gas arguments"""
                         )
-            # pass in tx dict to build the transaction
-            built_tx = transaction.buildTransaction(tx_dict)
+            if "gasPrice" in tx_dict or "maxPriorityFeePerGas" in tx_dict:
+                # All fields are known: only calldata needs to be added
+                built_tx = {
+                    **tx_dict,
+                    "to": self.address,
+                    "value": 0,
+                    "data": transaction._encode_transaction_data(),
+                    "chainId": self.chain_id,
+                }
+            else:
+                # pass in tx dict to build the transaction (fills in missing gas fields)
+                built_tx = transaction.buildTransaction(tx_dict)
             # submit transaction
-            tx_signed = acc.sign_transaction(built_tx)
+            tx_signed = acc.sign_transaction(built_tx)  # type: ignore
 
         except Exception as e:
             note = "Failed to build transaction"
             return None, error_status(note, log=logger.error, e=e)
 
-        try:
-            logger.debug(f"Sending transaction: {func_name}")
-            tx_hash = self.node.web3.eth.send_raw_transaction(tx_signed.rawTransaction)
+        return tx_signed, ResponseStatus()
 
-        except Exception as e:
-            note = "Send transaction failed"
-            return None, error_status(note, log=logger.error, e=e)
+    def _gas_limit(
+        self, func_name: str, transaction: ContractFunction, tx_dict: Dict[str, Any], kwargs: Dict[str, Any]
+    ) -> int:
+        """Gas limit learned from recent receipts, estimated by the node on a miss"""
+        key = gas_limit_key(self.node.chain_id, self.address, func_name, kwargs)
+
+        gas_limit = gas_limit_estimator.get(key)
+        if gas_limit is None:
+            gas_limit = int(transaction.estimateGas(tx_dict))
+            gas_limit_estimator.record(key, gas_limit)
+
+        return gas_limit
+
+    def _learn_gas_used(self, func_name: str, kwargs: Dict[str, Any], receipt_future: ReceiptFuture) -> None:
+        """Update the gas limit estimator once a submitted transaction is mined"""
+        key = gas_limit_key(self.node.chain_id, self.address, func_name, kwargs)
+
+        def _on_receipt(future: ReceiptFuture) -> None:
+            if future.cancelled() or future.exception() is not None:
+                return
+            receipt = future.result()
+            if receipt["status"] == 1:
+                gas_limit_estimator.record(key, receipt["gasUsed"])
+            else:
+                gas_limit_estimator.invalidate(key)
+
+        receipt_future.add_done_callback(_on_receipt)
+
+    async def send_raw_transaction(self, raw_transaction: bytes) -> HexBytes:
+        """Broadcast a signed transaction, natively async if a session is attached"""
+
+        if self.node.async_enabled:
+            return HexBytes(await self.node.request("eth_sendRawTransaction", [HexBytes(raw_transaction).hex()]))
+
+        return HexBytes(self.node.web3.eth.send_raw_transaction(raw_transaction))
+
+    async def confirm(
+        self, func_name: str, receipt_future: ReceiptFuture
+    ) -> Tuple[Optional[AttributeDict[Any, Any]], ResponseStatus]:
+        """Wait for a submitted transaction's receipt and check its status"""
+
+        status = ResponseStatus()
 
         try:
             # Confirm transaction
-            tx_receipt = self.node.web3.eth.wait_for_transaction_receipt(tx_hash, timeout=360)
+            tx_receipt = await receipt_future
 
-            tx_url = f"{self.node.explorer}/tx/{tx_hash.hex()}"
+            tx_url = f"{self.node.explorer}/tx/{tx_receipt['transactionHash'].hex()}"
 
             if tx_receipt["status"] == 1:
                 logger.info(f"{func_name} transaction succeeded. ({tx_url})")
@@ -224,6 +679,13 @@ class Contract:
 
             return tx_receipt, status
 
+        except TimeExhausted as e:
+            # The transaction may have been dropped, so re-sync the nonce
+            if self.private_key:
+                nonce_manager.reset(self.node.chain_id, self.local_account.address)
+            note = "Failed to confirm transaction"
+            return None, error_status(note, log=logger.error, e=e)
+
         except Exception as e:
             note = "Failed to confirm transaction"
             return None, error_status(note, log=logger.error, e=e)
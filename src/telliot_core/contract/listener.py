@@ -8,119 +8,301 @@ The goal is to allow users to subscribe to and define async callbacks for each e
 *Work in Progress*
 """
 import asyncio
+import json
 import logging
+import random
 import warnings
+from dataclasses import dataclass
+from dataclasses import field
 from typing import Any
-from typing import Awaitable
 from typing import Callable
+from typing import Coroutine
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
 from typing import List
 from typing import Literal
+from typing import Mapping
+from typing import Optional
+from typing import Set
 
 import aiohttp
 from aiohttp.client import _WSRequestContextManager
 from hexbytes import HexBytes
 from web3._utils.method_formatters import block_formatter
+from web3._utils.method_formatters import BLOCK_FORMATTERS
 from web3._utils.method_formatters import log_entry_formatter
+from web3._utils.method_formatters import LOG_ENTRY_FORMATTERS
 from web3._utils.method_formatters import syncing_formatter
+from web3._utils.method_formatters import SYNCING_FORMATTERS
+
+from telliot_core.contract.abi_registry import abi_registry
+from telliot_core.contract.abi_registry import event_decoder
+from telliot_core.model.endpoints import node_request
+from telliot_core.model.endpoints import RPCEndpoint
+
+try:
+    import orjson
+except ImportError:  # optional speedup: pip install telliot-core[fast]
+    orjson = None  # type: ignore
 
 logger = logging.getLogger(__name__)
 
-AsyncCallable = Callable[[Any], Awaitable[Any]]
+#: JSON parser for websocket messages (orjson if installed)
+json_loads: Callable[[Any], Any] = orjson.loads if orjson is not None else json.loads
+
+AsyncCallable = Callable[[Any], Coroutine[Any, Any, Any]]
 
 SubscriptionType = Literal["newHeads", "logs", "newPendingTransactions", "syncing"]
 
+DispatchPolicy = Literal["drop", "block", "coalesce"]
 
-async def receive_message_task(
-    ws: aiohttp.ClientWebSocketResponse,
-    handler: AsyncCallable,
-    formatter: Callable[..., Any],
-) -> None:
-    """A long running task that listens for JSON messages on an open websocket.
-    The handler is called once for each message.
+#: Number of recent blocks/logs remembered per subscription to drop duplicates
+SEEN_MESSAGES = 1024
 
-    Args:
-        ws: Open websocket connection
-        handler: An async function that takes the JSON message as a single argument
-        formatter: An optional message formatter
 
-    Returns: None
-        Does not return until task is cancelled.
+class LazyFormattedDict(Mapping[str, Any]):
+    """Read-only view of a JSON-RPC result that formats each field on first access
 
+    Fields are converted with the same web3 formatters as `block_formatter`
+    or `log_entry_formatter`, but only when read, so a handler that only
+    needs `number` or `topics` does not pay for formatting the rest.
+    Fields are available as keys or attributes (like web3's `AttributeDict`).
     """
-    while True:
+
+    __slots__ = ("_raw", "_formatters", "_cache")
+
+    def __init__(self, raw: Dict[str, Any], formatters: Dict[str, Callable[[Any], Any]]):
+        self._raw = raw
+        self._formatters = formatters
+        self._cache: Dict[str, Any] = {}
+
+    @property
+    def raw(self) -> Dict[str, Any]:
+        """Unformatted JSON-RPC result"""
+        return self._raw
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+
+        value = self._raw[key]
+        formatter = self._formatters.get(key)
+        if formatter is not None:
+            value = formatter(value)
+        self._cache[key] = value
+        return value
+
+    def __getattr__(self, name: str) -> Any:
+        # Private and special names are never fields.  This also stops copy and
+        # pickle, which look up attributes before __init__ has run, from recursing.
+        if name.startswith("_"):
+            raise AttributeError(name)
         try:
-            message = await asyncio.wait_for(ws.receive_json(), timeout=60)
-            # sub_id = message["params"]["subscription"]
-            # logger.info(f"handled block subscription: {sub_id}")
-            result = message["params"]["result"]
-            formatted_result = formatter(result)
-            asyncio.create_task(handler(formatted_result))  # type: ignore
-
-        except asyncio.CancelledError:
-            logger.debug("Listener cancelled")
-            break
-        except asyncio.exceptions.TimeoutError:
-            continue
-
-
-async def eth_subscribe(
-    *,
-    ws: aiohttp.ClientWebSocketResponse,
-    name: SubscriptionType,
-    lid: int = 1,
-    **kwargs: Any,
-) -> HexBytes:
-    """Subscribe
-
-    Args:
-        ws: Websocket connection
-        lid: Listener ID
-        name: Subscription type/name, one of "newHeads", "logs", "newPendingTransactions", "syncing"
-        **kwargs: Subscription parameter dict.  See (see https://geth.ethereum.org/docs/rpc/pubsub)
-
-    Returns:
-        Subscription ID
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._raw!r})"
 
-    """
 
-    logger.debug(f"New {name} subscription")
+def lazy_formatter(formatters: Dict[str, Callable[[Any], Any]]) -> Callable[[Dict[str, Any]], LazyFormattedDict]:
+    """Formatter returning a `LazyFormattedDict` instead of formatting every field"""
 
-    if kwargs:
-        msg = {
-            "jsonrpc": "2.0",
-            "id": lid,
-            "method": "eth_subscribe",
-            "params": [name, kwargs],
-        }
-    else:
-        msg = {"jsonrpc": "2.0", "id": lid, "method": "eth_subscribe", "params": [name]}
-    await ws.send_json(msg)
+    def format_lazily(raw: Dict[str, Any]) -> LazyFormattedDict:
+        return LazyFormattedDict(raw, formatters)
 
-    subscription_response = await ws.receive_json()
+    return format_lazily
 
-    lid_rx = subscription_response.get("id")
-    assert lid_rx == lid
 
-    sub_result = subscription_response.get("result")
-    if not sub_result:
-        logger.error("Subscription failed:")
-        logger.error(subscription_response)
-        raise Exception("Subscription Failed")
+lazy_block_formatter = lazy_formatter(BLOCK_FORMATTERS)
+lazy_log_entry_formatter = lazy_formatter(LOG_ENTRY_FORMATTERS)
+lazy_syncing_formatter = lazy_formatter(SYNCING_FORMATTERS)
 
-    return HexBytes(sub_result)
+
+def _raw(result: Any) -> Any:
+    return result
+
+
+class Dispatcher:
+    """Run a handler on messages from a bounded queue with a fixed pool of workers
+
+    When the queue is full, new messages are handled according to `policy`:
+
+    - "drop": discard the new message
+    - "block": wait for room, pausing the websocket reader (backpressure)
+    - "coalesce": discard the oldest queued message, keeping the newest ones
+    """
+
+    def __init__(
+        self,
+        handler: AsyncCallable,
+        formatter: Callable[..., Any],
+        max_queue: int = 1000,
+        workers: int = 1,
+        policy: DispatchPolicy = "drop",
+    ):
+        if policy not in ("drop", "block", "coalesce"):
+            raise ValueError(f"Unknown dispatch policy: {policy}")
+
+        self.handler = handler
+        self.formatter = formatter
+        self.policy = policy
+
+        #: Messages discarded because the queue was full
+        self.dropped = 0
+        #: Messages passed to the handler
+        self.processed = 0
+        #: Messages whose handler raised an exception
+        self.failed = 0
+
+        self._queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=max_queue)
+        self._workers = [asyncio.create_task(self._work(), name=f"listener_worker_{i}") for i in range(workers)]
+
+    @property
+    def depth(self) -> int:
+        """Number of messages waiting in the queue"""
+        return self._queue.qsize()
+
+    async def put(self, message: Any) -> None:
+        """Queue a raw message for the handler"""
+        if not self._queue.full():
+            self._queue.put_nowait(message)
+        elif self.policy == "block":
+            await self._queue.put(message)
+        elif self.policy == "coalesce":
+            self._queue.get_nowait()
+            self._queue.task_done()
+            self._queue.put_nowait(message)
+            self.dropped += 1
+        else:
+            self.dropped += 1
+
+    async def _work(self) -> None:
+        while True:
+            message = await self._queue.get()
+            try:
+                await self.handler(self.formatter(message))
+                self.processed += 1
+            except Exception:
+                self.failed += 1
+                logger.exception("Listener handler failed")
+            finally:
+                self._queue.task_done()
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+
+
+@dataclass
+class Subscription:
+    """An `eth_subscribe` subscription kept alive across reconnects"""
+
+    #: Local ID, also used as the JSON-RPC request ID when subscribing
+    lid: int
+
+    name: SubscriptionType
+
+    #: Subscription parameters (e.g. log filter)
+    params: Dict[str, Any]
+
+    handler: AsyncCallable
+    formatter: Callable[..., Any]
+
+    #: Subscription ID assigned by the node on the current connection
+    sub_id: Optional[str] = None
+
+    #: Number of the newest block seen, used to backfill after a reconnect
+    last_block: Optional[int] = None
+
+    #: Bounded dispatch queue, or None to start a task per message
+    dispatcher: Optional[Dispatcher] = None
+
+    #: Keys of recently delivered messages (oldest first), to drop duplicates after a backfill
+    _seen: Dict[Any, None] = field(default_factory=dict, repr=False)
+
+    def message_key(self, result: Any) -> Any:
+        """Key identifying a block or log message, or None for other subscriptions"""
+        if self.name == "newHeads":
+            return result.get("hash")
+        if self.name == "logs":
+            return result.get("blockHash"), result.get("logIndex")
+        return None
+
+    def block_number(self, result: Any) -> Optional[int]:
+        if self.name == "newHeads":
+            return int(result["number"], 16)
+        if self.name == "logs" and result.get("blockNumber"):
+            return int(result["blockNumber"], 16)
+        return None
 
 
 class Listener:
-    def __init__(self, *, session: aiohttp.ClientSession, ws_url: str):
+    """Multiplexed websocket subscriptions with automatic reconnect
+
+    All subscriptions share one websocket.  Notifications are dispatched
+    to handlers by subscription ID.  If the connection drops, the listener
+    reconnects with exponential backoff, resubscribes, and backfills blocks
+    and logs emitted while it was disconnected (up to `max_backfill_blocks`,
+    fetched with at most `max_backfill_requests` requests in flight).
+    """
+
+    def __init__(
+        self,
+        *,
+        session: Optional[aiohttp.ClientSession],
+        ws_url: str,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 60.0,
+        max_backfill_blocks: int = 1000,
+        max_backfill_requests: int = 8,
+        heartbeat: float = 30.0,
+    ):
 
         self._session = session
 
         self._url: str = ws_url
-        self._tasks: List[asyncio.Task[None]] = []
         self._listener_id: int = 0
 
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.max_backfill_blocks = max_backfill_blocks
+        self.max_backfill_requests = max_backfill_requests
+        self.heartbeat = heartbeat
+
+        #: Number of times the websocket was reconnected
+        self.reconnects = 0
+
+        self._subscriptions: Dict[int, Subscription] = {}
+        self._by_sub_id: Dict[str, Subscription] = {}
+        self._requests: Dict[int, asyncio.Future[Any]] = {}
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._task: Optional[asyncio.Task[None]] = None
+        self._handler_tasks: Set[asyncio.Task[Any]] = set()
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None and not self._ws.closed
+
+    @property
+    def subscriptions(self) -> List[Subscription]:
+        return list(self._subscriptions.values())
+
     def connect(self) -> _WSRequestContextManager:  # aiohttp.ClientWebSocketResponse:
-        return self._session.ws_connect(self._url)
+        if self._session is None:
+            raise ConnectionError("Listener requires an aiohttp session to open a websocket")
+        return self._session.ws_connect(self._url, heartbeat=self.heartbeat)
 
     def _get_listener_id(self) -> int:
         """Generate sequential IDs for subscription requests"""
@@ -132,6 +314,9 @@ class Listener:
         handler: AsyncCallable,
         name: SubscriptionType,
         formatter: Callable[..., Any],
+        max_queue: Optional[int] = None,
+        workers: int = 1,
+        policy: DispatchPolicy = "drop",
         **kwargs: Any,
     ) -> None:
         """Create a subscription using eth_subscribe
@@ -142,6 +327,15 @@ class Listener:
             name:
                 Subscription type/name, one of:
                     "newHeads", "logs", "newPendingTransactions", "syncing"
+            max_queue:
+                If set, messages wait in a queue of this size and are handled by
+                `workers` tasks (see `Dispatcher`).  Otherwise a task is started
+                for every message.
+            workers:
+                Number of concurrent handler calls when `max_queue` is set
+            policy:
+                What to do with new messages when the queue is full:
+                "drop", "block" or "coalesce"
             **kwargs:
                 Subscription parameter dict.
                 See (see https://geth.ethereum.org/docs/rpc/pubsub)
@@ -150,74 +344,462 @@ class Listener:
 
         """
 
-        # Create a unique ID/name for the subscription
-        lid = self._get_listener_id()
-        task_name = f"listener_task_{lid}"
+        dispatcher = None
+        if max_queue is not None:
+            dispatcher = Dispatcher(handler, formatter, max_queue=max_queue, workers=workers, policy=policy)
 
-        # Launch a task and store a reference locally for later cancellation
-        # Note that storing this reference delays exceptions until garbage collection.
-        # Therefore, task is wrapped with a task_done callback to immediately catch exceptions
-        task = asyncio.create_task(
-            self._eth_subscribe_task(handler=handler, name=name, lid=lid, formatter=formatter, **kwargs),
-            name=task_name,
+        sub = Subscription(
+            lid=self._get_listener_id(),
+            name=name,
+            params=kwargs,
+            handler=handler,
+            formatter=formatter,
+            dispatcher=dispatcher,
         )
+        self._subscriptions[sub.lid] = sub
 
-        task.add_done_callback(_handle_task_result)
-        self._tasks.append(task)
+        # The connection task subscribes everything registered when it connects
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="listener_task")
+            self._task.add_done_callback(_handle_task_result)
+        elif self.connected:
+            task = asyncio.create_task(self._subscribe(sub), name=f"listener_subscribe_{sub.lid}")
+            task.add_done_callback(_handle_task_result)
+
+    async def subscribe_new_blocks(self, handler: AsyncCallable, lazy: bool = False, **dispatch: Any) -> None:
+        """Subscribe to new block headers
+
+        With `lazy=True`, the handler gets a `LazyFormattedDict` that formats
+        only the fields it reads.
+        """
+        formatter = lazy_block_formatter if lazy else block_formatter
+        await self.eth_subscribe(handler=handler, name="newHeads", formatter=formatter, **dispatch)
+
+    async def subscribe_contract_events(
+        self,
+        handler: AsyncCallable,
+        address: str,
+        events: Optional[Iterable[str]] = None,
+        abi: Optional[List[Dict[str, Any]]] = None,
+        lazy: bool = False,
+        **dispatch: Any,
+    ) -> None:
+        """Subscribe to the logs of a contract
+
+        Args:
+            handler: Async function called with each log
+            address: Contract address
+            events: Names of events to receive, e.g. ["NewReport"].  The node
+                only sends logs with these topics and the handler gets them
+                decoded (like `contract.events.NewReport().processLog`).
+                Requires `abi`.
+            abi: Contract ABI, to decode all of its events, or those in `events`
+            lazy: Pass undecoded logs as a `LazyFormattedDict` that formats
+                only the fields the handler reads
+        """
+        if events is not None and abi is None:
+            raise ValueError("Subscribing to events by name requires the contract ABI")
+
+        formatter: Callable[..., Any] = lazy_log_entry_formatter if lazy else log_entry_formatter
+        params: Dict[str, Any] = {"address": address}
+
+        if abi is not None:
+            topic_abis = abi_registry.register(abi).events(events)
+            if events is not None:
+                params["topics"] = [[topic.hex() for topic in topic_abis]]
 
-    async def subscribe_new_blocks(self, handler: AsyncCallable) -> None:
+            decode = event_decoder(topic_abis)
 
-        await self.eth_subscribe(handler=handler, name="newHeads", formatter=block_formatter)
+            def decode_event(log: Any) -> Any:
+                return decode(log_entry_formatter(log))
 
-    async def subscribe_contract_events(self, handler: AsyncCallable, address: str) -> None:
+            formatter = decode_event
 
-        await self.eth_subscribe(handler=handler, name="logs", address=address, formatter=log_entry_formatter)
+        await self.eth_subscribe(handler=handler, name="logs", formatter=formatter, **params, **dispatch)
 
-    async def subscribe_pending_transactions(self, handler: AsyncCallable) -> None:
+    async def subscribe_pending_transactions(
+        self,
+        handler: AsyncCallable,
+        max_queue: Optional[int] = 10_000,
+        workers: int = 4,
+        policy: DispatchPolicy = "drop",
+        lazy: bool = False,
+    ) -> None:
+        """Subscribe to pending transaction hashes
+
+        Mempool traffic can spike far beyond what a handler keeps up with, so
+        messages are queued in a bounded queue by default and dropped when it
+        is full.  With `lazy=True`, the handler gets the hash as a hex string.
+        """
 
         await self.eth_subscribe(
             handler=handler,
             name="newPendingTransactions",
-            formatter=pending_transaction_formatter,
+            formatter=_raw if lazy else pending_transaction_formatter,
+            max_queue=max_queue,
+            workers=workers,
+            policy=policy,
         )
-        # await self.eth_subscribe(handler=handler, name='newPendingTransactions')
 
-    async def subscribe_syncing(self, handler: AsyncCallable) -> None:
+    async def subscribe_syncing(self, handler: AsyncCallable, lazy: bool = False, **dispatch: Any) -> None:
+
+        formatter = lazy_syncing_formatter if lazy else syncing_formatter
+        await self.eth_subscribe(handler=handler, name="syncing", formatter=formatter, **dispatch)
+
+    async def _run(self) -> None:
+        """Keep the websocket connected, reconnecting with backoff
+
+        Note: Does not return until asyncio.Cancelled event
+        """
+        delay = self.reconnect_delay
+        connected_before = False
+
+        while True:
+            try:
+                async with self.connect() as ws:
+                    self._ws = ws
+                    reader = asyncio.create_task(self._read_messages(ws), name="listener_reader")
+                    try:
+                        for sub in list(self._subscriptions.values()):
+                            await self._subscribe(sub)
+                        if connected_before:
+                            await self._backfill()
+                        connected_before = True
+                        delay = self.reconnect_delay
+                        await reader
+                    finally:
+                        reader.cancel()
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Listener connection to {self._url} failed: {e!r}")
+            finally:
+                self._disconnected()
+
+            logger.info(f"Listener reconnecting in {delay:.1f} seconds")
+            await asyncio.sleep(delay * (1 + random.random() / 2))
+            delay = min(delay * 2, self.max_reconnect_delay)
+            self.reconnects += 1
+
+    def _disconnected(self) -> None:
+        """Forget state tied to the closed connection"""
+        self._ws = None
+        self._by_sub_id = {}
+        for sub in self._subscriptions.values():
+            sub.sub_id = None
+        for future in self._requests.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Listener websocket closed"))
+        self._requests = {}
+
+    async def _request(self, method: str, params: List[Any], request_id: Optional[int] = None) -> Any:
+        """Send a JSON-RPC request over the websocket and wait for its response"""
+        if self._ws is None:
+            raise ConnectionError("Listener websocket not connected")
+
+        if request_id is None:
+            request_id = self._get_listener_id()
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._requests[request_id] = future
+
+        await self._ws.send_json({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+        response = await asyncio.wait_for(future, timeout=60)
+
+        if "error" in response:
+            raise ValueError(response["error"])
+        return response["result"]
+
+    async def _subscribe(self, sub: Subscription) -> None:
+        """Send eth_subscribe for a subscription on the current connection"""
+        logger.debug(f"New {sub.name} subscription")
+        params: List[Any] = [sub.name, sub.params] if sub.params else [sub.name]
+        sub_id = await self._request("eth_subscribe", params, request_id=sub.lid)
+        if not sub_id:
+            raise Exception("Subscription Failed")
+
+        sub.sub_id = sub_id
+        self._by_sub_id[sub_id] = sub
+
+        if sub.name == "logs":
+            logger.info(f"Subscribed to contract address={sub.params.get('address')} (id={sub_id})")
+        else:
+            logger.info(f"New {sub.name} subscription (id={sub_id})")
+
+    async def _read_messages(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        """Route responses and subscription notifications until the websocket closes"""
+        async for msg in ws:
+            if msg.type != aiohttp.WSMsgType.TEXT:
+                if msg.type == aiohttp.WSMsgType.ERROR:
+                    logger.warning(f"Listener websocket error: {ws.exception()!r}")
+                    break
+                continue
+
+            message = json_loads(msg.data)
+
+            if message.get("method") == "eth_subscription":
+                params = message["params"]
+                sub = self._by_sub_id.get(params["subscription"])
+                if sub is not None:
+                    await self._deliver(sub, params["result"])
+
+            elif message.get("id") in self._requests:
+                future = self._requests.pop(message["id"])
+                if not future.done():
+                    future.set_result(message)
+
+    async def _deliver(self, sub: Subscription, result: Any) -> None:
+        """Pass a message to its handler, skipping duplicates"""
+        key = sub.message_key(result)
+        if key is not None:
+            if key in sub._seen:
+                return
+            sub._seen[key] = None
+            if len(sub._seen) > SEEN_MESSAGES:
+                del sub._seen[next(iter(sub._seen))]
+
+        block_number = sub.block_number(result)
+        if block_number is not None and (sub.last_block is None or block_number > sub.last_block):
+            sub.last_block = block_number
+
+        if sub.dispatcher is not None:
+            await sub.dispatcher.put(result)
+            return
+
+        task: asyncio.Task[Any] = asyncio.create_task(sub.handler(sub.formatter(result)))
+        self._handler_tasks.add(task)
+        task.add_done_callback(self._handler_tasks.discard)
+        task.add_done_callback(_handle_task_result)
+
+    async def _get_blocks(self, numbers: Iterable[int]) -> List[Any]:
+        """Fetch blocks by number, with at most `max_backfill_requests` requests in flight"""
+        semaphore = asyncio.Semaphore(self.max_backfill_requests)
 
-        await self.eth_subscribe(handler=handler, name="syncing", formatter=syncing_formatter)
+        async def get_block(number: int) -> Any:
+            async with semaphore:
+                return await self._request("eth_getBlockByNumber", [hex(number), False])
+
+        return list(await asyncio.gather(*[get_block(n) for n in numbers]))
+
+    async def _backfill(self) -> None:
+        """Deliver blocks and logs emitted while disconnected
+
+        A failed backfill is logged and its range skipped.  Only a lost
+        connection is raised, to reconnect.
+        """
+        subs = [s for s in self._subscriptions.values() if s.name in ("newHeads", "logs") and s.last_block is not None]
+        if not subs:
+            return
+
+        try:
+            head = int(await self._request("eth_blockNumber", []), 16)
+        except ConnectionError:
+            raise
+        except Exception as e:
+            logger.warning(f"Listener backfill skipped, unable to get the block number: {e!r}")
+            return
+
+        for sub in subs:
+            assert sub.last_block is not None
+            from_block = max(sub.last_block + 1, head - self.max_backfill_blocks + 1)
+            if from_block > head:
+                continue
+            if from_block > sub.last_block + 1:
+                logger.warning(f"Listener missed blocks {sub.last_block + 1} to {from_block - 1}, not backfilled")
+
+            logger.info(f"Backfilling {sub.name} subscription from block {from_block} to {head}")
+            try:
+                if sub.name == "newHeads":
+                    for block in await self._get_blocks(range(from_block, head + 1)):
+                        if block is not None:
+                            await self._deliver(sub, block)
+                else:
+                    log_filter = {**sub.params, "fromBlock": hex(from_block), "toBlock": hex(head)}
+                    for log in await self._request("eth_getLogs", [log_filter]):
+                        await self._deliver(sub, log)
+            except ConnectionError:
+                raise
+            except Exception as e:
+                # e.g. the node rejects a wide eth_getLogs range: skip it rather than reconnect forever
+                logger.warning(f"Listener missed {sub.name} from block {from_block} to {head}, backfill failed: {e!r}")
+                sub.last_block = max(sub.last_block, head)
+
+    async def shutdown(self) -> None:
+        """Shut down the websocket connection and all subscriptions"""
+        if self._task:
+            logger.info(f"Shutting down listener {self._task.get_name()}")
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for sub in self._subscriptions.values():
+            if sub.dispatcher is not None:
+                await sub.dispatcher.stop()
+        self._subscriptions = {}
+
+    def __del__(self) -> None:
+        if self._task and not self._task.done():
+            warnings.warn("Listener.shutdown() not awaited.", stacklevel=2)
 
-    async def _eth_subscribe_task(
+
+class PollingListener(Listener):
+    """Listener for HTTP endpoints, polling the node instead of using eth_subscribe
+
+    It has the same subscription API as `Listener` (new blocks and contract
+    events).  A single polling loop serves every subscription: each poll
+    requests the chain head, fetches new blocks once for all block
+    subscriptions and runs one `eth_getLogs` per distinct log filter over
+    the new block range.
+
+    The poll interval adapts to the chain: it grows while no new block
+    appears and halves when several blocks arrived between two polls,
+    staying between `min_poll_interval` and `max_poll_interval`.
+    """
+
+    def __init__(
+        self,
+        node: RPCEndpoint,
+        *,
+        poll_interval: float = 2.0,
+        min_poll_interval: float = 0.5,
+        max_poll_interval: float = 30.0,
+        max_backfill_blocks: int = 1000,
+        max_backfill_requests: int = 8,
+        timeout: float = 10.0,
+    ):
+        # No websocket: requests go through the endpoint and its session, if any
+        super().__init__(
+            session=None,
+            ws_url=node.url,
+            max_backfill_blocks=max_backfill_blocks,
+            max_backfill_requests=max_backfill_requests,
+        )
+
+        self.node = node
+        self.timeout = timeout
+        self.min_poll_interval = min_poll_interval
+        self.max_poll_interval = max_poll_interval
+
+        #: Current delay between polls (seconds)
+        self.poll_interval = poll_interval
+
+        #: Number of polls sent
+        self.polls = 0
+
+        #: Newest block seen by the last poll
+        self.head: Optional[int] = None
+
+    @property
+    def connected(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def eth_subscribe(
         self,
         handler: AsyncCallable,
         name: SubscriptionType,
-        lid: int,
         formatter: Callable[..., Any],
+        max_queue: Optional[int] = None,
+        workers: int = 1,
+        policy: DispatchPolicy = "drop",
         **kwargs: Any,
     ) -> None:
-        """A long running listener task.
+        if name not in ("newHeads", "logs"):
+            raise ValueError(f"{name} subscriptions are not supported over HTTP")
 
-        Note: Does not return until asyncio.Cancelled event
-        """
+        await super().eth_subscribe(
+            handler, name, formatter, max_queue=max_queue, workers=workers, policy=policy, **kwargs
+        )
 
-        async with self.connect() as ws:
-            sub_result = await eth_subscribe(ws=ws, name=name, lid=lid, **kwargs)
-            if name == "logs":
-                logger.info(f"Subscribed to contract address={kwargs['address']} (id={sub_result.hex()})")
+    async def _subscribe(self, sub: Subscription) -> None:
+        # Like eth_subscribe, start with the next block
+        if sub.last_block is None:
+            sub.last_block = self.head
+
+    async def _request(self, method: str, params: List[Any], request_id: Optional[int] = None) -> Any:
+        return await node_request(self.node, method, params, timeout=self.timeout)
+
+    async def _run(self) -> None:
+        """Poll for new blocks and logs until cancelled"""
+        while True:
+            try:
+                new_blocks = await self._poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Listener poll failed: {e!r}")
+                self.poll_interval = min(self.max_poll_interval, self.poll_interval * 2)
             else:
-                logger.info(f"New {name} subscription (id={sub_result.hex()})")
-            await receive_message_task(ws=ws, handler=handler, formatter=formatter)
+                if new_blocks == 0:
+                    self.poll_interval = min(self.max_poll_interval, self.poll_interval * 1.25)
+                elif new_blocks > 1:
+                    self.poll_interval = max(self.min_poll_interval, self.poll_interval / 2)
 
-    async def shutdown(self) -> None:
-        """Shut down all asyncio subscription tasks"""
-        for task in self._tasks:
-            logger.info(f"Shutting down listener {task.get_name()}")
-            task.cancel()
-        await asyncio.gather(*self._tasks)
-        self._tasks = []
+            await asyncio.sleep(self.poll_interval)
 
-    def __del__(self) -> None:
-        if self._tasks:
-            warnings.warn("Listener.shutdown() not awaited.", stacklevel=2)
+    async def _poll(self) -> int:
+        """Deliver blocks and logs since the last poll
+
+        returns:
+            Number of new blocks
+        """
+        self.polls += 1
+        head = int(await self._request("eth_blockNumber", []), 16)
+        previous_head, self.head = self.head, head
+
+        subs = list(self._subscriptions.values())
+        for sub in subs:
+            if sub.last_block is None:
+                sub.last_block = head if previous_head is None else previous_head
+
+        pending = [s for s in subs if s.last_block is not None and s.last_block < head]
+        if pending:
+            await self._poll_blocks([s for s in pending if s.name == "newHeads"], head)
+            await self._poll_logs([s for s in pending if s.name == "logs"], head)
+
+            # Also advance subscriptions with no messages in the range
+            for sub in pending:
+                sub.last_block = head
+
+        return 0 if previous_head is None else max(0, head - previous_head)
+
+    def _first_block(self, sub: Subscription, head: int) -> int:
+        assert sub.last_block is not None
+        from_block = max(sub.last_block + 1, head - self.max_backfill_blocks + 1)
+        if from_block > sub.last_block + 1:
+            logger.warning(f"Listener missed blocks {sub.last_block + 1} to {from_block - 1}")
+        return from_block
+
+    async def _poll_blocks(self, subs: List[Subscription], head: int) -> None:
+        """Fetch new blocks once for all block subscriptions"""
+        if not subs:
+            return
+
+        first = {sub.lid: self._first_block(sub, head) for sub in subs}
+        numbers = range(min(first.values()), head + 1)
+        blocks = await self._get_blocks(numbers)
+
+        for number, block in zip(numbers, blocks):
+            if block is None:
+                continue
+            for sub in subs:
+                if number >= first[sub.lid]:
+                    await self._deliver(sub, block)
+
+    async def _poll_logs(self, subs: List[Subscription], head: int) -> None:
+        """Run one eth_getLogs per distinct log filter"""
+        groups: Dict[str, List[Subscription]] = {}
+        for sub in subs:
+            groups.setdefault(json.dumps(sub.params, sort_keys=True), []).append(sub)
+
+        async def poll_group(group: List[Subscription]) -> None:
+            first = {sub.lid: self._first_block(sub, head) for sub in group}
+            log_filter = {**group[0].params, "fromBlock": hex(min(first.values())), "toBlock": hex(head)}
+            for log in await self._request("eth_getLogs", [log_filter]):
+                number = int(log["blockNumber"], 16)
+                for sub in group:
+                    if number >= first[sub.lid]:
+                        await self._deliver(sub, log)
+
+        await asyncio.gather(*[poll_group(group) for group in groups.values()])
 
 
 def _handle_task_result(task: asyncio.Task[Any]) -> None:
@@ -283,9 +865,10 @@ if __name__ == "__main__":
                 address=oracle_info.address[core.config.main.chain_id],
             )
 
-            # Subscribe to pending transactions:
+            # Subscribe to pending transactions (websocket endpoints only, see RPCEndpoint.ws_url):
             # Warning: Very high RPC transaction rate
-            await core.listener.subscribe_pending_transactions(handler=pending_transaction_logger)
+            if not isinstance(core.listener, PollingListener):
+                await core.listener.subscribe_pending_transactions(handler=pending_transaction_logger)
 
             await asyncio.sleep(1011)
 
@@ -0,0 +1,180 @@
+"""
+Historical `eth_getLogs` scans with adaptive block ranges
+"""
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+from typing import AsyncIterator
+from typing import Callable
+from typing import Deque
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from web3._utils.method_formatters import log_entry_formatter
+
+from telliot_core.contract.abi_registry import abi_registry
+from telliot_core.contract.abi_registry import event_decoder
+from telliot_core.contract.contract import Contract
+from telliot_core.model.endpoints import node_request
+from telliot_core.model.endpoints import RPCEndpoint
+
+logger = logging.getLogger(__name__)
+
+#: Fragments of provider errors meaning the block range or result set is too large
+RANGE_ERROR_MESSAGES = (
+    "more than",
+    "too many",
+    "too large",
+    "too wide",
+    "limit exceeded",
+    "size exceeded",
+    "exceed maximum",
+    "block range",
+    "range is too",
+    "timeout",
+    "timed out",
+)
+
+
+def is_range_error(e: Exception) -> bool:
+    """True if an eth_getLogs error can be fixed by asking for fewer blocks"""
+    if isinstance(e, asyncio.TimeoutError):
+        return True
+    msg = str(e).lower()
+    return any(fragment in msg for fragment in RANGE_ERROR_MESSAGES)
+
+
+@dataclass
+class LogChunk:
+    """Logs of one block range, in block order"""
+
+    from_block: int
+    to_block: int
+    logs: List[Any]
+
+
+class LogFetcher:
+    """Fetch logs over large block ranges
+
+    The range is split into chunks of `span` blocks, fetched by up to
+    `max_concurrency` concurrent requests and returned in block order.
+    When the provider rejects a chunk as too large (too many results, block
+    range too wide or a timeout), the chunk is halved and the span shrinks;
+    each full chunk that succeeds grows the span by `growth`, up to
+    `max_span`.
+
+    Usage:
+        fetcher = LogFetcher.for_contract(oracle, ["NewReport"])
+        async for event in fetcher.fetch(from_block, to_block):
+            print(event.args._queryId)
+    """
+
+    def __init__(
+        self,
+        node: RPCEndpoint,
+        address: Union[str, List[str], None] = None,
+        topics: Optional[List[Any]] = None,
+        *,
+        decoder: Optional[Callable[[Any], Any]] = None,
+        span: int = 2000,
+        min_span: int = 1,
+        max_span: int = 100_000,
+        growth: float = 1.5,
+        max_concurrency: int = 4,
+        timeout: float = 30.0,
+    ):
+        self.node = node
+        self.address = address
+        self.topics = topics
+        self.decoder = decoder
+
+        #: Current number of blocks per request
+        self.span = span
+        self.min_span = min_span
+        self.max_span = max_span
+        self.growth = growth
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+
+        #: Number of chunks split after a range error
+        self.splits = 0
+
+    @classmethod
+    def for_contract(
+        cls, contract: Contract, event_names: Optional[Iterable[str]] = None, **kwargs: Any
+    ) -> "LogFetcher":
+        """Fetcher for events of one contract, decoded with its ABI
+
+        Args:
+            contract: Contract emitting the events
+            event_names: Events to fetch (default: all events in the ABI)
+        """
+        events = abi_registry.register(contract.abi).events(event_names)
+        topics = [[topic.hex() for topic in events]]
+        return cls(contract.node, contract.address, topics, decoder=event_decoder(events), **kwargs)
+
+    def _filter(self, from_block: int, to_block: int) -> Dict[str, Any]:
+        log_filter: Dict[str, Any] = {"fromBlock": hex(from_block), "toBlock": hex(to_block)}
+        if self.address is not None:
+            log_filter["address"] = self.address
+        if self.topics is not None:
+            log_filter["topics"] = self.topics
+        return log_filter
+
+    async def _fetch_range(self, from_block: int, to_block: int) -> List[Any]:
+        """Fetch one chunk, halving it until the provider accepts it"""
+        try:
+            logs = await node_request(
+                self.node, "eth_getLogs", [self._filter(from_block, to_block)], timeout=self.timeout
+            )
+        except Exception as e:
+            if from_block == to_block or not is_range_error(e):
+                raise
+
+            self.splits += 1
+            size = to_block - from_block + 1
+            self.span = max(self.min_span, min(self.span, size // 2))
+            logger.debug(f"eth_getLogs rejected {size} blocks from {from_block} ({e}), span now {self.span}")
+
+            middle = from_block + size // 2 - 1
+            first = await self._fetch_range(from_block, middle)
+            return first + await self._fetch_range(middle + 1, to_block)
+
+        if to_block - from_block + 1 >= self.span:
+            self.span = min(self.max_span, int(self.span * self.growth))
+
+        formatted: List[Any] = [log_entry_formatter(log) for log in logs]
+        if self.decoder is None:
+            return formatted
+        return [self.decoder(log) for log in formatted]
+
+    async def chunks(self, from_block: int, to_block: int) -> AsyncIterator[LogChunk]:
+        """Yield the logs of consecutive block ranges covering [from_block, to_block]"""
+        pending: Deque[Tuple[int, int, "asyncio.Task[List[Any]]"]] = deque()
+        next_block = from_block
+
+        try:
+            while pending or next_block <= to_block:
+                while next_block <= to_block and len(pending) < self.max_concurrency:
+                    end = min(next_block + self.span - 1, to_block)
+                    task = asyncio.create_task(self._fetch_range(next_block, end))
+                    pending.append((next_block, end, task))
+                    next_block = end + 1
+
+                start, end, task = pending.popleft()
+                yield LogChunk(start, end, await task)
+        finally:
+            for _, _, task in pending:
+                task.cancel()
+
+    async def fetch(self, from_block: int, to_block: int) -> AsyncIterator[Any]:
+        """Yield every log in [from_block, to_block] in block order"""
+        async for chunk in self.chunks(from_block, to_block):
+            for log in chunk.logs:
+                yield log
@@ -0,0 +1,244 @@
+"""
+Batch contract reads into a single Multicall3 `aggregate3` eth_call
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from eth_abi import decode_abi
+from eth_abi.exceptions import DecodingError
+from eth_utils import function_signature_to_4byte_selector
+from hexbytes import HexBytes
+from web3.contract import ContractFunction
+from web3.exceptions import ContractLogicError
+
+from telliot_core.apps.endpoint_pool import EndpointPool
+from telliot_core.contract.contract import Contract
+from telliot_core.contract.contract import decode_function_output
+from telliot_core.model.endpoints import RPCEndpoint
+from telliot_core.utils.response import ResponseStatus
+
+logger = logging.getLogger(__name__)
+
+#: Multicall3 is deployed at the same address on most EVM chains
+#: (see https://github.com/mds1/multicall)
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+AGGREGATE3_SELECTOR = function_signature_to_4byte_selector("aggregate3((address,bool,bytes)[])")
+
+#: Selector of the standard solidity `Error(string)` revert payload
+ERROR_STRING_SELECTOR = function_signature_to_4byte_selector("Error(string)")
+
+
+def encode_aggregate3(calls: List[Tuple[str, bool, bytes]]) -> bytes:
+    """ABI-encode `aggregate3` arguments
+
+    Produces the standard encoding of `(address,bool,bytes)[]` directly,
+    which is much faster than `eth_abi.encode_abi` for large batches.
+    """
+    heads: List[bytes] = []
+    tails: List[bytes] = []
+    offset = 32 * len(calls)
+    for address, allow_failure, calldata in calls:
+        heads.append(offset.to_bytes(32, "big"))
+        padding = b"\x00" * (-len(calldata) % 32)
+        tail = b"".join(
+            [
+                HexBytes(address).rjust(32, b"\x00"),
+                int(allow_failure).to_bytes(32, "big"),
+                (96).to_bytes(32, "big"),
+                len(calldata).to_bytes(32, "big"),
+                calldata,
+                padding,
+            ]
+        )
+        tails.append(tail)
+        offset += len(tail)
+
+    return b"".join([(32).to_bytes(32, "big"), len(calls).to_bytes(32, "big"), *heads, *tails])
+
+
+def decode_revert_reason(return_data: bytes) -> str:
+    """Decode the reason string from a reverted call's return data"""
+    if return_data[:4] == ERROR_STRING_SELECTOR:
+        try:
+            (reason,) = decode_abi(["string"], return_data[4:])
+            return f"execution reverted: {reason}"
+        except Exception:
+            pass
+    return "execution reverted"
+
+
+@dataclass
+class MulticallRead:
+    """A single contract read queued in a `Multicall` batch"""
+
+    contract: Contract
+    func_name: str
+    args: Tuple[Any, ...] = ()
+    kwargs: dict[str, Any] = field(default_factory=dict)
+
+    #: Bound contract function, set when the read is encoded
+    function: Optional[ContractFunction] = None
+
+    #: Status of encoding the read.  Reads that fail to encode are not sent.
+    status: ResponseStatus = field(default_factory=ResponseStatus)
+
+
+class Multicall:
+    """Group contract reads aimed at one chain into a single request
+
+    Usage:
+        mc = Multicall(node)
+        mc.add(oracle, "getStakeAmount")
+        mc.add(autopay, "getCurrentTip", _queryId=query_id)
+        results = await mc.execute()
+
+    Each result is the same `(output, ResponseStatus)` tuple returned by
+    `Contract.read`.  If the Multicall3 contract is not deployed on the
+    chain or the node rejects the call, the reads fall back to individual
+    `Contract.read` calls.  If the request itself fails (e.g. the node is
+    unreachable), every read reports the error.
+    If an endpoint pool is given, the batched call is routed through it.
+    """
+
+    def __init__(
+        self,
+        node: RPCEndpoint,
+        address: str = MULTICALL3_ADDRESS,
+        allow_failure: bool = True,
+        pool: Optional[EndpointPool] = None,
+    ):
+
+        self.node = node
+        self.address = address
+        self.allow_failure = allow_failure
+
+        #: Optional pool of endpoints used to route the batched call
+        self.pool = pool
+
+        self._reads: List[MulticallRead] = []
+
+    @property
+    def rpc(self) -> Union[RPCEndpoint, EndpointPool]:
+        """Target for native async JSON-RPC requests"""
+        return self.pool if self.pool is not None else self.node
+
+    def __len__(self) -> int:
+        return len(self._reads)
+
+    def add(self, contract: Contract, func_name: str, *args: Any, **kwargs: Any) -> int:
+        """Queue a contract read
+
+        returns:
+            Index of the read's result in the list returned by `execute()`
+        """
+
+        if contract.node.chain_id != self.node.chain_id:
+            raise ValueError(
+                f"Cannot batch read on chain {contract.node.chain_id} with multicall on chain {self.node.chain_id}"
+            )
+
+        read = MulticallRead(contract=contract, func_name=func_name, args=args, kwargs=kwargs)
+
+        if not contract.contract:
+            read.status = ResponseStatus(ok=False, error="no instance of contract")
+        else:
+            try:
+                contract_function = contract.get_function(func_name)
+                read.function = contract_function(*args, **kwargs)
+            except ValueError as e:
+                msg = f"function '{func_name}' not found in contract abi"
+                read.status = ResponseStatus(ok=False, e=e, error=msg)
+
+        self._reads.append(read)
+        return len(self._reads) - 1
+
+    def clear(self) -> None:
+        """Remove all queued reads"""
+        self._reads = []
+
+    def encode(self) -> HexBytes:
+        """Encode the queued reads as `aggregate3` calldata"""
+        calls: List[Tuple[str, bool, bytes]] = [
+            (r.contract.address, self.allow_failure, HexBytes(r.function._encode_transaction_data()))
+            for r in self._reads
+            if r.function is not None
+        ]
+        return HexBytes(AGGREGATE3_SELECTOR + encode_aggregate3(calls))
+
+    async def execute(self, block_identifier: Union[str, int] = "latest") -> List[Tuple[Any, ResponseStatus]]:
+        """Send all queued reads in one `eth_call` and decode the results"""
+
+        pending = [r for r in self._reads if r.function is not None]
+        if not pending:
+            return [(None, r.status) for r in self._reads]
+
+        try:
+            return_data = await self._call(self.encode(), block_identifier)
+        except ValueError as e:
+            # JSON-RPC error or revert: the node or the contract at this address does not support the call
+            logger.warning(f"Multicall3 call rejected ({e!r}), falling back to individual reads")
+            return await self._fallback()
+        except Exception as e:
+            logger.error(f"Multicall3 request failed: {e!r}")
+            status = ResponseStatus(ok=False, e=e, error="Multicall3 request failed")
+            return [(None, read.status if read.function is None else status) for read in self._reads]
+
+        if not return_data:
+            logger.warning(f"No Multicall3 contract at {self.address}, falling back to individual reads")
+            return await self._fallback()
+
+        try:
+            (call_results,) = decode_abi(["(bool,bytes)[]"], return_data)
+        except DecodingError as e:
+            logger.warning(f"Unexpected aggregate3 return data ({e!r}), falling back to individual reads")
+            return await self._fallback()
+
+        decoded = iter(call_results)
+        results: List[Tuple[Any, ResponseStatus]] = []
+        for read in self._reads:
+            if read.function is None:
+                results.append((None, read.status))
+                continue
+
+            success, data = next(decoded)
+            if not success:
+                e = ContractLogicError(decode_revert_reason(data))
+                results.append((None, ResponseStatus(ok=False, e=e, error="error reading from contract")))
+                continue
+
+            try:
+                results.append((decode_function_output(read.function, data), ResponseStatus(ok=True)))
+            except Exception as e:
+                results.append((None, ResponseStatus(ok=False, e=e, error="error reading from contract")))
+
+        return results
+
+    async def _call(self, calldata: HexBytes, block_identifier: Union[str, int]) -> bytes:
+        """Run the aggregate3 eth_call, natively async if a session is attached"""
+
+        if self.rpc.async_enabled:
+            if isinstance(block_identifier, int):
+                block_identifier = hex(block_identifier)
+            tx = {"to": self.address, "data": calldata.hex()}
+            return HexBytes(await self.rpc.request("eth_call", [tx, block_identifier]))
+
+        assert self.node.web3 is not None
+        return bytes(self.node.web3.eth.call({"to": self.address, "data": calldata}, block_identifier))
+
+    async def _fallback(self) -> List[Tuple[Any, ResponseStatus]]:
+        """Issue each queued read separately"""
+
+        async def _read(r: MulticallRead) -> Tuple[Any, ResponseStatus]:
+            if r.function is None:
+                return None, r.status
+            return await r.contract.read(r.func_name, *r.args, **r.kwargs)
+
+        return list(await asyncio.gather(*[_read(r) for r in self._reads]))
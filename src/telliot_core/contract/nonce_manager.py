@@ -0,0 +1,75 @@
+"""
+Local nonce allocation for accounts sending transactions
+"""
+import asyncio
+import logging
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+from weakref import WeakKeyDictionary
+
+from telliot_core.model.endpoints import RPCEndpoint
+
+logger = logging.getLogger(__name__)
+
+NonceKey = Tuple[Optional[int], str]
+
+
+class NonceManager:
+    """Hand out account nonces locally
+
+    The first nonce for each (chain_id, address) is synced from the
+    node's pending transaction count.  After that, nonces are assigned
+    locally so several transactions from one account can be in flight
+    at once without a `get_transaction_count` round trip per write.
+
+    Call `reset()` after a failed or dropped transaction so that the next
+    reservation re-syncs with the node.
+    """
+
+    def __init__(self) -> None:
+        self._next_nonce: Dict[NonceKey, int] = {}
+
+        # Locks are bound to an event loop, so each loop gets its own
+        self._locks: "WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[NonceKey, asyncio.Lock]]" = WeakKeyDictionary()
+
+    @staticmethod
+    def _key(chain_id: Optional[int], address: str) -> NonceKey:
+        return chain_id, address.lower()
+
+    def _lock(self, key: NonceKey) -> asyncio.Lock:
+        """Lock serializing reservations for an account on the running event loop"""
+        locks = self._locks.setdefault(asyncio.get_running_loop(), {})
+        lock = locks.get(key)
+        if lock is None:
+            lock = locks[key] = asyncio.Lock()
+        return lock
+
+    async def _fetch_nonce(self, node: RPCEndpoint, address: str) -> int:
+        """Get the pending transaction count from the node"""
+        if node.async_enabled:
+            return int(await node.request("eth_getTransactionCount", [address, "pending"]), 16)
+
+        assert node.web3 is not None
+        return int(node.web3.eth.get_transaction_count(address, "pending"))
+
+    async def reserve(self, node: RPCEndpoint, address: str) -> int:
+        """Reserve the next nonce for an account"""
+        key = self._key(node.chain_id, address)
+        async with self._lock(key):
+            if key not in self._next_nonce:
+                self._next_nonce[key] = await self._fetch_nonce(node, address)
+                logger.debug(f"Synced nonce for {address} on chain {node.chain_id}: {self._next_nonce[key]}")
+
+            nonce = self._next_nonce[key]
+            self._next_nonce[key] = nonce + 1
+
+        return nonce
+
+    def reset(self, chain_id: Optional[int], address: str) -> None:
+        """Forget the local nonce so the next reservation re-syncs with the node"""
+        self._next_nonce.pop(self._key(chain_id, address), None)
+
+
+#: Nonce manager shared by all contracts in the process
+nonce_manager = NonceManager()
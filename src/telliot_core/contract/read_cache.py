@@ -0,0 +1,137 @@
+"""
+Block-scoped cache for contract reads
+"""
+import logging
+from typing import Any
+from typing import Dict
+from typing import Hashable
+from typing import Iterable
+from typing import Optional
+from typing import Tuple
+
+from eth_utils import is_hex_address
+
+logger = logging.getLogger(__name__)
+
+#: Getters that return the same value for the life of a deployed contract
+IMMUTABLE_FUNCTIONS = frozenset({"getTokenAddress", "getGovernanceAddress"})
+
+CacheKey = Tuple[str, str, Hashable, Hashable]
+
+
+def _freeze(value: Any) -> Hashable:
+    """Convert call arguments into a hashable form"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, str):
+        # Addresses are case-insensitive (checksums), other hex strings are not
+        return value.lower() if is_hex_address(value) else value
+    hash(value)  # raise TypeError for anything else that cannot be a key
+    return value  # type: ignore
+
+
+class ReadCache:
+    """Cache contract reads until a new block arrives
+
+    Values read through `Contract.read` are cached per block and are
+    invalidated when `new_block()` is called with a higher block number.
+    Use `on_new_block` as the handler for a `newHeads` subscription to
+    keep the cache in sync with the chain:
+
+        cache = ReadCache()
+        await core.listener.subscribe_new_blocks(handler=cache.on_new_block)
+        oracle.cache = cache
+
+    Reads of immutable getters are cached for the life of the process.
+    Reads are only cached once the current block number is known, and
+    only if no new block arrived while they were in flight.  While the
+    block number is known, `Contract.read` sends reads for that block
+    rather than "latest".
+    """
+
+    def __init__(self, immutable_functions: Iterable[str] = IMMUTABLE_FUNCTIONS) -> None:
+
+        #: Function names cached for the life of the process
+        self.immutable_functions = frozenset(immutable_functions)
+
+        #: Latest block number seen
+        self.block_number: Optional[int] = None
+
+        self.hits = 0
+        self.misses = 0
+
+        self._block_entries: Dict[CacheKey, Any] = {}
+        self._immutable_entries: Dict[CacheKey, Any] = {}
+
+    def _key(self, address: str, func_name: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Optional[CacheKey]:
+        try:
+            return address.lower(), func_name, _freeze(args), _freeze(kwargs)
+        except TypeError:
+            return None
+
+    def _entries(self, func_name: str) -> Optional[Dict[CacheKey, Any]]:
+        """Return the entry table for a function, or None if it cannot be cached yet"""
+        if func_name in self.immutable_functions:
+            return self._immutable_entries
+        if self.block_number is None:
+            return None
+        return self._block_entries
+
+    def get(self, address: str, func_name: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Tuple[bool, Any]:
+        """Look up a cached read
+
+        returns:
+            (hit, value) tuple
+        """
+        entries = self._entries(func_name)
+        key = self._key(address, func_name, args, kwargs)
+
+        if entries is not None and key is not None and key in entries:
+            self.hits += 1
+            return True, entries[key]
+
+        self.misses += 1
+        return False, None
+
+    def set(
+        self,
+        address: str,
+        func_name: str,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+        value: Any,
+        block_number: Optional[int],
+    ) -> None:
+        """Store the result of a successful read
+
+        `block_number` is the cache's `block_number` from before the read
+        was sent.  If a new block arrived while the read was in flight, the
+        value may belong to the previous block and is not stored.
+        """
+        entries = self._entries(func_name)
+        key = self._key(address, func_name, args, kwargs)
+
+        if entries is self._block_entries and block_number != self.block_number:
+            logger.debug(f"Discarding {func_name} read sent at block {block_number}")
+            return
+
+        if entries is not None and key is not None:
+            entries[key] = value
+
+    def new_block(self, block_number: int) -> None:
+        """Invalidate block-scoped entries if the block number has advanced"""
+        if self.block_number is None or block_number > self.block_number:
+            self.block_number = block_number
+            self._block_entries = {}
+
+    def clear(self) -> None:
+        """Remove all cached reads, including immutable ones"""
+        self._block_entries = {}
+        self._immutable_entries = {}
+
+    async def on_new_block(self, block: Any) -> None:
+        """Handler for `Listener.subscribe_new_blocks`"""
+        self.new_block(int(block["number"]))
+        logger.debug(f"Read cache invalidated at block {self.block_number}")
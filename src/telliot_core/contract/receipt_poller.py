@@ -0,0 +1,152 @@
+"""
+Background polling of transaction receipts
+"""
+import asyncio
+import logging
+import time
+from typing import Any
+from typing import cast
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+from hexbytes import HexBytes
+from web3._utils.method_formatters import receipt_formatter
+from web3.datastructures import AttributeDict
+from web3.exceptions import TimeExhausted
+
+from telliot_core.model.endpoints import RPCEndpoint
+
+logger = logging.getLogger(__name__)
+
+ReceiptFuture = asyncio.Future[AttributeDict[str, Any]]
+
+
+def format_receipt(receipt: Dict[str, Any]) -> AttributeDict[str, Any]:
+    """Format a raw JSON-RPC receipt the way web3 returns it"""
+    # AttributeDict.recursive is annotated as returning an empty ReadableAttributeDict
+    return cast(AttributeDict[str, Any], AttributeDict.recursive(receipt_formatter(receipt)))
+
+
+class ReceiptPoller:
+    """Wait for receipts of many pending transactions with one task
+
+    Each call to `track()` returns a future that resolves to the
+    transaction receipt.  A single background task polls the node for
+    all pending transactions at once (as one JSON-RPC batch) and exits
+    when nothing is pending.
+    """
+
+    def __init__(self, node: RPCEndpoint, interval: float = 1.0, timeout: float = 360.0):
+
+        self.node = node
+        self.interval = interval
+        self.timeout = timeout
+
+        # Future, deadline and timeout of each tracked transaction
+        self._pending: Dict[HexBytes, Tuple[ReceiptFuture, float, float]] = {}
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def num_pending(self) -> int:
+        return len(self._pending)
+
+    def track(self, tx_hash: HexBytes, timeout: Optional[float] = None) -> ReceiptFuture:
+        """Start waiting for a transaction receipt
+
+        returns:
+            Future resolving to the receipt, or raising `TimeExhausted`
+        """
+        tx_hash = HexBytes(tx_hash)
+
+        if tx_hash in self._pending:
+            return self._pending[tx_hash][0]
+
+        future: ReceiptFuture = asyncio.get_running_loop().create_future()
+        if timeout is None:
+            timeout = self.timeout
+        self._pending[tx_hash] = (future, time.monotonic() + timeout, timeout)
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._poll(), name=f"receipt_poller_{self.node.chain_id}")
+
+        return future
+
+    async def _poll(self) -> None:
+        """Poll until every tracked transaction is resolved"""
+        try:
+            await self._poll_pending()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.exception("Receipt poller failed")
+            for future, _, _ in self._pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            self._pending = {}
+
+    async def _poll_pending(self) -> None:
+        while self._pending:
+            await asyncio.sleep(self.interval)
+
+            # Drop transactions whose caller stopped waiting
+            for tx_hash in [h for h, (f, _, _) in self._pending.items() if f.done()]:
+                del self._pending[tx_hash]
+
+            tx_hashes = list(self._pending)
+            if not tx_hashes:
+                break
+
+            results = await self.node.batch_request(
+                [("eth_getTransactionReceipt", [tx_hash.hex()]) for tx_hash in tx_hashes]
+            )
+
+            now = time.monotonic()
+            for tx_hash, (receipt, status) in zip(tx_hashes, results):
+                future, deadline, timeout = self._pending[tx_hash]
+
+                if status.ok and receipt is not None:
+                    del self._pending[tx_hash]
+                    if not future.done():
+                        future.set_result(format_receipt(receipt))
+
+                elif now > deadline:
+                    del self._pending[tx_hash]
+                    if not future.done():
+                        msg = f"Transaction {tx_hash.hex()} is not in the chain after {timeout} seconds"
+                        future.set_exception(TimeExhausted(msg))
+
+                elif not status.ok:
+                    logger.debug(f"Error polling receipt for {tx_hash.hex()}: {status.error}")
+
+    async def shutdown(self) -> None:
+        """Stop polling and cancel all pending futures"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        for future, _, _ in self._pending.values():
+            future.cancel()
+        self._pending = {}
+
+
+_receipt_pollers: Dict[str, ReceiptPoller] = {}
+
+
+def get_receipt_poller(node: RPCEndpoint) -> ReceiptPoller:
+    """Get or create the receipt poller shared by all contracts on a node"""
+    if node.url not in _receipt_pollers:
+        _receipt_pollers[node.url] = ReceiptPoller(node)
+
+    return _receipt_pollers[node.url]
+
+
+async def shutdown_receipt_pollers() -> None:
+    """Shut down every shared receipt poller"""
+    for poller in _receipt_pollers.values():
+        await poller.shutdown()
+    _receipt_pollers.clear()
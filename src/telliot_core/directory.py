@@ -1,21 +1,174 @@
+import asyncio
+import hashlib
 import json
+import logging
+import os
+import time
 from dataclasses import dataclass
 from dataclasses import field
 from pathlib import Path
 from typing import Any
+from typing import ClassVar
+from typing import Literal
 from typing import Optional
 
+import aiohttp
 import requests
 from clamfig import deserialize
 from clamfig import Serializable
 
 from telliot_core.apps.config import ConfigOptions
+from telliot_core.contract.abi_registry import abi_registry
 from telliot_core.utils.home import TELLIOT_CORE_ROOT
+from telliot_core.utils.home import telliot_homedir
+
+logger = logging.getLogger(__name__)
 
 
 # Read contract ABIs from json files
 _abi_folder = Path(__file__).resolve().parent / "data" / "abi"
 
+#: How `ContractDirectory.find` matches contract names
+NameMatch = Literal["exact", "prefix", "substring"]
+
+
+#: Explorer API used to fetch the ABI of contracts without an `abi_file`
+EXPLORER_APIS: dict[int, str] = {
+    1: "https://api.etherscan.io",
+    3: "https://api-ropsten.etherscan.io",
+    4: "https://api-rinkeby.etherscan.io",
+    5: "https://api-goerli.etherscan.io",
+    42: "https://api-kovan.etherscan.io",
+    137: "https://api.polygonscan.com",
+    420: "https://goerli-optimism.etherscan.io/",
+    80001: "https://api-testnet.polygonscan.com",
+    42161: "https://api.arbiscan.io/",
+    421613: "https://goerli.arbiscan.io/",
+    10200: "https://blockscout.chiadochain.net/",
+    100: "https://api.gnosisscan.io",
+    10: "https://optimistic.etherscan.io/",
+    3141: "https://hyperspace.filfox.info/en",
+    314159: "https://calibration.filfox.info/en",
+    314: "https://filfox.info/en",
+    11155111: "https://api-sepolia.etherscan.io",
+    3441005: "https://manta-testnet.calderaexplorer.xyz",
+    84531: "https://api-goerli.basescan.org/",
+    5001: "https://explorer.testnet.mantle.xyz/",
+    5000: "https://explorer.mantle.xyz/",
+    2442: "https://cardona-zkevm.polygonscan.com/",
+    1101: "https://zkevm.polygonscan.com/",
+    59140: "https://goerli.lineascan.build",
+    59144: "https://lineascan.build",
+    2522: "https://api-holesky.fraxscan.com",
+    252: "https://api.fraxscan.com",
+    1998: "https://testnet.kyotoscan.io",
+    1444673419: "https://juicy-low-small-testnet.explorer.testnet.skalenodes.com",
+    2046399126: "https://elated-tan-skat.explorer.mainnet.skalenodes.com",
+    59141: "https://api-sepolia.lineascan.build",
+    324: "https://block-explorer-api.mainnet.zksync.io",
+    300: "https://block-explorer-api.sepolia.zksync.io",
+    80002: "https://api-amoy.polygonscan.com/",
+    11155420: "https://api-sepolia-optimism.etherscan.io/",
+    421614: "https://api-sepolia.arbiscan.io/",
+    5003: "https://explorer.sepolia.mantle.xyz/",
+    84532: "https://api-sepolia.basescan.org/",
+    111: "https://testnet-explorer.gobob.xyz:443",
+    60808: "https://explorer.gobob.xyz:443",
+    919: "https://sepolia.explorer.mode.network:443",
+    1918988905: "https://testnet.rpc.rarichain.org/http",
+    41: "https://testnet.telos.net/evm",
+    2340: "https://testnet-rpc.atleta.network:9944",
+    842: "https://rpc.testnet.taraxa.io",
+    808813: "https://bob-sepolia.explorer.gobob.xyz/",
+    534352: "https://rpc.scroll.io",
+    8453: "https://base.llamarpc.com",
+    1135: "https://blockscout.lisk.com/",
+}
+
+#: Seconds before a cached explorer ABI is fetched again
+ABI_CACHE_TTL = 7 * 24 * 3600
+
+_explorer_headers = {"User-Agent": "Mozilla/5.0 (Windows NT 6.1; WOW64; rv:77.0) Gecko/20190101 Firefox/77.0"}
+
+
+def explorer_abi_url(chain_id: int, address: str, api_key: str = "") -> str:
+    """URL returning the ABI of a verified contract from the chain explorer"""
+    if chain_id not in EXPLORER_APIS:
+        raise ValueError(f"Could not retrieve ABI using chain_id {chain_id}")
+
+    url = EXPLORER_APIS[chain_id] + f"/api?module=contract&action=getabi&address={address}&format=raw"
+    if api_key:
+        url = url + f"&apikey={api_key}"
+    return url
+
+
+def is_valid_abi(abi: Any) -> bool:
+    """True if an explorer response looks like a contract ABI"""
+    return isinstance(abi, list) and all(isinstance(item, dict) and "type" in item for item in abi)
+
+
+def abi_cache_dir() -> Path:
+    """Folder of ABIs fetched from explorers, in the telliot home directory"""
+    return telliot_homedir() / "abi_cache"
+
+
+def read_cached_abi(chain_id: int, address: str, ttl: Optional[float] = ABI_CACHE_TTL) -> Optional[list[Any]]:
+    """ABI fetched earlier for a contract, or None if missing, invalid or older than `ttl` seconds
+
+    ABIs are stored once per content hash, with a small reference file per
+    (chain_id, address) recording the hash and when it was fetched.
+    """
+    cache_dir = abi_cache_dir()
+    try:
+        with open(cache_dir / f"{chain_id}-{address.lower()}.ref") as f:
+            ref = json.load(f)
+        if ttl is not None and time.time() - ref["fetched_at"] > ttl:
+            return None
+        with open(cache_dir / f"{ref['digest']}.json", "rb") as f:
+            content = f.read()
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    if hashlib.sha256(content).hexdigest() != ref["digest"]:
+        logger.warning(f"Corrupt cached ABI for {address} on chain {chain_id}")
+        return None
+
+    abi = json.loads(content)
+    return abi if is_valid_abi(abi) else None
+
+
+def write_cached_abi(chain_id: int, address: str, abi: list[Any]) -> None:
+    """Save an ABI fetched from an explorer"""
+    cache_dir = abi_cache_dir()
+    content = json.dumps(abi, separators=(",", ":")).encode()
+    digest = hashlib.sha256(content).hexdigest()
+    ref = {"digest": digest, "fetched_at": time.time()}
+
+    try:
+        cache_dir.mkdir(exist_ok=True)
+        abi_path = cache_dir / f"{digest}.json"
+        if not abi_path.exists():
+            tmp_path = abi_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(content)
+            os.replace(tmp_path, abi_path)
+        (cache_dir / f"{chain_id}-{address.lower()}.ref").write_text(json.dumps(ref))
+    except OSError as e:
+        logger.warning(f"Unable to cache ABI for {address} on chain {chain_id}: {e!r}")
+
+
+def _fetched_abi(chain_id: int, address: str, abi: Any) -> Any:
+    """Cache a valid explorer response, or fall back to an expired cached ABI"""
+    if is_valid_abi(abi):
+        write_cached_abi(chain_id, address, abi)
+        return abi_registry.register(abi).abi
+
+    stale = read_cached_abi(chain_id, address, ttl=None)
+    if stale is not None:
+        logger.warning(f"Explorer returned no ABI for {address} on chain {chain_id}, using cached ABI")
+        return abi_registry.register(stale).abi
+
+    return abi
+
 
 @dataclass
 class ContractInfo(Serializable):
@@ -26,134 +179,45 @@ class ContractInfo(Serializable):
 
     _abi: Optional[list[Any]] = field(default=None, init=False, repr=False)
 
+    #: Bumped when any contract name or address changes, so directory indexes are rebuilt
+    _version: ClassVar[int] = 0
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in ("name", "address"):
+            ContractInfo._version += 1
+        super().__setattr__(name, value)
+
+    def set_address(self, chain_id: int, address: str) -> None:
+        """Set the contract address on a chain (use this rather than editing `address` in place)"""
+        self.address[chain_id] = address
+        ContractInfo._version += 1
+
     def get_abi(self, chain_id: int = 0, api_key: str = "") -> list[Any]:
         """Returns the contract ABI.
 
         The ABI is lazily loaded from a file the first time it is requested
         and stored for later access.  If an abi file is not defined, an attempt
-        is made to retrieve the ABI from the chain explorer.
+        is made to retrieve the ABI from the chain explorer.  Explorer ABIs are
+        cached in the telliot home folder for `ABI_CACHE_TTL` seconds.
         """
         if not chain_id:
             chain_id = list(self.address.keys())[0]
 
         if not self._abi:
             if self.abi_file:
-                with open(_abi_folder / self.abi_file, "r") as f:
-                    self._abi = json.load(f)
+                self._abi = abi_registry.load_file(_abi_folder / self.abi_file).abi
             else:
-                # try to get from etherscan or other explorer using example:
+                # Try the local cache, then the chain explorer
                 address = self.address[chain_id]
-                if chain_id == 1:
-                    url = "https://api.etherscan.io"
-                elif chain_id == 3:
-                    url = "https://api-ropsten.etherscan.io"
-                elif chain_id == 4:
-                    url = "https://api-rinkeby.etherscan.io"
-                elif chain_id == 5:
-                    url = "https://api-goerli.etherscan.io"
-                elif chain_id == 42:
-                    url = "https://api-kovan.etherscan.io"
-                elif chain_id == 137:
-                    url = "https://api.polygonscan.com"
-                elif chain_id == 420:
-                    url = "https://goerli-optimism.etherscan.io/"
-                elif chain_id == 80001:
-                    url = "https://api-testnet.polygonscan.com"
-                elif chain_id == 42161:
-                    url = "https://api.arbiscan.io/"
-                elif chain_id == 421613:
-                    url = "https://goerli.arbiscan.io/"
-                elif chain_id == 10200:
-                    url = "https://blockscout.chiadochain.net/"
-                elif chain_id == 100:
-                    url = "https://api.gnosisscan.io"
-                elif chain_id == 10:
-                    url = "https://optimistic.etherscan.io/"
-                elif chain_id == 3141:
-                    url = "https://hyperspace.filfox.info/en"
-                elif chain_id == 314159:
-                    url = "https://calibration.filfox.info/en"
-                elif chain_id == 314:
-                    url = "https://filfox.info/en"
-                elif chain_id == 11155111:
-                    url = "https://api-sepolia.etherscan.io"
-                elif chain_id == 3441005:
-                    url = "https://manta-testnet.calderaexplorer.xyz"
-                elif chain_id == 84531:
-                    url = "https://api-goerli.basescan.org/"
-                elif chain_id == 5001:
-                    url = "https://explorer.testnet.mantle.xyz/"
-                elif chain_id == 5000:
-                    url = "https://explorer.mantle.xyz/"
-                elif chain_id == 2442:
-                    url = "https://cardona-zkevm.polygonscan.com/"
-                elif chain_id == 1101:
-                    url = "https://zkevm.polygonscan.com/"
-                elif chain_id == 59140:
-                    url = "https://goerli.lineascan.build"
-                elif chain_id == 59144:
-                    url = "https://lineascan.build"
-                elif chain_id == 2522:
-                    url = "https://api-holesky.fraxscan.com"
-                elif chain_id == 252:
-                    url = "https://api.fraxscan.com"
-                elif chain_id == 1998:
-                    url = "https://testnet.kyotoscan.io"
-                elif chain_id == 1444673419:
-                    url = "https://juicy-low-small-testnet.explorer.testnet.skalenodes.com"
-                elif chain_id == 2046399126:
-                    url = "https://elated-tan-skat.explorer.mainnet.skalenodes.com"
-                elif chain_id == 59141:
-                    url = "https://api-sepolia.lineascan.build"
-                elif chain_id == 324:
-                    url = "https://block-explorer-api.mainnet.zksync.io"
-                elif chain_id == 300:
-                    url = "https://block-explorer-api.sepolia.zksync.io"
-                elif chain_id == 80002:
-                    url = "https://api-amoy.polygonscan.com/"
-                elif chain_id == 11155420:
-                    url = "https://api-sepolia-optimism.etherscan.io/"
-                elif chain_id == 421614:
-                    url = "https://api-sepolia.arbiscan.io/"
-                elif chain_id == 5003:
-                    url = "https://explorer.sepolia.mantle.xyz/"
-                elif chain_id == 84532:
-                    url = "https://api-sepolia.basescan.org/"
-                elif chain_id == 111:
-                    url = "https://testnet-explorer.gobob.xyz:443"
-                elif chain_id == 60808:
-                    url = "https://explorer.gobob.xyz:443"
-                elif chain_id == 919:
-                    url = "https://sepolia.explorer.mode.network:443"
-                elif chain_id == 1918988905:
-                    url = "https://testnet.rpc.rarichain.org/http"
-                elif chain_id == 41:
-                    url = "https://testnet.telos.net/evm"
-                elif chain_id == 2340:
-                    url = "https://testnet-rpc.atleta.network:9944"
-                elif chain_id == 842:
-                    url = "https://rpc.testnet.taraxa.io"
-                elif chain_id == 808813:
-                    url = "https://bob-sepolia.explorer.gobob.xyz/"
-                elif chain_id == 534352:
-                    url = "https://rpc.scroll.io"
-                elif chain_id == 8453:
-                    url = "https://base.llamarpc.com"
-                elif chain_id == 1135:
-                    url = "https://blockscout.lisk.com/"
+                abi = read_cached_abi(chain_id, address)
+                if abi is not None:
+                    self._abi = abi_registry.register(abi).abi
                 else:
-                    raise ValueError(f"Could not retrieve ABI using chain_id {chain_id}")
-
-                url = url + f"/api?module=contract&action=getabi&address={address}&format=raw"
-
-                if api_key:
-                    url = url + f"&apikey={api_key}"
-
-                headers = {"User-Agent": "Mozilla/5.0 (Windows NT 6.1; WOW64; rv:77.0) Gecko/20190101 Firefox/77.0"}
-                response = requests.get(url, headers=headers)
-                self._abi = response.json()
+                    url = explorer_abi_url(chain_id, address, api_key)
+                    response = requests.get(url, headers=_explorer_headers)
+                    self._abi = _fetched_abi(chain_id, address, response.json())
 
-        return self._abi  # type: ignore
+        return self._abi
 
     def restore_state(self, state: dict[Any, Any]) -> None:
         """Workaround JSON dict key type issue.  This should be handled by clamfig in future."""
@@ -170,13 +234,22 @@ class ContractDirectory(ConfigOptions):
 
     entries: dict[str, ContractInfo] = field(default_factory=dict)
 
-    def add_entry(self, entry: ContractInfo) -> None:
-        """Add ContractInfo object to directory."""
+    # Lookup indexes, rebuilt when entries or their addresses change
+    _by_address: dict[str, list[ContractInfo]] = field(default_factory=dict, init=False, repr=False)
+    _by_chain_id: dict[int, list[ContractInfo]] = field(default_factory=dict, init=False, repr=False)
+    _by_chain_name: dict[tuple[int, str], ContractInfo] = field(default_factory=dict, init=False, repr=False)
 
-        if entry.name in self.entries:
+    # `ContractInfo._version` the indexes were built at
+    _indexed: Optional[int] = field(default=None, init=False, repr=False)
+
+    def add_entry(self, entry: ContractInfo, replace: bool = False) -> None:
+        """Add ContractInfo object to directory (or replace an entry with the same name)."""
+
+        if entry.name in self.entries and not replace:
             raise ValueError(f"Contrct {entry.name} already in directory")
 
         self.entries[entry.name] = entry
+        self._indexed = None
 
     @classmethod
     def from_file(cls, filepath: Path) -> "ContractDirectory":
@@ -194,6 +267,86 @@ class ContractDirectory(ConfigOptions):
 
         return obj
 
+    async def prefetch_abis(
+        self,
+        chain_id: Optional[int] = None,
+        api_key: str = "",
+        max_concurrency: int = 4,
+        session: Optional[aiohttp.ClientSession] = None,
+    ) -> int:
+        """Fetch missing or expired explorer ABIs concurrently into the local cache
+
+        Args:
+            chain_id: Only prefetch contracts on this chain (default: every chain)
+            api_key: Explorer API key
+            max_concurrency: Maximum number of explorer requests in flight
+            session: aiohttp session to use (default: a temporary session)
+
+        returns:
+            Number of ABIs fetched
+        """
+        targets = [
+            (info, cid, address)
+            for info in self.entries.values()
+            if not info.abi_file
+            for cid, address in info.address.items()
+            if (chain_id is None or cid == chain_id) and cid in EXPLORER_APIS and read_cached_abi(cid, address) is None
+        ]
+        if not targets:
+            return 0
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(info: ContractInfo, cid: int, address: str, session: aiohttp.ClientSession) -> bool:
+            url = explorer_abi_url(cid, address, api_key)
+            try:
+                async with semaphore, session.get(url, headers=_explorer_headers) as response:
+                    abi = json.loads(await response.read())
+            except Exception as e:
+                logger.warning(f"Unable to fetch ABI of {info.name} on chain {cid}: {e!r}")
+                return False
+
+            abi = _fetched_abi(cid, address, abi)
+            if not is_valid_abi(abi):
+                return False
+            # get_abi() defaults to the first chain of the contract
+            if not info._abi and cid == next(iter(info.address)):
+                info._abi = abi
+            return True
+
+        async def fetch_all(session: aiohttp.ClientSession) -> list[bool]:
+            return await asyncio.gather(*[fetch(info, cid, address, session) for info, cid, address in targets])
+
+        if session is None:
+            async with aiohttp.ClientSession() as new_session:
+                results = await fetch_all(new_session)
+        else:
+            results = await fetch_all(session)
+
+        return sum(results)
+
+    def _update_index(self) -> None:
+        """Index entries by lowercased address, by chain ID and by (chain ID, name)
+
+        Indexes are rebuilt after `add_entry` or a change to any contract
+        name or address (see `ContractInfo.set_address`).
+        """
+        if self._indexed == ContractInfo._version:
+            return
+
+        self._by_address = {}
+        self._by_chain_id = {}
+        self._by_chain_name = {}
+        for info in self.entries.values():
+            for chain_id, address in info.address.items():
+                self._by_chain_id.setdefault(chain_id, []).append(info)
+                self._by_chain_name[(chain_id, info.name)] = info
+                by_address = self._by_address.setdefault(address.lower(), [])
+                if not by_address or by_address[-1] is not info:
+                    by_address.append(info)
+
+        self._indexed = ContractInfo._version
+
     def find(
         self,
         *,
@@ -201,11 +354,34 @@ class ContractDirectory(ConfigOptions):
         name: Optional[str] = None,
         address: Optional[str] = None,
         chain_id: Optional[int] = None,
+        match: NameMatch = "exact",
     ) -> list[ContractInfo]:
-        """Search the Contract Directory."""
+        """Search the Contract Directory.
+
+        Exact names, (chain ID, name) pairs, addresses (case-insensitive) and
+        chain IDs are looked up in indexes.  Use `match="prefix"` or
+        `match="substring"` to search for partial names, which scans the
+        candidate entries.
+        """
+        candidates: list[ContractInfo]
+        if name is not None and match == "exact":
+            if chain_id is not None:
+                self._update_index()
+                found = self._by_chain_name.get((chain_id, name))
+            else:
+                found = self.entries.get(name)
+            candidates = [found] if found is not None else []
+        elif address is not None:
+            self._update_index()
+            candidates = self._by_address.get(address.lower(), [])
+        elif chain_id is not None:
+            self._update_index()
+            candidates = self._by_chain_id.get(chain_id, [])
+        else:
+            candidates = list(self.entries.values())
 
         result = []
-        for info in self.entries.values():
+        for info in candidates:
             if org is not None:
                 if org != info.org:
                     continue
@@ -213,10 +389,14 @@ class ContractDirectory(ConfigOptions):
                 if chain_id not in info.address.keys():
                     continue
             if name is not None:
-                if name not in info.name:
+                if match == "exact" and name != info.name:
+                    continue
+                if match == "prefix" and not info.name.startswith(name):
+                    continue
+                if match == "substring" and name not in info.name:
                     continue
             if address is not None:
-                if address not in info.address.values():
+                if address.lower() not in (a.lower() for a in info.address.values()):
                     continue
 
             result.append(info)
@@ -224,4 +404,19 @@ class ContractDirectory(ConfigOptions):
         return result
 
 
-contract_directory = ContractDirectory.from_file(TELLIOT_CORE_ROOT / "data/contract_directory.json")
+_contract_directory: Optional[ContractDirectory] = None
+
+
+def get_contract_directory() -> ContractDirectory:
+    """Directory of known contracts, loaded on first use"""
+    global _contract_directory
+    if _contract_directory is None:
+        _contract_directory = ContractDirectory.from_file(TELLIOT_CORE_ROOT / "data/contract_directory.json")
+    return _contract_directory
+
+
+def __getattr__(name: str) -> ContractDirectory:
+    # `contract_directory` is kept as a lazily loaded module attribute
+    if name == "contract_directory":
+        return get_contract_directory()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
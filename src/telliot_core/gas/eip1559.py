@@ -0,0 +1,173 @@
+"""
+EIP-1559 fee estimates from a rolling window of `eth_feeHistory`
+"""
+import asyncio
+import logging
+import statistics
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+from typing import Deque
+from typing import Dict
+from typing import Literal
+from typing import Optional
+from typing import Tuple
+
+from telliot_core.model.endpoints import node_request
+from telliot_core.model.endpoints import RPCEndpoint
+
+logger = logging.getLogger(__name__)
+
+FeeSpeed = Literal["slow", "standard", "fast"]
+
+#: Reward percentile used for the priority fee at each speed
+SPEED_PERCENTILES: Dict[FeeSpeed, int] = {"slow": 10, "standard": 50, "fast": 90}
+
+#: Number of consecutive full blocks the max fee survives at each speed
+#: (the base fee grows by at most 12.5% per block)
+SPEED_HEADROOM_BLOCKS: Dict[FeeSpeed, int] = {"slow": 1, "standard": 3, "fast": 6}
+
+BASE_FEE_MAX_CHANGE_DENOMINATOR = 8
+ELASTICITY_MULTIPLIER = 2
+
+
+def _int(value: Any) -> int:
+    return int(value, 16) if isinstance(value, str) else int(value)
+
+
+def predict_next_base_fee(base_fee: int, gas_used: int, gas_limit: int) -> int:
+    """Base fee of the block after one with the given base fee and gas usage (wei)"""
+    gas_target = gas_limit // ELASTICITY_MULTIPLIER
+    if gas_target == 0 or gas_used == gas_target:
+        return base_fee
+
+    if gas_used > gas_target:
+        delta = base_fee * (gas_used - gas_target) // gas_target // BASE_FEE_MAX_CHANGE_DENOMINATOR
+        return base_fee + max(delta, 1)
+
+    delta = base_fee * (gas_target - gas_used) // gas_target // BASE_FEE_MAX_CHANGE_DENOMINATOR
+    return base_fee - delta
+
+
+@dataclass
+class BlockFees:
+    """Fee data of one block from `eth_feeHistory`"""
+
+    number: int
+
+    #: Base fee (wei)
+    base_fee: int
+
+    #: Priority fee paid at each of the estimator's percentiles (wei)
+    rewards: Tuple[int, ...]
+
+
+@dataclass
+class FeePair:
+    """EIP-1559 fee arguments for `Contract.write` (gwei)"""
+
+    max_fee_per_gas: float
+    max_priority_fee_per_gas: float
+
+
+class FeeHistoryEstimator:
+    """Estimate EIP-1559 fees from the priority fees paid in recent blocks
+
+    The last `window` blocks are loaded with one `eth_feeHistory` request by
+    `sync()`.  After that, `on_new_block` (a handler for
+    `Listener.subscribe_new_blocks`) fetches only the blocks added since and
+    predicts the next base fee from each new head.  Estimates for every
+    speed are computed once per update, so `fees()` does no I/O:
+
+        estimator = FeeHistoryEstimator(core.endpoint)
+        await estimator.sync()
+        await core.listener.subscribe_new_blocks(handler=estimator.on_new_block)
+
+        fees = estimator.fees("fast")
+        await oracle.write("submitValue", ..., **asdict(fees))
+    """
+
+    def __init__(self, node: RPCEndpoint, window: int = 20) -> None:
+
+        self.node = node
+        self.window = window
+
+        #: Percentiles requested from eth_feeHistory, one per speed
+        self.percentiles = tuple(sorted(set(SPEED_PERCENTILES.values())))
+
+        #: Predicted base fee of the next block (wei)
+        self.next_base_fee: Optional[int] = None
+
+        self._blocks: Deque[BlockFees] = deque(maxlen=window)
+        self._fees: Dict[FeeSpeed, FeePair] = {}
+        self._update_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def latest_block(self) -> Optional[int]:
+        return self._blocks[-1].number if self._blocks else None
+
+    def fees(self, speed: FeeSpeed = "standard") -> Optional[FeePair]:
+        """Fee pair for the given speed, or None before the first sync"""
+        return self._fees.get(speed)
+
+    async def sync(self, block_count: Optional[int] = None, newest_block: Any = "latest") -> None:
+        """Load fee data for up to `block_count` blocks ending at `newest_block`"""
+        block_count = self.window if block_count is None else block_count
+
+        newest = newest_block if isinstance(newest_block, str) else hex(newest_block)
+        history = await node_request(self.node, "eth_feeHistory", [hex(block_count), newest, list(self.percentiles)])
+
+        oldest = _int(history["oldestBlock"])
+        base_fees = [_int(f) for f in history["baseFeePerGas"]]
+        rewards = history.get("reward") or [[0] * len(self.percentiles)] * (len(base_fees) - 1)
+
+        for i, block_rewards in enumerate(rewards):
+            number = oldest + i
+            if self.latest_block is not None and number <= self.latest_block:
+                continue
+            self._blocks.append(BlockFees(number, base_fees[i], tuple(_int(r) for r in block_rewards)))
+
+        # eth_feeHistory also returns the base fee of the block after the newest
+        if base_fees:
+            self.next_base_fee = base_fees[-1]
+
+        self._update_fees()
+
+    async def on_new_block(self, block: Any) -> None:
+        """Handler for `Listener.subscribe_new_blocks`"""
+        number = _int(block["number"])
+
+        if block.get("baseFeePerGas") is not None:
+            self.next_base_fee = predict_next_base_fee(
+                _int(block["baseFeePerGas"]), _int(block["gasUsed"]), _int(block["gasLimit"])
+            )
+            self._update_fees()
+
+        if self._update_lock is None:
+            self._update_lock = asyncio.Lock()
+
+        async with self._update_lock:
+            latest = self.latest_block
+            if latest is not None and number <= latest:
+                return
+
+            missing = self.window if latest is None else min(number - latest, self.window)
+            try:
+                await self.sync(block_count=missing, newest_block=number)
+            except Exception as e:
+                logger.warning(f"Unable to update fee history at block {number}: {e!r}")
+
+    def _update_fees(self) -> None:
+        """Recompute the fee pair for every speed"""
+        if self.next_base_fee is None or not self._blocks:
+            return
+
+        fees: Dict[FeeSpeed, FeePair] = {}
+        for speed, percentile in SPEED_PERCENTILES.items():
+            i = self.percentiles.index(percentile)
+            priority_fee = statistics.median(b.rewards[i] for b in self._blocks)
+            headroom = (1 + 1 / BASE_FEE_MAX_CHANGE_DENOMINATOR) ** SPEED_HEADROOM_BLOCKS[speed]
+            max_fee = self.next_base_fee * headroom + priority_fee
+            fees[speed] = FeePair(max_fee_per_gas=max_fee / 1e9, max_priority_fee_per_gas=priority_fee / 1e9)
+
+        self._fees = fees
@@ -0,0 +1,75 @@
+"""
+Gas limits learned from recent transaction receipts
+"""
+import logging
+from collections import deque
+from typing import Any
+from typing import Deque
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+from hexbytes import HexBytes
+
+logger = logging.getLogger(__name__)
+
+#: (chain_id, contract address, function name, query id)
+GasLimitKey = Tuple[Optional[int], str, str, Optional[str]]
+
+
+def gas_limit_key(chain_id: Optional[int], address: str, func_name: str, kwargs: Dict[str, Any]) -> GasLimitKey:
+    """Key a transaction by contract, function and query id (if any)"""
+    query_id = kwargs.get("_queryId")
+    if isinstance(query_id, (bytes, bytearray)):
+        query_id = HexBytes(query_id).hex()
+    elif query_id is not None:
+        query_id = str(query_id).lower()
+
+    return chain_id, address.lower(), func_name, query_id
+
+
+class GasLimitEstimator:
+    """Predict gas limits from the gas used by recent transactions
+
+    For each (contract, function, query id), the gas used by the last
+    `window` transactions is kept.  The predicted gas limit is the largest
+    of them plus a `margin` (0.25 = 25%).  A function is only estimated with
+    `eth_estimateGas` when nothing has been learned yet or after one of its
+    transactions reverted.
+    """
+
+    def __init__(self, margin: float = 0.25, window: int = 8) -> None:
+
+        self.margin = margin
+        self.window = window
+
+        self.hits = 0
+        self.misses = 0
+
+        self._gas_used: Dict[GasLimitKey, Deque[int]] = {}
+
+    def get(self, key: GasLimitKey) -> Optional[int]:
+        """Predicted gas limit, or None if it must be estimated"""
+        gas_used = self._gas_used.get(key)
+        if not gas_used:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return round(max(gas_used) * (1 + self.margin))
+
+    def record(self, key: GasLimitKey, gas_used: int) -> None:
+        """Learn from a gas estimate or a successful transaction's `gasUsed`"""
+        self._gas_used.setdefault(key, deque(maxlen=self.window)).append(int(gas_used))
+
+    def invalidate(self, key: GasLimitKey) -> None:
+        """Forget what was learned, so the next transaction is estimated again"""
+        if self._gas_used.pop(key, None) is not None:
+            logger.debug(f"Gas limit for {key[2]} invalidated")
+
+    def clear(self) -> None:
+        self._gas_used = {}
+
+
+#: Gas limit estimator shared by all contracts in the process
+gas_limit_estimator = GasLimitEstimator()
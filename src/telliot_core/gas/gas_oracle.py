@@ -0,0 +1,244 @@
+"""
+Background-refreshed gas prices combined from several sources
+"""
+import asyncio
+import json
+import logging
+import math
+import statistics
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import aiohttp
+
+from telliot_core.gas.legacy_gas import gas_station
+from telliot_core.gas.legacy_gas import GAS_STATION_TIMEOUT
+from telliot_core.gas.legacy_gas import legacy_gas_station
+from telliot_core.gas.legacy_gas import parse_gas_station_response
+from telliot_core.model.endpoints import node_request
+from telliot_core.model.endpoints import RPCEndpoint
+
+logger = logging.getLogger(__name__)
+
+#: Number of recent blocks sampled with eth_feeHistory
+FEE_HISTORY_BLOCKS = 5
+
+#: Reward percentile used as the suggested priority fee
+PRIORITY_FEE_PERCENTILE = 50
+
+
+@dataclass
+class GasPrices:
+    """Latest gas prices known to a `GasOracle` (all in gwei)"""
+
+    #: Legacy gas price combined from all sources
+    gas_price: Optional[int] = None
+
+    #: Base fee of the next block, if the chain supports EIP-1559
+    base_fee: Optional[float] = None
+
+    #: Median priority fee paid in recent blocks
+    priority_fee: Optional[float] = None
+
+    #: Gas price reported by each source
+    sources: Dict[str, Optional[float]] = field(default_factory=dict)
+
+    #: Monotonic time of the refresh that produced these prices
+    timestamp: Optional[float] = None
+
+    @property
+    def max_fee(self) -> Optional[float]:
+        """EIP-1559 max fee that survives the base fee doubling"""
+        if self.base_fee is None or self.priority_fee is None:
+            return None
+        return 2 * self.base_fee + self.priority_fee
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since these prices were fetched"""
+        return None if self.timestamp is None else time.monotonic() - self.timestamp
+
+
+def _gwei(wei: Any) -> float:
+    return int(wei, 16) / 1e9 if isinstance(wei, str) else int(wei) / 1e9
+
+
+class GasOracle:
+    """Keep recent gas prices for one chain ready for the submit path
+
+    Prices from the chain's gas station API (see `gas_station`), the node's
+    `eth_gasPrice` and `eth_feeHistory` are fetched concurrently and
+    refreshed in the background every `ttl` seconds.  `prices` returns the
+    latest snapshot without any I/O.
+
+    Usage:
+        oracle = get_gas_oracle(core.endpoint)
+        oracle.start()
+        ...
+        gas_price = oracle.prices.gas_price
+    """
+
+    def __init__(self, node: RPCEndpoint, ttl: float = 15.0, timeout: float = GAS_STATION_TIMEOUT):
+
+        self.node = node
+        self.ttl = ttl
+        self.timeout = timeout
+
+        self._prices = GasPrices()
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._refreshing: Optional["asyncio.Task[GasPrices]"] = None
+
+    @property
+    def prices(self) -> GasPrices:
+        """Latest gas prices (empty until the first refresh completes)"""
+        return self._prices
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def get(self) -> GasPrices:
+        """Latest gas prices, refreshing first if they are missing or stale"""
+        age = self._prices.age
+        if age is None or age > self.ttl:
+            await self.refresh()
+        return self._prices
+
+    async def refresh(self) -> GasPrices:
+        """Fetch every source concurrently and update the snapshot
+
+        Concurrent callers share a single refresh.
+        """
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.create_task(self._refresh())
+        return await asyncio.shield(self._refreshing)
+
+    async def _refresh(self) -> GasPrices:
+        station, node_gas_price, fee_history = await asyncio.gather(
+            self._gas_station_price(),
+            self._node_gas_price(),
+            self._fee_history(),
+        )
+
+        sources: Dict[str, Optional[float]] = {"gas_station": station, "eth_gasPrice": node_gas_price}
+
+        base_fee = priority_fee = None
+        if fee_history is not None:
+            base_fee, priority_fee = fee_history
+            sources["eth_feeHistory"] = base_fee + priority_fee
+
+        gas_price = None
+        available = [p for p in sources.values() if p is not None]
+        if available:
+            price = statistics.median_high(available)
+            gas_price = int(price) if price > 1 else math.ceil(price)
+
+        self._prices = GasPrices(
+            gas_price=gas_price,
+            base_fee=base_fee,
+            priority_fee=priority_fee,
+            sources=sources,
+            timestamp=time.monotonic(),
+        )
+        logger.debug(f"Gas prices on chain {self.node.chain_id}: {sources}")
+
+        return self._prices
+
+    async def _gas_station_price(self) -> Optional[float]:
+        chain_id = self.node.chain_id
+        if chain_id is None or chain_id not in gas_station:
+            return None
+
+        session = self.node.session
+        if session is None or session.closed:
+            return await legacy_gas_station(chain_id)
+
+        try:
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            async with session.get(gas_station[chain_id].api, timeout=timeout) as rsp:
+                prices = json.loads(await rsp.read())
+        except Exception as e:
+            logger.warning(f"Error fetching gas price from gas station: {e!r}")
+            return None
+
+        return parse_gas_station_response(chain_id, prices)
+
+    async def _node_request(self, method: str, params: List[Any]) -> Any:
+        return await node_request(self.node, method, params, timeout=self.timeout)
+
+    async def _node_gas_price(self) -> Optional[float]:
+        try:
+            return _gwei(await self._node_request("eth_gasPrice", []))
+        except Exception as e:
+            logger.warning(f"Error fetching eth_gasPrice: {e!r}")
+            return None
+
+    async def _fee_history(self) -> Optional[Tuple[float, float]]:
+        """(next block base fee, median priority fee) from recent blocks"""
+        try:
+            history = await self._node_request(
+                "eth_feeHistory", [hex(FEE_HISTORY_BLOCKS), "latest", [PRIORITY_FEE_PERCENTILE]]
+            )
+            base_fees = history.get("baseFeePerGas") or []
+            rewards = [r[0] for r in history.get("reward") or [] if r]
+        except Exception as e:
+            # Chains without EIP-1559 reject eth_feeHistory
+            logger.debug(f"eth_feeHistory unavailable: {e!r}")
+            return None
+
+        if not base_fees or not rewards:
+            return None
+
+        return _gwei(base_fees[-1]), statistics.median(_gwei(r) for r in rewards)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Gas price refresh failed")
+            await asyncio.sleep(self.ttl)
+
+    def start(self) -> None:
+        """Start refreshing prices in the background"""
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name=f"gas_oracle_{self.node.chain_id}")
+
+    async def stop(self) -> None:
+        """Stop the background refresh"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._refreshing and not self._refreshing.done():
+            self._refreshing.cancel()
+
+
+_gas_oracles: Dict[str, GasOracle] = {}
+
+
+def get_gas_oracle(node: RPCEndpoint) -> GasOracle:
+    """Get or create the gas oracle shared by everything using a node"""
+    if node.url not in _gas_oracles:
+        _gas_oracles[node.url] = GasOracle(node)
+
+    return _gas_oracles[node.url]
+
+
+async def shutdown_gas_oracles() -> None:
+    """Stop every shared gas oracle"""
+    for oracle in _gas_oracles.values():
+        await oracle.stop()
+    _gas_oracles.clear()
@@ -1,8 +1,10 @@
+import asyncio
 import json
 import logging
 import math
 from dataclasses import dataclass
 from json.decoder import JSONDecodeError
+from typing import Any
 from typing import Literal
 from typing import Optional
 from typing import Union
@@ -12,6 +14,9 @@ import requests
 logger = logging.getLogger(__name__)
 ethgastypes = Literal["fast", "fastest", "safeLow", "average", "standard"]
 
+#: Seconds to wait for a gas station API to answer
+GAS_STATION_TIMEOUT = 10.0
+
 
 @dataclass
 class GasStation:
@@ -19,6 +24,11 @@ class GasStation:
     parse_rsp: list[Union[str, int, ethgastypes]]
 
 
+async def _get(url: str) -> requests.Response:
+    """Run a blocking `requests.get` in a worker thread so the event loop keeps running"""
+    return await asyncio.wait_for(asyncio.to_thread(requests.get, url), timeout=GAS_STATION_TIMEOUT)
+
+
 async def fetch_gas_price() -> Optional[int]:
     """Estimate current ETH gas price
 
@@ -34,7 +44,7 @@ async def ethgasstation(style: ethgastypes = "fast", retries: int = 2) -> Option
     """Fetch gas price from ethgasstation in gwei"""
     for _ in range(retries):
         try:
-            rsp = requests.get("https://ethgasstation.info/json/ethgasAPI.json")
+            rsp = await _get("https://ethgasstation.info/json/ethgasAPI.json")
             prices = json.loads(rsp.content)
             gas_price = int(prices[style])
             return int(gas_price / 10)  # json output is gwei*10
@@ -82,8 +92,9 @@ async def legacy_gas_station(
 
     for _ in range(retries):
         try:
-            rsp = requests.get(gas_station[chain_id].api)
+            rsp = await _get(gas_station[chain_id].api)
             prices = json.loads(rsp.content)
+            break
         except JSONDecodeError:
             logger.error("Error decoding JSON from gasstation API")
             continue
@@ -94,6 +105,13 @@ async def legacy_gas_station(
             logger.error(f"Error fetching gas price: {e}")
             return None
 
+    return parse_gas_station_response(chain_id, prices, speed_parse_lis)
+
+
+def parse_gas_station_response(
+    chain_id: int, prices: Any, speed_parse_lis: Optional[list[Union[str, int, ethgastypes]]] = None
+) -> Optional[int]:
+    """Extract the gas price in gwei from a gas station API response"""
     if speed_parse_lis is None:
         speed_parse_lis = gas_station[chain_id].parse_rsp
 
@@ -116,8 +134,6 @@ async def legacy_gas_station(
 
 
 if __name__ == "__main__":
-    import asyncio
-
     loop = asyncio.get_event_loop()
     for chain_id in gas_station:
         price = loop.run_until_complete(legacy_gas_station(chain_id))
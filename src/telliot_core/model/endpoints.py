@@ -1,18 +1,27 @@
 """
 Utils for creating a JSON RPC connection to an EVM blockchain
 """
+import asyncio
+import json
 import logging
 from dataclasses import dataclass
 from dataclasses import field
+from typing import Any
+from typing import Dict
 from typing import List
 from typing import Optional
-
-import websockets.exceptions
-from web3 import Web3
+from typing import Tuple
+from typing import TYPE_CHECKING
 
 from telliot_core.apps.config import ConfigFile
 from telliot_core.apps.config import ConfigOptions
 from telliot_core.model.base import Base
+from telliot_core.utils.response import ResponseStatus
+
+# Imported when a connection is made, to keep loading the config fast
+if TYPE_CHECKING:
+    import aiohttp
+    from web3 import Web3
 
 logger = logging.getLogger(__name__)
 
@@ -36,9 +45,21 @@ class RPCEndpoint(Base):
     #: Explorer URL ')
     explorer: Optional[str] = None
 
+    #: Optional websocket URL for event subscriptions (e.g. 'wss://mainnet.infura.io/ws/v3/<project_id>')
+    ws_url: Optional[str] = None
+
+    #: Timeout in seconds for native async JSON-RPC requests
+    timeout: float = 10.0
+
     #: Read-only Web3 Connection with private storage
     web3 = property(lambda self: self._web3)
-    _web3: Optional[Web3] = field(default=None, init=False, repr=False)
+    _web3: Optional["Web3"] = field(default=None, init=False, repr=False)
+
+    #: Shared aiohttp session used for native async JSON-RPC requests
+    session = property(lambda self: self._session)
+    _session: Optional["aiohttp.ClientSession"] = field(default=None, init=False, repr=False)
+
+    _request_id: int = field(default=0, init=False, repr=False)
 
     def connect(self) -> bool:
         """Connect to EVM blockchain
@@ -49,6 +70,8 @@ class RPCEndpoint(Base):
         returns:
             True if connection was successful
         """
+        import websockets.exceptions
+        from web3 import Web3
 
         if self._web3:
             return True
@@ -71,6 +94,149 @@ class RPCEndpoint(Base):
 
         return connected
 
+    def set_session(self, session: Optional["aiohttp.ClientSession"]) -> None:
+        """Attach (or detach with None) a shared aiohttp session
+
+        While a session is attached, `request` sends JSON-RPC calls
+        natively over it instead of through the blocking web3 provider.
+        """
+        self._session = session
+
+    @property
+    def async_enabled(self) -> bool:
+        """True if an open session is attached for async requests"""
+        return self._session is not None and not self._session.closed
+
+    def _next_request_id(self) -> int:
+        """Generate sequential IDs for JSON-RPC requests"""
+        self._request_id += 1
+        return self._request_id
+
+    def _rpc_message(self, method: str, params: List[Any]) -> Dict[str, Any]:
+        """Build a JSON-RPC 2.0 request object with a fresh ID"""
+        return {"jsonrpc": "2.0", "id": self._next_request_id(), "method": method, "params": params}
+
+    async def request(self, method: str, params: List[Any]) -> Any:
+        """Send a single JSON-RPC request over the shared aiohttp session
+
+        Errors are raised the same way web3 does: a reverted `eth_call`
+        raises `ContractLogicError`, any other RPC error raises `ValueError`.
+        Requests taking longer than `timeout` raise `asyncio.TimeoutError`.
+
+        returns:
+            The `result` field of the JSON-RPC response
+        """
+
+        if not self.async_enabled:
+            raise Exception("No open session for endpoint.  Use RPCEndpoint.set_session().")
+        assert self._session is not None  # typing
+        import aiohttp
+
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with self._session.post(self.url, json=self._rpc_message(method, params), timeout=timeout) as resp:
+            resp.raise_for_status()
+            response = await resp.json(content_type=None)
+
+        return _rpc_result(method, response)
+
+    async def batch_request(self, calls: List[Tuple[str, List[Any]]]) -> List[Tuple[Any, ResponseStatus]]:
+        """Send several JSON-RPC calls as one JSON-RPC 2.0 batch
+
+        All calls go out in a single HTTP POST over a pooled connection: the
+        shared aiohttp session if one is attached, otherwise web3's cached
+        `requests` session in a worker thread.  Responses are matched back to calls by ID,
+        so the node may answer in any order.
+
+        Args:
+            calls: List of (method, params) tuples,
+                e.g. [("eth_blockNumber", []), ("eth_getBalance", [address, "latest"])]
+
+        returns:
+            One (result, ResponseStatus) tuple per call, in call order
+        """
+
+        if not calls:
+            return []
+
+        messages = [self._rpc_message(method, params) for method, params in calls]
+
+        try:
+            if self.async_enabled:
+                assert self._session is not None  # typing
+                import aiohttp
+
+                timeout = aiohttp.ClientTimeout(total=self.timeout)
+                async with self._session.post(self.url, json=messages, timeout=timeout) as resp:
+                    resp.raise_for_status()
+                    responses = await resp.json(content_type=None)
+            else:
+                from eth_typing import URI
+                from web3._utils.request import make_post_request
+
+                data = json.dumps(messages).encode()
+                raw = await asyncio.to_thread(
+                    make_post_request, URI(self.url), data, headers=_JSON_HEADERS, timeout=self.timeout
+                )
+                responses = json.loads(raw)
+        except Exception as e:
+            msg = "JSON-RPC batch request failed"
+            return [(None, ResponseStatus(ok=False, e=e, error=msg)) for _ in calls]
+
+        # Nodes that do not support batching reply with a single error object
+        if not isinstance(responses, list):
+            e = ValueError(responses.get("error", responses) if isinstance(responses, dict) else responses)
+            msg = "JSON-RPC batch request rejected"
+            return [(None, ResponseStatus(ok=False, e=e, error=msg)) for _ in calls]
+
+        by_id = {r.get("id"): r for r in responses if isinstance(r, dict)}
+
+        results: List[Tuple[Any, ResponseStatus]] = []
+        for (method, _), message in zip(calls, messages):
+            response = by_id.get(message["id"])
+            if response is None:
+                msg = f"No response for {method} in JSON-RPC batch"
+                results.append((None, ResponseStatus(ok=False, error=msg)))
+                continue
+            try:
+                results.append((_rpc_result(method, response), ResponseStatus(ok=True)))
+            except Exception as e:
+                msg = f"JSON-RPC error in {method}"
+                results.append((None, ResponseStatus(ok=False, e=e, error=msg)))
+
+        return results
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _rpc_result(method: str, response: Dict[str, Any]) -> Any:
+    """Extract the result of a JSON-RPC response, raising errors like web3 does"""
+
+    if "error" in response:
+        if method == "eth_call":
+            from web3._utils.method_formatters import raise_solidity_error_on_revert
+
+            raise_solidity_error_on_revert(response)  # type: ignore
+        raise ValueError(response["error"])
+
+    return response["result"]
+
+
+async def node_request(node: RPCEndpoint, method: str, params: List[Any], timeout: float = 10.0) -> Any:
+    """Send a JSON-RPC request without blocking the event loop
+
+    Uses the endpoint's aiohttp session if attached, otherwise runs the
+    web3 provider in a worker thread.
+    """
+    if node.async_enabled:
+        return await asyncio.wait_for(node.request(method, params), timeout=timeout)
+
+    assert node.web3 is not None
+    rsp = await asyncio.to_thread(node.web3.provider.make_request, method, params)
+    if "error" in rsp:
+        raise ValueError(rsp["error"])
+    return rsp["result"]
+
 
 default_endpoint_list = [
     RPCEndpoint(
@@ -0,0 +1,287 @@
+"""
+Local SQLite index of Tellor360 report, tip, feed funding and dispute events
+"""
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+from eth_utils import to_checksum_address
+from hexbytes import HexBytes
+
+from telliot_core.contract.abi_registry import abi_registry
+from telliot_core.contract.abi_registry import event_decoder
+from telliot_core.contract.log_fetcher import LogFetcher
+from telliot_core.directory import get_contract_directory
+from telliot_core.model.endpoints import node_request
+from telliot_core.model.endpoints import RPCEndpoint
+from telliot_core.utils.home import telliot_homedir
+
+logger = logging.getLogger(__name__)
+
+#: Events indexed for each contract in the contract directory
+INDEXED_EVENTS: Dict[str, Tuple[str, ...]] = {
+    "tellor360-oracle": ("NewReport",),
+    "tellor360-autopay": ("TipAdded", "DataFeedFunded"),
+    "tellor-governance": ("NewDispute",),
+}
+
+# Token amounts are stored as decimal strings since they overflow SQLite integers.
+# Addresses are stored checksummed.  Sync progress is kept per set of indexed contracts.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_state (
+    chain_id INTEGER, contracts TEXT, last_block INTEGER NOT NULL,
+    PRIMARY KEY (chain_id, contracts)
+);
+CREATE TABLE IF NOT EXISTS reports (
+    chain_id INTEGER, block_number INTEGER, log_index INTEGER, tx_hash TEXT,
+    query_id TEXT, timestamp INTEGER, value BLOB, nonce INTEGER, query_data BLOB, reporter TEXT,
+    PRIMARY KEY (chain_id, block_number, log_index)
+);
+CREATE INDEX IF NOT EXISTS reports_query_id ON reports (chain_id, query_id, timestamp);
+CREATE INDEX IF NOT EXISTS reports_reporter ON reports (chain_id, reporter, timestamp);
+CREATE TABLE IF NOT EXISTS tips (
+    chain_id INTEGER, block_number INTEGER, log_index INTEGER, tx_hash TEXT,
+    query_id TEXT, amount TEXT, query_data BLOB, tipper TEXT,
+    PRIMARY KEY (chain_id, block_number, log_index)
+);
+CREATE INDEX IF NOT EXISTS tips_query_id ON tips (chain_id, query_id, block_number);
+CREATE TABLE IF NOT EXISTS feed_fundings (
+    chain_id INTEGER, block_number INTEGER, log_index INTEGER, tx_hash TEXT,
+    query_id TEXT, feed_id TEXT, amount TEXT, funder TEXT,
+    PRIMARY KEY (chain_id, block_number, log_index)
+);
+CREATE INDEX IF NOT EXISTS feed_fundings_query_id ON feed_fundings (chain_id, query_id, feed_id);
+CREATE TABLE IF NOT EXISTS disputes (
+    chain_id INTEGER, block_number INTEGER, log_index INTEGER, tx_hash TEXT,
+    dispute_id INTEGER, query_id TEXT, timestamp INTEGER, reporter TEXT,
+    PRIMARY KEY (chain_id, block_number, log_index)
+);
+CREATE INDEX IF NOT EXISTS disputes_query_id ON disputes (chain_id, query_id, timestamp);
+CREATE INDEX IF NOT EXISTS disputes_reporter ON disputes (chain_id, reporter, timestamp);
+"""
+
+
+def _hex(value: bytes) -> str:
+    return HexBytes(value).hex()
+
+
+def _address(value: Optional[str]) -> Optional[str]:
+    return None if value is None else to_checksum_address(value)
+
+
+class EventIndexer:
+    """Index Tellor360 events from one chain into a local SQLite database
+
+    Logs of every event in `INDEXED_EVENTS` are fetched with a `LogFetcher`
+    (starting with ranges of `chunk_size` blocks), decoded with the contract
+    ABIs and stored in tables indexed by query id, reporter and timestamp.
+    The last processed block is saved with each chunk, so `sync()` resumes
+    where the previous run with the same contracts stopped.
+
+    Usage:
+        indexer = EventIndexer(core.endpoint, start_block=30_000_000)
+        await indexer.sync()
+        reports = indexer.reports(query_id=query_id)
+    """
+
+    def __init__(
+        self,
+        node: RPCEndpoint,
+        db_path: Optional[Union[str, Path]] = None,
+        start_block: int = 0,
+        chunk_size: int = 2000,
+        max_concurrency: int = 4,
+        confirmations: int = 0,
+        addresses: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Args:
+            node: Endpoint of the chain to index
+            db_path: SQLite file (default: `events-<chain_id>.sqlite` in the telliot home folder)
+            start_block: First block indexed on the first sync
+            chunk_size: Initial number of blocks per eth_getLogs request
+            max_concurrency: Maximum number of eth_getLogs requests in flight
+            confirmations: Blocks to stay behind the chain head, to avoid indexing reorged logs
+            addresses: Contract address for each name in `INDEXED_EVENTS`
+                (default: addresses from the contract directory)
+        """
+        chain_id = node.chain_id
+        assert chain_id is not None
+
+        self.node = node
+        self.chain_id = chain_id
+        self.start_block = start_block
+        self.chunk_size = chunk_size
+        self.max_concurrency = max_concurrency
+        self.confirmations = confirmations
+
+        if db_path is None:
+            db_path = telliot_homedir() / f"events-{chain_id}.sqlite"
+        self.db = sqlite3.connect(str(db_path))
+        self.db.executescript(SCHEMA)
+
+        #: Event ABI for each log topic
+        self.events: Dict[HexBytes, Dict[str, Any]] = {}
+        #: Indexed contract addresses (checksummed)
+        self.addresses: List[str] = []
+
+        for name, event_names in INDEXED_EVENTS.items():
+            info = get_contract_directory().entries.get(name)
+            if addresses is not None:
+                address = addresses.get(name)
+            else:
+                address = info.address.get(chain_id) if info else None
+            if not info or not address:
+                logger.info(f"No {name} contract on chain {chain_id}, skipping its events")
+                continue
+
+            self.addresses.append(to_checksum_address(address))
+            self.events.update(abi_registry.register(info.get_abi(chain_id=chain_id)).events(event_names))
+
+        #: Key of the indexed contract set in the sync state table
+        self.contracts = ",".join(sorted(a.lower() for a in self.addresses))
+
+    @property
+    def last_block(self) -> Optional[int]:
+        """Last block processed on this chain, or None if nothing was indexed yet"""
+        row = self.db.execute(
+            "SELECT last_block FROM sync_state WHERE chain_id = ? AND contracts = ?", (self.chain_id, self.contracts)
+        ).fetchone()
+        return None if row is None else int(row[0])
+
+    async def sync(self, to_block: Optional[int] = None) -> int:
+        """Index all blocks from the last processed block up to `to_block`
+
+        returns:
+            Number of events stored
+        """
+        if not self.addresses or not self.events:
+            # An empty address or topic filter would match every log on the chain
+            logger.warning(f"No contracts to index on chain {self.chain_id}")
+            return 0
+
+        if to_block is None:
+            to_block = int(await node_request(self.node, "eth_blockNumber", []), 16) - self.confirmations
+
+        last_block = self.last_block
+        from_block = self.start_block if last_block is None else last_block + 1
+
+        fetcher = LogFetcher(
+            self.node,
+            self.addresses,
+            [[topic.hex() for topic in self.events]],
+            decoder=event_decoder(self.events),
+            span=self.chunk_size,
+            max_concurrency=self.max_concurrency,
+        )
+
+        stored = 0
+        async for chunk in fetcher.chunks(from_block, to_block):
+            stored += self._store(chunk.logs, chunk.to_block)
+
+        return stored
+
+    def _store(self, logs: List[Any], last_block: int) -> int:
+        """Decode and store logs, then record the last processed block"""
+        rows: Dict[str, List[Tuple[Any, ...]]] = {"reports": [], "tips": [], "feed_fundings": [], "disputes": []}
+
+        for event in logs:
+            if "event" not in event:
+                continue
+
+            args = event["args"]
+            key = (self.chain_id, event["blockNumber"], event["logIndex"], _hex(event["transactionHash"]))
+
+            if event["event"] == "NewReport":
+                rows["reports"].append(
+                    key
+                    + (
+                        _hex(args["_queryId"]),
+                        args["_time"],
+                        args["_value"],
+                        args["_nonce"],
+                        args["_queryData"],
+                        _address(args["_reporter"]),
+                    )
+                )
+            elif event["event"] == "TipAdded":
+                rows["tips"].append(
+                    key + (_hex(args["_queryId"]), str(args["_amount"]), args["_queryData"], _address(args["_tipper"]))
+                )
+            elif event["event"] == "DataFeedFunded":
+                rows["feed_fundings"].append(
+                    key
+                    + (
+                        _hex(args["_queryId"]),
+                        _hex(args["_feedId"]),
+                        str(args["_amount"]),
+                        _address(args["_feedFunder"]),
+                    )
+                )
+            elif event["event"] == "NewDispute":
+                rows["disputes"].append(
+                    key + (args["_disputeId"], _hex(args["_queryId"]), args["_timestamp"], _address(args["_reporter"]))
+                )
+
+        with self.db:
+            for table, table_rows in rows.items():
+                if table_rows:
+                    placeholders = ", ".join("?" * len(table_rows[0]))
+                    self.db.executemany(f"INSERT OR REPLACE INTO {table} VALUES ({placeholders})", table_rows)
+            self.db.execute(
+                "INSERT OR REPLACE INTO sync_state (chain_id, contracts, last_block) VALUES (?, ?, ?)",
+                (self.chain_id, self.contracts, last_block),
+            )
+
+        return sum(len(r) for r in rows.values())
+
+    def _query(self, table: str, filters: Dict[str, Any], order_by: str) -> List[Dict[str, Any]]:
+        conditions = ["chain_id = ?"]
+        params: List[Any] = [self.chain_id]
+        for condition, value in filters.items():
+            if value is not None:
+                conditions.append(condition)
+                params.append(value)
+
+        cursor = self.db.execute(f"SELECT * FROM {table} WHERE {' AND '.join(conditions)} ORDER BY {order_by}", params)
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def reports(
+        self,
+        query_id: Optional[bytes] = None,
+        reporter: Optional[str] = None,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Indexed reports, oldest first, optionally filtered by query id, reporter and timestamp"""
+        filters = {
+            "query_id = ?": None if query_id is None else _hex(query_id),
+            "reporter = ?": _address(reporter),
+            "timestamp >= ?": since,
+            "timestamp <= ?": until,
+        }
+        return self._query("reports", filters, "timestamp")
+
+    def tips(self, query_id: Optional[bytes] = None) -> List[Dict[str, Any]]:
+        """Indexed one-time tips, oldest first"""
+        return self._query("tips", {"query_id = ?": None if query_id is None else _hex(query_id)}, "block_number")
+
+    def feed_fundings(self, query_id: Optional[bytes] = None) -> List[Dict[str, Any]]:
+        """Indexed data feed fundings, oldest first"""
+        filters = {"query_id = ?": None if query_id is None else _hex(query_id)}
+        return self._query("feed_fundings", filters, "block_number")
+
+    def disputes(self, query_id: Optional[bytes] = None, reporter: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Indexed disputes, ordered by the disputed report's timestamp"""
+        filters = {"query_id = ?": None if query_id is None else _hex(query_id), "reporter = ?": _address(reporter)}
+        return self._query("disputes", filters, "timestamp")
+
+    def close(self) -> None:
+        self.db.close()
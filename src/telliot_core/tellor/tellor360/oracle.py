@@ -1,13 +1,20 @@
+import asyncio
 import logging
+from dataclasses import dataclass
+from dataclasses import field
 from typing import Any
+from typing import Dict
+from typing import List
 from typing import Optional
 from typing import Tuple
 
 from chained_accounts import ChainedAccount
 
 from telliot_core.contract.contract import Contract
-from telliot_core.directory import contract_directory
+from telliot_core.contract.multicall import Multicall
+from telliot_core.directory import get_contract_directory
 from telliot_core.model.endpoints import RPCEndpoint
+from telliot_core.utils.response import error_status
 from telliot_core.utils.response import ResponseStatus
 from telliot_core.utils.timestamp import TimeStamp
 
@@ -15,12 +22,70 @@ from telliot_core.utils.timestamp import TimeStamp
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class ReportHistory:
+    """Reports of one query id, stored column by column"""
+
+    query_id: bytes
+
+    #: Report index of each report
+    indexes: List[int] = field(default_factory=list)
+
+    #: Timestamp of each report
+    timestamps: List[int] = field(default_factory=list)
+
+    #: Reported value (empty if removed by a dispute)
+    values: List[bytes] = field(default_factory=list)
+
+    #: Reporter address
+    reporters: List[str] = field(default_factory=list)
+
+    #: True if the report was disputed
+    disputed: List[bool] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def columns(self) -> Dict[str, List[Any]]:
+        return {
+            "index": self.indexes,
+            "timestamp": self.timestamps,
+            "value": self.values,
+            "reporter": self.reporters,
+            "disputed": self.disputed,
+        }
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """Columns as NumPy arrays (requires numpy)"""
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError("ReportHistory.to_numpy() requires numpy (pip install numpy)") from e
+
+        return {
+            "index": np.array(self.indexes, dtype=np.uint64),
+            "timestamp": np.array(self.timestamps, dtype=np.uint64),
+            "value": np.array(self.values, dtype=object),
+            "reporter": np.array(self.reporters, dtype=object),
+            "disputed": np.array(self.disputed, dtype=bool),
+        }
+
+    def to_dataframe(self) -> Any:
+        """Reports as a pandas DataFrame (requires pandas)"""
+        try:
+            import pandas as pd
+        except ImportError as e:
+            raise ImportError("ReportHistory.to_dataframe() requires pandas (pip install pandas)") from e
+
+        return pd.DataFrame(self.columns())
+
+
 class Tellor360OracleContract(Contract):
     def __init__(self, node: RPCEndpoint, account: Optional[ChainedAccount] = None):
         chain_id = node.chain_id
         assert chain_id is not None
 
-        contract_info = contract_directory.find(chain_id=chain_id, name="tellor360-oracle")
+        contract_info = get_contract_directory().find(chain_id=chain_id, name="tellor360-oracle")
         if not contract_info:
             raise Exception(f"Tellor360 oracle contract not found on chain_id {chain_id}")
 
@@ -44,9 +109,11 @@ class Tellor360OracleContract(Contract):
             logger.error(status)
             return None
 
-    async def get_reporting_lock(self) -> Optional[int]:
+    async def get_reporting_lock(self, race: bool = False) -> Optional[int]:
+        """Reporting lock in seconds (with `race`, read from several pool endpoints at once)"""
 
-        lock, status = await self.read("getReportingLock")
+        read = self.read_race if race else self.read
+        lock, status = await read("getReportingLock")
 
         if status.ok:
             return int(lock)
@@ -67,9 +134,11 @@ class Tellor360OracleContract(Contract):
             logger.error(status)
             return None
 
-    async def get_time_of_last_new_value(self) -> Tuple[Optional[TimeStamp], ResponseStatus]:
+    async def get_time_of_last_new_value(self, race: bool = False) -> Tuple[Optional[TimeStamp], ResponseStatus]:
+        """Time of the last report (with `race`, read from several pool endpoints at once)"""
 
-        tlnv, status = await self.read("getTimeOfLastNewValue")
+        read = self.read_race if race else self.read
+        tlnv, status = await read("getTimeOfLastNewValue")
 
         if status.ok:
             return TimeStamp(tlnv), status
@@ -109,9 +178,74 @@ class Tellor360OracleContract(Contract):
         count, status = await self.read(func_name="getNewValueCountbyQueryId", _queryId=query_id)
         return count, status
 
+    async def get_report_history(
+        self,
+        query_id: bytes,
+        start: int = 0,
+        end: Optional[int] = None,
+        batch_size: int = 500,
+        max_concurrency: int = 4,
+    ) -> Tuple[Optional[ReportHistory], ResponseStatus]:
+        """Fetch the reports of a query id with indexes in [start, end)
+
+        Reads are grouped into Multicall batches of `batch_size` calls, with
+        up to `max_concurrency` batches in flight, sent through the endpoint
+        pool if one is set.  Timestamps are fetched
+        first, then values and report details for all of them.
+
+        Args:
+            query_id: Query id of the reports
+            start: First report index
+            end: Index after the last report (defaults to the report count)
+        """
+
+        if end is None:
+            end, status = await self.get_new_value_count_by_qeury_id(query_id)
+            if not status.ok:
+                return None, status
+
+        history = ReportHistory(query_id=query_id, indexes=list(range(start, end)))
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _batch(calls: List[Tuple[str, Dict[str, Any]]]) -> List[Tuple[Any, ResponseStatus]]:
+            async with semaphore:
+                mc = Multicall(self.node, pool=self.pool)
+                for func_name, kwargs in calls:
+                    mc.add(self, func_name, _queryId=query_id, **kwargs)
+                return await mc.execute()
+
+        async def _read_all(calls: List[Tuple[str, Dict[str, Any]]]) -> Tuple[List[Any], ResponseStatus]:
+            starts = range(0, len(calls), batch_size)
+            batches = [calls[i:j] for i, j in zip(starts, [*starts[1:], len(calls)])]
+            results = [r for batch in await asyncio.gather(*[_batch(b) for b in batches]) for r in batch]
+            for _, status in results:
+                if not status.ok:
+                    return [], status
+            return [value for value, _ in results], ResponseStatus()
+
+        timestamps, status = await _read_all(
+            [("getTimestampbyQueryIdandIndex", {"_index": i}) for i in history.indexes]
+        )
+        if not status.ok:
+            return None, error_status("Error reading report timestamps", e=status.e, log=logger.error)
+        history.timestamps = [int(t) for t in timestamps]
+
+        calls: List[Tuple[str, Dict[str, Any]]] = []
+        for t in history.timestamps:
+            calls.append(("retrieveData", {"_timestamp": t}))
+            calls.append(("getReportDetails", {"_timestamp": t}))
+        details, status = await _read_all(calls)
+        if not status.ok:
+            return None, error_status("Error reading report values", e=status.e, log=logger.error)
+
+        history.values = [bytes(v) for v in details[0::2]]
+        history.reporters = [str(reporter) for reporter, _ in details[1::2]]
+        history.disputed = [bool(disputed) for _, disputed in details[1::2]]
+
+        return history, ResponseStatus()
+
 
 if __name__ == "__main__":
-    import asyncio
     from telliot_core.apps.core import TelliotCore
 
     async def hello_world() -> None:
@@ -6,7 +6,7 @@ from chained_accounts import ChainedAccount
 from web3.exceptions import ContractLogicError
 
 from telliot_core.contract.contract import Contract
-from telliot_core.directory import contract_directory
+from telliot_core.directory import get_contract_directory
 from telliot_core.model.endpoints import RPCEndpoint
 from telliot_core.utils.response import ResponseStatus
 
@@ -25,7 +25,7 @@ class TellorFlexAutopayContract(Contract):
         chain_id = node.chain_id
         assert chain_id is not None
 
-        contract_info = contract_directory.find(chain_id=chain_id, name="tellorflex-autopay")[0]
+        contract_info = get_contract_directory().find(chain_id=chain_id, name="tellorflex-autopay")[0]
         if not contract_info:
             raise Exception(f"Tellorflex autopay contract not found on chain_id {chain_id}")
         contract_abi = contract_info.get_abi(chain_id=chain_id)
@@ -6,7 +6,7 @@ from typing import Tuple
 from chained_accounts import ChainedAccount
 
 from telliot_core.contract.contract import Contract
-from telliot_core.directory import contract_directory
+from telliot_core.directory import get_contract_directory
 from telliot_core.model.endpoints import RPCEndpoint
 from telliot_core.utils.response import ResponseStatus
 from telliot_core.utils.timestamp import TimeStamp
@@ -26,7 +26,7 @@ class TellorFlexOracleContract(Contract):
         chain_id = node.chain_id
         assert chain_id is not None
 
-        entries = contract_directory.find(chain_id=chain_id, name="tellorflex-oracle")
+        entries = get_contract_directory().find(chain_id=chain_id, name="tellorflex-oracle")
         if not entries:
             raise Exception(f"Tellorflex oracle contract not found on chain_id {chain_id}")
         contract_info = entries[0]
@@ -5,7 +5,7 @@ from chained_accounts import ChainedAccount
 from eth_utils import to_checksum_address
 
 from telliot_core.contract.contract import Contract
-from telliot_core.directory import contract_directory as directory
+from telliot_core.directory import get_contract_directory
 from telliot_core.model.endpoints import RPCEndpoint
 from telliot_core.tellor.tellorx.oracle import ReadRespType
 from telliot_core.utils.timestamp import TimeStamp
@@ -38,7 +38,7 @@ class TellorxMasterContract(Contract):
         chain_id = node.chain_id
         assert chain_id is not None
 
-        entries = directory.find(name="tellorx-master", chain_id=chain_id)
+        entries = get_contract_directory().find(name="tellorx-master", chain_id=chain_id)
         if not entries:
             raise Exception(f"TellorX master contract not found on chain_id {chain_id}")
         contract_info = entries[0]
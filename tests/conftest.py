@@ -2,7 +2,9 @@
 import os
 
 import pytest
+from brownie import accounts
 from brownie import chain
+from brownie import TellorFlex
 from chained_accounts import ChainedAccount
 from chained_accounts import find_accounts
 
@@ -114,3 +116,15 @@ def amoy_test_cfg(scope="session", autouse=True):
 @pytest.fixture
 def sepolia_test_cfg(scope="session", autouse=True):
     return local_node_cfg(chain_id=11155111)
+
+
+@pytest.fixture(scope="module")
+def mock_flex_contract():
+    """Mock the TellorFlex contract"""
+    return accounts[0].deploy(
+        TellorFlex,
+        "0x0000000000000000000000000000000000000123",
+        "0x0000000000000000000000000000000000000456",
+        42e18,
+        60 * 60,
+    )
@@ -0,0 +1,103 @@
+import json
+
+import pytest
+from eth_abi import encode_abi
+from web3 import Web3
+
+from telliot_core.contract import abi_registry
+from telliot_core.contract.abi_registry import AbiRegistry
+
+ABI = [
+    {
+        "inputs": [{"name": "_queryId", "type": "bytes32"}],
+        "name": "getNewValueCountbyQueryId",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "name": "_queryId", "type": "bytes32"},
+            {"indexed": False, "name": "_value", "type": "uint256"},
+        ],
+        "name": "NewValue",
+        "type": "event",
+    },
+]
+
+
+def test_abi_file_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(abi_registry, "telliot_homedir", lambda: tmp_path / "home")
+    path = tmp_path / "oracle-abi.json"
+    path.write_text(json.dumps(ABI, indent=2))
+
+    registry = AbiRegistry()
+    entry = registry.load_file(path)
+    assert registry.parses == 1
+    assert registry.load_file(path) is entry
+    assert registry.cache_path(path).parent == tmp_path / "home" / abi_registry.CACHE_DIR
+    assert registry.cache_path(path).exists()
+
+    # A new process loads the binary cache instead of parsing the JSON
+    registry = AbiRegistry()
+    cached = registry.load_file(path)
+    assert (registry.parses, registry.cache_loads) == (0, 1)
+    assert cached.abi == ABI
+    assert cached.digest == entry.digest
+    assert cached.selectors == entry.selectors
+    assert cached.topics == entry.topics
+
+    # Same ABI from another source shares the entry
+    assert registry.register(json.dumps(ABI)) is cached
+    assert registry.register(cached.abi) is cached
+
+    # A modified file is parsed again
+    path.write_text(json.dumps(ABI[:1]))
+    registry = AbiRegistry()
+    assert len(registry.load_file(path).abi) == 1
+    assert registry.parses == 1
+
+    # Cache folder can be chosen per registry
+    registry = AbiRegistry(cache_dir=tmp_path / "cache")
+    registry.load_file(path)
+    assert registry.cache_path(path).parent == tmp_path / "cache"
+    assert registry.cache_path(path).exists()
+
+
+def test_abi_entry_decoders():
+    entry = AbiRegistry().register(ABI)
+
+    selector = Web3.keccak(text="getNewValueCountbyQueryId(bytes32)")[:4]
+    assert entry.selectors[bytes(selector)]["name"] == "getNewValueCountbyQueryId"
+    assert entry.decode_output("getNewValueCountbyQueryId", encode_abi(["uint256"], [7])) == (7,)
+    assert entry.decode_output(bytes(selector), encode_abi(["uint256"], [7])) == (7,)
+    with pytest.raises(ValueError):
+        entry.output_types(b"\x00" * 4)
+
+    topic = Web3.keccak(text="NewValue(bytes32,uint256)")
+    log = {
+        "address": "0x" + "aa" * 20,
+        "topics": [topic, b"\x01" * 32],
+        "data": "0x" + encode_abi(["uint256"], [5]).hex(),
+        "blockNumber": 1,
+        "blockHash": b"\x00" * 32,
+        "transactionHash": b"\x00" * 32,
+        "transactionIndex": 0,
+        "logIndex": 0,
+    }
+    event = entry.decode_log(log)
+    assert event.event == "NewValue"
+    assert event.args._value == 5
+
+    assert list(entry.events(["NewValue"])) == [topic]
+    assert entry.events() == entry.topics
+    with pytest.raises(ValueError):
+        entry.events(["NewReport"])
+
+    # One web3 contract class per node, shared by all contracts with this ABI
+    w3 = Web3(Web3.HTTPProvider("http://fake"))
+    factory = entry.contract_factory(w3)
+    assert entry.contract_factory(w3) is factory
+    contract = factory(address=Web3.toChecksumAddress("0x" + "aa" * 20))
+    assert contract.functions.getNewValueCountbyQueryId
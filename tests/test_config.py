@@ -6,6 +6,7 @@ from dataclasses import dataclass
 from dataclasses import field
 from pathlib import Path
 
+from telliot_core.apps import config
 from telliot_core.apps.config import ConfigFile
 from telliot_core.apps.config import ConfigOptions
 
@@ -80,3 +81,32 @@ def test_yaml():
 def test_json():
     """Test JSON format"""
     main("json")
+
+
+def test_config_cache(tmp_path, monkeypatch):
+    """Config files are parsed once while unchanged, and snapshots skip parsing"""
+    parses = []
+    yaml_load = config.yaml.load
+
+    def counting_load(*args, **kwargs):
+        parses.append(1)
+        return yaml_load(*args, **kwargs)
+
+    monkeypatch.setattr(config.yaml, "load", counting_load)
+
+    cf = ConfigFile(name="myconfig", config_type=MyOptions, config_dir=tmp_path, snapshot=True)
+    options = cf.get_config()
+    options.option_a = 5
+    assert cf.get_config().option_a == 1
+    assert len(parses) == 1
+    assert cf.snapshot_file.exists()
+
+    # A new process loads the snapshot instead of parsing the file
+    config._state_cache.clear()
+    assert cf.get_config().option_a == 1
+    assert len(parses) == 1
+
+    # Saving invalidates the cache and the snapshot
+    cf.save_config(options)
+    assert cf.get_config().option_a == 5
+    assert len(parses) == 2
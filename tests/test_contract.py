@@ -5,6 +5,8 @@ import pytest
 import web3
 
 from telliot_core.apps.core import TelliotCore
+from telliot_core.contract.contract import PresignedTransactions
+from telliot_core.tellor.tellor360.oracle import Tellor360OracleContract
 
 
 @pytest.mark.asyncio
@@ -38,3 +40,95 @@ async def test_mixed_gas_inputs(sepolia_test_cfg):
                 legacy_gas_price=1,
                 max_fee_per_gas=2,
             )
+
+
+@pytest.mark.asyncio
+async def test_async_read_matches_sync_read(amoy_test_cfg, mock_flex_contract):
+    """Contract.read() should return the same values over the native
+    async path as over the blocking web3 fallback"""
+
+    async with TelliotCore(config=amoy_test_cfg) as core:
+        oracle = Tellor360OracleContract(core.endpoint, core.get_account())
+        oracle.address = mock_flex_contract.address
+        oracle.connect()
+        assert core.endpoint.async_enabled
+
+        async_result, status = await oracle.read("getStakeAmount")
+        assert status.ok
+        assert async_result == 42e18
+
+        core.endpoint.set_session(None)
+        sync_result, status = await oracle.read("getStakeAmount")
+        assert status.ok
+
+        assert async_result == sync_result
+
+
+@pytest.mark.asyncio
+async def test_function_table(sepolia_test_cfg):
+    """Contract functions are looked up from the table built by connect()"""
+    async with TelliotCore(config=sepolia_test_cfg) as core:
+        tellor360 = core.get_tellor360_contracts()
+        oracle = tellor360.oracle
+
+        func = oracle.get_function("getStakeAmount")
+        assert func is oracle.get_function("getStakeAmount")
+        assert func.fn_name == "getStakeAmount"
+
+        with pytest.raises(ValueError):
+            oracle.get_function("notAFunction")
+
+
+@pytest.mark.asyncio
+async def test_broadcast_unknown_gas_price(sepolia_test_cfg):
+    """Contract.broadcast() should refuse a gas price that was not presigned"""
+    async with TelliotCore(config=sepolia_test_cfg) as core:
+        tellor360 = core.get_tellor360_contracts()
+        presigned = PresignedTransactions(func_name="submitValue", nonce=0, transactions={}, reserved_nonce=False)
+
+        receipt_future, status = await tellor360.oracle.broadcast(presigned, 10)
+        assert receipt_future is None
+        assert not status.ok
+
+
+@pytest.mark.asyncio
+async def test_presign_and_broadcast(amoy_test_cfg, mock_flex_contract):
+    """A presigned transaction should be mined at the chosen gas price with the reserved nonce"""
+    async with TelliotCore(config=amoy_test_cfg) as core:
+        oracle = Tellor360OracleContract(core.endpoint, core.get_account())
+        oracle.address = mock_flex_contract.address
+        oracle.connect()
+
+        presigned, status = await oracle.presign("requestStakingWithdraw", gas_prices=[1, 2], _amount=0)
+        assert status.ok
+        assert set(presigned.transactions) == {1, 2}
+
+        receipt_future, status = await oracle.broadcast(presigned, 2)
+        assert status.ok
+
+        tx_receipt, status = await oracle.confirm("requestStakingWithdraw", receipt_future)
+        assert status.ok
+        assert tx_receipt["status"] == 1
+
+        tx = core.endpoint.web3.eth.get_transaction(tx_receipt["transactionHash"])
+        assert tx["nonce"] == presigned.nonce
+        assert tx["gasPrice"] == 2 * 10**9
+
+
+@pytest.mark.asyncio
+async def test_discard_releases_nonce(amoy_test_cfg, mock_flex_contract):
+    """Discarded presigned transactions should give their nonce back"""
+    async with TelliotCore(config=amoy_test_cfg) as core:
+        oracle = Tellor360OracleContract(core.endpoint, core.get_account())
+        oracle.address = mock_flex_contract.address
+        oracle.connect()
+
+        presigned, status = await oracle.presign("requestStakingWithdraw", gas_prices=[1], _amount=0)
+        assert status.ok
+        assert presigned.reserved_nonce
+        oracle.discard(presigned)
+
+        presigned_again, status = await oracle.presign("requestStakingWithdraw", gas_prices=[1], _amount=0)
+        assert status.ok
+        assert presigned_again.nonce == presigned.nonce
+        oracle.discard(presigned_again)
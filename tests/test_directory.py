@@ -1,9 +1,14 @@
+import json
 import time
 
 import pytest
+from aiohttp import web
 
+from telliot_core import directory
 from telliot_core.directory import contract_directory
+from telliot_core.directory import ContractDirectory
 from telliot_core.directory import ContractInfo
+from telliot_core.directory import read_cached_abi
 
 
 def test_contract_info():
@@ -33,13 +38,43 @@ def test_contract_directory():
     treasury = cd.find(address="0x2dB91443f2b562B8b2B2e8E4fC0A3EDD6c195147")[0]
     assert isinstance(treasury.get_abi(0), list)
 
-    tellorx = cd.find(name="tellorx")
+    tellorx = cd.find(name="tellorx", match="substring")
     assert len(tellorx) == 5
+    assert cd.find(name="tellorx", match="prefix") == tellorx
+    assert cd.find(name="tellorx") == []
+
+    assert cd.find(address="0x2dB91443f2b562B8b2B2e8E4fC0A3EDD6c195147".lower()) == [treasury]
+    assert cd.find(name="tellorx-master", chain_id=1) == [master]
 
     mainnet_contracts = cd.find(chain_id=1)
     assert isinstance(mainnet_contracts[0], ContractInfo)
 
 
+def test_directory_index_tracks_changes():
+    """Lookups see replaced entries and edited addresses"""
+    cd = ContractDirectory()
+    cd.add_entry(ContractInfo(name="a", org="tellor", address={1: "0xAAAA"}))
+    assert cd.find(address="0xaaaa")[0].name == "a"
+
+    cd.add_entry(ContractInfo(name="a", org="tellor", address={5: "0xBBBB"}), replace=True)
+    assert cd.find(address="0xaaaa") == []
+    assert cd.find(chain_id=5) == [cd.entries["a"]]
+    assert cd.find(name="a", chain_id=5) == [cd.entries["a"]]
+    assert cd.find(name="a", chain_id=1) == []
+
+    cd.entries["a"].set_address(5, "0xCCCC")
+    assert cd.find(address="0xbbbb") == []
+    assert cd.find(address="0xcccc") == [cd.entries["a"]]
+
+    cd.entries["a"].address = {10: "0xDDDD"}
+    assert cd.find(name="a", chain_id=10) == [cd.entries["a"]]
+
+    # Indexes are reused until something changes
+    indexed = cd._by_address
+    cd.find(address="0xdddd")
+    assert cd._by_address is indexed
+
+
 def test_directory_config_file():
     """Test the contract directory config file"""
     cd = contract_directory
@@ -68,3 +103,81 @@ def test_abis():
         abi = info.get_abi()
         assert isinstance(abi, list)
         assert len(abi) > 0
+
+
+EXPLORER_ABI = [{"type": "function", "name": "tellorReport", "inputs": [], "outputs": []}]
+
+
+def test_explorer_abi_cache(tmp_path, monkeypatch):
+    """Explorer ABIs are cached on disk and reused by later processes"""
+    monkeypatch.setattr(directory, "abi_cache_dir", lambda: tmp_path)
+    requested = []
+
+    class Response:
+        def __init__(self, body):
+            self.body = body
+
+        def json(self):
+            return self.body
+
+    def get(url, headers=None):
+        requested.append(url)
+        return Response(EXPLORER_ABI)
+
+    monkeypatch.setattr(directory.requests, "get", get)
+    address = "0x2dB91443f2b562B8b2B2e8E4fC0A3EDD6c195147"
+
+    info = ContractInfo(name="provider", org="tellor", address={1: address})
+    assert info.get_abi() == EXPLORER_ABI
+    assert len(requested) == 1
+
+    # A fresh ContractInfo (e.g. after a restart) reads the cache
+    info = ContractInfo(name="provider", org="tellor", address={1: address})
+    assert info.get_abi() == EXPLORER_ABI
+    assert len(requested) == 1
+
+    assert read_cached_abi(1, address.lower()) == EXPLORER_ABI
+    assert read_cached_abi(1, address, ttl=-1) is None
+
+    # An invalid explorer response falls back to the expired cache
+    ref_path = tmp_path / f"1-{address.lower()}.ref"
+    ref_path.write_text(json.dumps(dict(json.loads(ref_path.read_text()), fetched_at=0)))
+    monkeypatch.setattr(directory.requests, "get", lambda url, headers=None: Response("NOTOK"))
+    info = ContractInfo(name="provider", org="tellor", address={1: address})
+    assert info.get_abi() == EXPLORER_ABI
+
+
+@pytest.mark.asyncio
+async def test_prefetch_abis(tmp_path, monkeypatch):
+    monkeypatch.setattr(directory, "abi_cache_dir", lambda: tmp_path)
+    requests = []
+
+    async def handle(request):
+        requests.append(request.query["address"])
+        return web.json_response(EXPLORER_ABI)
+
+    app = web.Application()
+    app.router.add_get("/api", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+    monkeypatch.setitem(directory.EXPLORER_APIS, 1, url)
+
+    try:
+        cd = ContractDirectory()
+        cd.add_entry(ContractInfo(name="a", org="tellor", address={1: "0x" + "11" * 20, 999: "0x" + "22" * 20}))
+        cd.add_entry(ContractInfo(name="b", org="tellor", address={1: "0x" + "33" * 20}))
+        cd.add_entry(ContractInfo(name="c", org="tellor", address={1: "0x" + "44" * 20}, abi_file="x.json"))
+
+        assert await cd.prefetch_abis() == 2
+        assert sorted(requests) == ["0x" + "11" * 20, "0x" + "33" * 20]
+        assert cd.entries["a"].get_abi() == EXPLORER_ABI
+        assert read_cached_abi(1, "0x" + "33" * 20) == EXPLORER_ABI
+
+        # Everything is cached now
+        assert await cd.prefetch_abis() == 0
+        assert len(requests) == 2
+    finally:
+        await runner.cleanup()
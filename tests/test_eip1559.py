@@ -0,0 +1,71 @@
+"""
+Tests covering EIP-1559 fee estimation from eth_feeHistory
+"""
+import pytest
+
+from telliot_core.gas import eip1559
+from telliot_core.gas.eip1559 import FeeHistoryEstimator
+from telliot_core.gas.eip1559 import predict_next_base_fee
+from telliot_core.model.endpoints import RPCEndpoint
+
+GWEI = 10**9
+
+
+def test_predict_next_base_fee():
+    """Base fee moves by at most 1/8 towards the gas target"""
+    assert predict_next_base_fee(100 * GWEI, 15_000_000, 30_000_000) == 100 * GWEI
+    assert predict_next_base_fee(100 * GWEI, 30_000_000, 30_000_000) == 112_500_000_000
+    assert predict_next_base_fee(100 * GWEI, 0, 30_000_000) == 87_500_000_000
+
+
+@pytest.fixture
+def fee_history(monkeypatch):
+    """Fake eth_feeHistory with a constant base fee and rewards of 1/2/3 gwei"""
+    calls = []
+
+    async def node_request(node, method, params, timeout=10.0):
+        calls.append(params)
+        count = int(params[0], 16)
+        newest = 100 if params[1] == "latest" else int(params[1], 16)
+        return {
+            "oldestBlock": hex(newest - count + 1),
+            "baseFeePerGas": [hex(10 * GWEI)] * (count + 1),
+            "gasUsedRatio": [0.5] * count,
+            "reward": [[hex(1 * GWEI), hex(2 * GWEI), hex(3 * GWEI)]] * count,
+        }
+
+    monkeypatch.setattr(eip1559, "node_request", node_request)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_fee_estimates(fee_history):
+    estimator = FeeHistoryEstimator(RPCEndpoint(chain_id=1, url="http://fake"), window=4)
+    assert estimator.fees() is None
+
+    await estimator.sync()
+    assert estimator.latest_block == 100
+    assert estimator.next_base_fee == 10 * GWEI
+
+    slow, standard, fast = (estimator.fees(s) for s in ("slow", "standard", "fast"))
+    assert [f.max_priority_fee_per_gas for f in (slow, standard, fast)] == [1, 2, 3]
+    assert slow.max_fee_per_gas == pytest.approx(10 * 1.125 + 1)
+    assert slow.max_fee_per_gas < standard.max_fee_per_gas < fast.max_fee_per_gas
+
+
+@pytest.mark.asyncio
+async def test_new_heads_update_incrementally(fee_history):
+    estimator = FeeHistoryEstimator(RPCEndpoint(chain_id=1, url="http://fake"), window=4)
+    await estimator.sync()
+
+    head = {"number": 102, "baseFeePerGas": 10 * GWEI, "gasUsed": 30_000_000, "gasLimit": 30_000_000}
+    await estimator.on_new_block(head)
+
+    # Only the two new blocks are requested
+    assert fee_history[-1][:2] == [hex(2), hex(102)]
+    assert estimator.latest_block == 102
+    assert [b.number for b in estimator._blocks] == [99, 100, 101, 102]
+
+    # Old heads are ignored
+    await estimator.on_new_block({"number": 101})
+    assert len(fee_history) == 2
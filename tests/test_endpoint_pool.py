@@ -0,0 +1,139 @@
+"""
+Tests covering latency-aware routing and failover in EndpointPool
+"""
+import asyncio
+
+import pytest
+
+from telliot_core.apps.core import TelliotCore
+from telliot_core.apps.endpoint_pool import EndpointPool
+from telliot_core.apps.endpoint_pool import is_poolable
+from telliot_core.apps.telliot_config import TelliotConfig
+from telliot_core.model.endpoints import RPCEndpoint
+
+
+def fake_endpoint(url, delay=0.0, fail=False):
+    """RPCEndpoint whose requests are answered locally"""
+    ep = RPCEndpoint(chain_id=80002, url=url)
+
+    async def request(method, params):
+        await asyncio.sleep(delay)
+        if fail:
+            raise ConnectionError(f"{url} is down")
+        return url
+
+    ep.request = request
+    return ep
+
+
+@pytest.mark.asyncio
+async def test_routes_to_fastest_endpoint():
+    """Requests are routed to the endpoint with the lowest latency"""
+    slow = fake_endpoint("http://slow", delay=0.05)
+    fast = fake_endpoint("http://fast", delay=0.0)
+    pool = EndpointPool([slow, fast])
+
+    # The first request goes to the first endpoint while the other is probed
+    assert await pool.request("eth_blockNumber", []) == "http://slow"
+    assert await pool.request("eth_blockNumber", []) == "http://fast"
+
+    assert pool.best is fast
+    assert await pool.request("eth_blockNumber", []) == "http://fast"
+
+
+@pytest.mark.asyncio
+async def test_unmeasured_endpoints_rank_last():
+    """Unmeasured endpoints are probed instead of taking live requests"""
+    fast = fake_endpoint("http://fast", delay=0.0)
+    stalled = fake_endpoint("http://stalled", delay=5.0)
+    new = fake_endpoint("http://new", delay=0.01)
+    pool = EndpointPool([stalled, new, fast])
+    pool.stats["http://fast"].record_success(0.01, pool.alpha)
+
+    assert pool.ranked() == [fast, stalled, new]
+    assert await asyncio.wait_for(pool.request("eth_blockNumber", []), timeout=1) == "http://fast"
+
+    await asyncio.sleep(0.05)
+    assert pool.stats["http://new"].latency is not None
+    assert pool.stats["http://stalled"].latency is None
+    assert pool.ranked() == [fast, new, stalled]
+
+    pool.set_session(None)  # cancels the stalled probe
+    await asyncio.sleep(0.01)
+
+
+def test_pool_skips_non_http_endpoints():
+    """Websocket URLs and URLs with placeholders are left out of the pool"""
+    http = RPCEndpoint(chain_id=1, url="https://mainnet.example.org")
+    wss = RPCEndpoint(chain_id=1, url="wss://mainnet.infura.io/ws/v3/abc")
+    placeholder = RPCEndpoint(chain_id=1, url="https://mainnet.infura.io/v3/{INFURA_API_KEY}")
+
+    assert is_poolable(http)
+    assert not is_poolable(wss)
+    assert not is_poolable(placeholder)
+    assert EndpointPool([wss, http, placeholder]).endpoints == [http]
+
+    with pytest.raises(ValueError):
+        EndpointPool([wss, placeholder])
+
+
+@pytest.mark.asyncio
+async def test_failover():
+    """Failed requests are retried on the next endpoint"""
+    down = fake_endpoint("http://down", fail=True)
+    up = fake_endpoint("http://up")
+    pool = EndpointPool([down, up], max_error_rate=0.1)
+
+    assert await pool.request("eth_blockNumber", []) == "http://up"
+    assert pool.stats["http://down"].errors == 1
+    assert not pool.is_healthy(down)
+    assert pool.best is up
+
+    with pytest.raises(ConnectionError):
+        await EndpointPool([down]).request("eth_blockNumber", [])
+
+
+@pytest.mark.asyncio
+async def test_hedged_request():
+    """Slow requests are hedged to the next endpoint"""
+    stalled = fake_endpoint("http://stalled", delay=5.0)
+    backup = fake_endpoint("http://backup", delay=0.0)
+    pool = EndpointPool([stalled, backup], hedge_after=0.01)
+
+    assert await asyncio.wait_for(pool.request("eth_blockNumber", []), timeout=1) == "http://backup"
+
+
+def test_pool_requires_single_chain():
+    """All endpoints in a pool must be on one chain"""
+    with pytest.raises(ValueError):
+        EndpointPool([RPCEndpoint(chain_id=1, url="http://a"), RPCEndpoint(chain_id=2, url="http://b")])
+
+
+@pytest.mark.asyncio
+async def test_race():
+    """Racing returns the first answer and records the winner"""
+    slow = fake_endpoint("http://slow", delay=5.0)
+    fast = fake_endpoint("http://fast", delay=0.01)
+    down = fake_endpoint("http://down", fail=True)
+    pool = EndpointPool([slow, down, fast])
+
+    result, winner = await asyncio.wait_for(pool.race("eth_call", [], num_endpoints=3), timeout=1)
+    assert result == "http://fast"
+    assert winner is fast
+    assert pool.stats["http://fast"].wins == 1
+    assert pool.stats["http://down"].errors == 1
+
+
+def test_core_endpoint_pool_is_opt_in(tmp_path):
+    """Core contracts use the pool only if enabled, and the core endpoint stays the configured one"""
+    cfg = TelliotConfig(config_dir=tmp_path)
+    cfg.main.chain_id = 137
+    core = TelliotCore(homedir=tmp_path, config=cfg)
+    configured = cfg.endpoints.find(chain_id=137)[0]
+
+    assert core.endpoint_pool is None
+    assert core.get_endpoint() is configured
+
+    cfg.main.endpoint_pool = True
+    assert isinstance(core.endpoint_pool, EndpointPool)
+    assert core.get_endpoint() is configured
@@ -0,0 +1,35 @@
+"""
+Test covering the gas limit estimator
+"""
+from telliot_core.gas.gas_limit import gas_limit_key
+from telliot_core.gas.gas_limit import GasLimitEstimator
+
+
+def test_gas_limit_learned_from_receipts():
+    """Gas limit should be the largest recent gasUsed plus the margin"""
+    estimator = GasLimitEstimator(margin=0.1, window=2)
+    key = gas_limit_key(1, "0xABC", "submitValue", {"_queryId": b"\x01" * 32})
+
+    assert estimator.get(key) is None
+
+    estimator.record(key, 100000)
+    estimator.record(key, 90000)
+    assert estimator.get(key) == 110000
+
+    # Oldest value falls out of the window
+    estimator.record(key, 80000)
+    assert estimator.get(key) == 99000
+
+    # Reverts force a new estimate
+    estimator.invalidate(key)
+    assert estimator.get(key) is None
+
+
+def test_gas_limit_key():
+    """Keys should separate query ids and ignore address case"""
+    query_id = b"\x01" * 32
+    key = gas_limit_key(1, "0xABC", "submitValue", {"_queryId": query_id})
+
+    assert key == gas_limit_key(1, "0xabc", "submitValue", {"_queryId": "0x" + query_id.hex()})
+    assert key != gas_limit_key(1, "0xabc", "submitValue", {"_queryId": b"\x02" * 32})
+    assert gas_limit_key(1, "0xabc", "depositStake", {"_amount": 1})[3] is None
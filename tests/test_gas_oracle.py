@@ -0,0 +1,68 @@
+"""
+Tests covering the background-refreshed gas oracle
+"""
+import asyncio
+
+import pytest
+
+from telliot_core.gas.gas_oracle import GasOracle
+from telliot_core.model.endpoints import RPCEndpoint
+
+RESPONSES = {
+    "eth_gasPrice": hex(30 * 10**9),
+    "eth_feeHistory": {"baseFeePerGas": [hex(10 * 10**9)] * 6, "reward": [[hex(2 * 10**9)]] * 5},
+}
+
+
+def fake_oracle(responses=RESPONSES):
+    """GasOracle whose node requests are answered locally (chain without a gas station)"""
+    oracle = GasOracle(RPCEndpoint(chain_id=80002, url="http://fake"), ttl=0.01)
+    oracle.calls = 0
+
+    async def node_request(method, params):
+        oracle.calls += 1
+        if method not in responses:
+            raise ValueError("method not supported")
+        return responses[method]
+
+    oracle._node_request = node_request
+    return oracle
+
+
+@pytest.mark.asyncio
+async def test_gas_oracle_combines_sources():
+    oracle = fake_oracle()
+    assert oracle.prices.gas_price is None
+
+    prices = await oracle.get()
+    assert prices.sources == {"gas_station": None, "eth_gasPrice": 30.0, "eth_feeHistory": 12.0}
+    assert prices.gas_price == 30
+    assert prices.base_fee == 10.0
+    assert prices.priority_fee == 2.0
+    assert prices.max_fee == 22.0
+
+
+@pytest.mark.asyncio
+async def test_gas_oracle_without_fee_history():
+    oracle = fake_oracle({"eth_gasPrice": hex(5 * 10**8)})
+
+    prices = await oracle.refresh()
+    assert prices.gas_price == 1
+    assert prices.max_fee is None
+
+
+@pytest.mark.asyncio
+async def test_gas_oracle_background_refresh():
+    oracle = fake_oracle()
+
+    # Concurrent refreshes share one round of requests
+    await asyncio.gather(oracle.refresh(), oracle.refresh())
+    assert oracle.calls == 2
+
+    oracle.start()
+    await asyncio.sleep(0.05)
+    assert oracle.running
+    assert oracle.calls > 2
+
+    await oracle.stop()
+    assert not oracle.running
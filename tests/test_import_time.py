@@ -0,0 +1,68 @@
+"""
+Guard CLI startup time against eager imports of heavy modules
+"""
+import json
+import subprocess
+import sys
+
+HEAVY_MODULES = [
+    "web3",
+    "aiohttp",
+    "chained_accounts",
+    "telliot_core.apps.core",
+    "telliot_core.directory",
+    "telliot_core.asset_registry",
+]
+
+#: Seconds allowed for CLI startup
+IMPORT_BUDGET = 5.0
+
+
+def imported_after(statement: str) -> dict:
+    """Heavy modules loaded and seconds taken by a statement in a fresh interpreter"""
+    code = (
+        "import json, sys, time\n"
+        "t = time.perf_counter()\n"
+        f"{statement}\n"
+        "elapsed = time.perf_counter() - t\n"
+        f"print(json.dumps({{'modules': [m for m in {HEAVY_MODULES!r} if m in sys.modules], 'seconds': elapsed}}))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return json.loads(out.splitlines()[-1])
+
+
+def test_cli_import_time():
+    """Importing the CLI skips heavy modules and finishes within the budget"""
+    result = imported_after("import telliot_core.cli.main")
+    assert result["modules"] == []
+    # The budget only catches gross regressions; the module check above is the precise guard
+    assert result["seconds"] < IMPORT_BUDGET
+
+
+def test_config_show_imports(tmp_path):
+    """Loading and showing the configuration does not import web3, aiohttp or accounts"""
+    result = imported_after(
+        "import os\n"
+        f"os.environ['HOME'] = {str(tmp_path)!r}\n"
+        "from click.testing import CliRunner\n"
+        "from telliot_core.apps.telliot_config import TelliotConfig\n"
+        "from telliot_core.cli.main import main\n"
+        "assert TelliotConfig().get_endpoint() is not None\n"
+        "result = CliRunner().invoke(main, ['config', 'show'])\n"
+        "assert result.exit_code == 0 and 'endpoints' in result.output, result.output"
+    )
+    assert result["modules"] == []
+    assert result["seconds"] < IMPORT_BUDGET
+
+
+def test_lazy_registries():
+    """Directory and asset registry files are only parsed on first access"""
+    result = imported_after(
+        "import telliot_core.asset_registry as a\n"
+        "import telliot_core.directory as d\n"
+        "assert a._asset_registry is None and d._contract_directory is None\n"
+        "from telliot_core.directory import contract_directory\n"
+        "from telliot_core.asset_registry import asset_registry\n"
+        "assert contract_directory is d.get_contract_directory() and asset_registry.get('btc')"
+    )
+    assert "telliot_core.directory" in result["modules"]
@@ -0,0 +1,112 @@
+"""
+Tests covering the Tellor360 event indexer
+"""
+import pytest
+from eth_abi import encode_abi
+from eth_utils import event_abi_to_log_topic
+
+from telliot_core.contract import log_fetcher
+from telliot_core.directory import contract_directory
+from telliot_core.model.endpoints import RPCEndpoint
+from telliot_core.tellor.tellor360 import indexer
+from telliot_core.tellor.tellor360.indexer import EventIndexer
+
+ORACLE = "0x" + "aa" * 20
+QUERY_ID = b"\x01" * 32
+REPORTER = "0x" + "bb" * 20
+
+
+def new_report_log(block_number, timestamp, value):
+    """Raw NewReport log as returned by eth_getLogs"""
+    abi = next(e for e in contract_directory.entries["tellor360-oracle"].get_abi() if e.get("name") == "NewReport")
+    topics = [
+        event_abi_to_log_topic(abi),
+        QUERY_ID,
+        timestamp.to_bytes(32, "big"),
+        bytes(12) + bytes.fromhex(REPORTER[2:]),
+    ]
+    return {
+        "address": ORACLE,
+        "topics": ["0x" + t.hex() for t in topics],
+        "data": "0x" + encode_abi(["bytes", "uint256", "bytes"], [value, 0, b"query"]).hex(),
+        "blockNumber": hex(block_number),
+        "blockHash": "0x" + "00" * 32,
+        "transactionHash": "0x" + block_number.to_bytes(32, "big").hex(),
+        "transactionIndex": "0x0",
+        "logIndex": "0x0",
+        "removed": False,
+    }
+
+
+@pytest.fixture
+def fake_chain(monkeypatch):
+    """Fake node with one NewReport log every 10 blocks up to block 100"""
+    requests = []
+
+    async def node_request(node, method, params, timeout=10.0):
+        requests.append((method, params))
+        if method == "eth_blockNumber":
+            return hex(100)
+        start, end = int(params[0]["fromBlock"], 16), int(params[0]["toBlock"], 16)
+        return [new_report_log(b, 1000 + b, bytes([b])) for b in range(start, end + 1) if b % 10 == 0]
+
+    monkeypatch.setattr(indexer, "node_request", node_request)
+    monkeypatch.setattr(log_fetcher, "node_request", node_request)
+    return requests
+
+
+@pytest.mark.asyncio
+async def test_index_and_resume(fake_chain, tmp_path):
+    db_path = tmp_path / "events.sqlite"
+    node = RPCEndpoint(chain_id=80001, url="http://fake")
+
+    idx = EventIndexer(node, db_path=db_path, start_block=1, chunk_size=25, addresses={"tellor360-oracle": ORACLE})
+    assert await idx.sync(to_block=50) == 5
+    assert idx.last_block == 50
+    assert [m for m, _ in fake_chain] == ["eth_getLogs"] * 2
+    idx.close()
+
+    # A new indexer resumes after the last processed block
+    idx = EventIndexer(node, db_path=db_path, start_block=1, chunk_size=25, addresses={"tellor360-oracle": ORACLE})
+    assert await idx.sync() == 5
+    assert int(fake_chain[-1][1][0]["fromBlock"], 16) == 76
+
+    reports = idx.reports(query_id=QUERY_ID)
+    assert [r["timestamp"] for r in reports] == [1000 + b for b in range(10, 101, 10)]
+    assert reports[0]["value"] == bytes([10])
+    assert reports[0]["reporter"].lower() == REPORTER
+
+    # Reporter filters ignore address case
+    assert len(idx.reports(reporter=reports[0]["reporter"], since=1050, until=1070)) == 3
+    assert len(idx.reports(reporter=REPORTER.upper().replace("0X", "0x"), since=1050, until=1070)) == 3
+    assert idx.reports(query_id=b"\x02" * 32) == []
+    assert idx.tips() == []
+    idx.close()
+
+
+@pytest.mark.asyncio
+async def test_sync_state_per_contract_set(fake_chain, tmp_path):
+    """Indexers of different contracts keep separate sync progress"""
+    db_path = tmp_path / "events.sqlite"
+    node = RPCEndpoint(chain_id=80001, url="http://fake")
+
+    idx = EventIndexer(node, db_path=db_path, start_block=1, chunk_size=25, addresses={"tellor360-oracle": ORACLE})
+    await idx.sync(to_block=50)
+    idx.close()
+
+    other = "0x" + "cc" * 20
+    idx = EventIndexer(node, db_path=db_path, start_block=1, chunk_size=25, addresses={"tellor360-oracle": other})
+    assert idx.last_block is None
+    idx.close()
+
+
+@pytest.mark.asyncio
+async def test_sync_without_contracts(fake_chain, tmp_path):
+    """An indexer without contracts sends no unfiltered eth_getLogs"""
+    node = RPCEndpoint(chain_id=80001, url="http://fake")
+
+    idx = EventIndexer(node, db_path=tmp_path / "events.sqlite", addresses={})
+    assert idx.addresses == []
+    assert await idx.sync() == 0
+    assert fake_chain == []
+    idx.close()
@@ -1,10 +1,28 @@
 import asyncio
+import contextlib
+import copy
+import json
 import logging
+import pickle
 
+import aiohttp
 import pytest
+from aiohttp import web
+from eth_abi import encode_abi
+from eth_utils import event_abi_to_log_topic
+from web3._utils.method_formatters import block_formatter
+from web3._utils.method_formatters import BLOCK_FORMATTERS
 
 from telliot_core.apps.core import TelliotCore
+from telliot_core.apps.telliot_config import TelliotConfig
+from telliot_core.contract import listener as listener_module
 from telliot_core.contract.listener import block_logger
+from telliot_core.contract.listener import Dispatcher
+from telliot_core.contract.listener import lazy_formatter
+from telliot_core.contract.listener import LazyFormattedDict
+from telliot_core.contract.listener import Listener
+from telliot_core.contract.listener import PollingListener
+from telliot_core.model.endpoints import RPCEndpoint
 
 
 async def block_printer(msg) -> None:
@@ -25,3 +43,399 @@ async def test_subscribe_new_blocks(caplog, amoy_test_cfg):
         await asyncio.sleep(1)  # Note delay needed
 
     print(caplog.text)
+
+
+class FakeWebsocketNode:
+    """Websocket JSON-RPC node producing one block (with one log) at a time"""
+
+    def __init__(self):
+        self.head = 10
+        self.sockets = []
+        self.subscriptions = []
+        self.subscribe_params = []
+        self.reject_logs = False
+
+    @staticmethod
+    def block(number):
+        return {"number": hex(number), "hash": "0x" + number.to_bytes(32, "big").hex()}
+
+    @staticmethod
+    def log(number):
+        return {
+            "address": "0x" + "aa" * 20,
+            "topics": [],
+            "data": "0x",
+            "blockNumber": hex(number),
+            "blockHash": "0x" + number.to_bytes(32, "big").hex(),
+            "transactionHash": "0x" + "00" * 32,
+            "transactionIndex": "0x0",
+            "logIndex": "0x0",
+            "removed": False,
+        }
+
+    async def handle(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.sockets.append(ws)
+
+        async for msg in ws:
+            req = json.loads(msg.data)
+            method, params = req["method"], req["params"]
+            if method == "eth_subscribe":
+                result = hex(len(self.subscriptions) + 1)
+                self.subscriptions.append((ws, result, params[0]))
+                self.subscribe_params.append(params)
+            elif method == "eth_blockNumber":
+                result = hex(self.head)
+            elif method == "eth_getBlockByNumber":
+                result = self.block(int(params[0], 16))
+            elif method == "eth_getLogs" and self.reject_logs:
+                error = {"code": -32005, "message": "query returned more than 10000 results"}
+                await ws.send_json({"jsonrpc": "2.0", "id": req["id"], "error": error})
+                continue
+            elif method == "eth_getLogs":
+                start, end = int(params[0]["fromBlock"], 16), int(params[0]["toBlock"], 16)
+                result = [self.log(n) for n in range(start, end + 1)]
+            await ws.send_json({"jsonrpc": "2.0", "id": req["id"], "result": result})
+        return ws
+
+    async def new_block(self):
+        self.head += 1
+        for ws, sub_id, name in self.subscriptions:
+            if not ws.closed:
+                result = self.block(self.head) if name == "newHeads" else self.log(self.head)
+                await ws.send_json({"method": "eth_subscription", "params": {"subscription": sub_id, "result": result}})
+
+    async def drop_connections(self):
+        for ws in self.sockets:
+            await ws.close()
+
+
+@contextlib.asynccontextmanager
+async def fake_ws_node():
+    """Serve a FakeWebsocketNode on a free local port"""
+    node = FakeWebsocketNode()
+    app = web.Application()
+    app.router.add_get("/", node.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    node.url = f"ws://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/"
+    try:
+        yield node
+    finally:
+        await runner.cleanup()
+
+
+async def wait_for(condition, timeout=2.0):
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise TimeoutError
+
+
+@pytest.mark.asyncio
+async def test_multiplexed_reconnect_and_backfill():
+    """Subscriptions share one websocket and survive a dropped connection"""
+    blocks, logs = [], []
+
+    async def on_block(block):
+        blocks.append(block["number"])
+
+    async def on_log(log):
+        logs.append(log["blockNumber"])
+
+    async with fake_ws_node() as ws_node, aiohttp.ClientSession() as session:
+        listener = Listener(session=session, ws_url=ws_node.url, reconnect_delay=0.01)
+        await listener.subscribe_new_blocks(handler=on_block)
+        await listener.subscribe_contract_events(handler=on_log, address="0x" + "aa" * 20)
+        await wait_for(lambda: len(ws_node.subscriptions) == 2)
+        assert len(ws_node.sockets) == 1
+
+        await ws_node.new_block()
+        await wait_for(lambda: blocks == [11] and logs == [11])
+
+        # Blocks produced while disconnected are backfilled after resubscribing
+        await ws_node.drop_connections()
+        ws_node.head += 3
+        await wait_for(lambda: len(ws_node.subscriptions) == 4)
+        await ws_node.new_block()
+
+        await wait_for(lambda: len(blocks) == 5 and len(logs) == 5)
+        assert sorted(blocks) == [11, 12, 13, 14, 15]
+        assert sorted(logs) == [11, 12, 13, 14, 15]
+        assert len(ws_node.sockets) == 2
+        assert listener.reconnects == 1
+
+        await listener.shutdown()
+        assert not listener.connected
+
+
+@pytest.mark.asyncio
+async def test_failed_backfill_keeps_connection():
+    """A rejected eth_getLogs backfill is skipped instead of forcing reconnects"""
+    blocks, logs = [], []
+
+    async def on_block(block):
+        blocks.append(block["number"])
+
+    async def on_log(log):
+        logs.append(log["blockNumber"])
+
+    async with fake_ws_node() as ws_node, aiohttp.ClientSession() as session:
+        listener = Listener(session=session, ws_url=ws_node.url, reconnect_delay=0.01)
+        await listener.subscribe_new_blocks(handler=on_block)
+        await listener.subscribe_contract_events(handler=on_log, address="0x" + "aa" * 20)
+        await wait_for(lambda: len(ws_node.subscriptions) == 2)
+        await ws_node.new_block()
+        await wait_for(lambda: blocks == [11] and logs == [11])
+
+        ws_node.reject_logs = True
+        await ws_node.drop_connections()
+        ws_node.head += 3
+        await wait_for(lambda: len(blocks) == 4)
+        await ws_node.new_block()
+        await wait_for(lambda: logs == [11, 15])
+
+        assert sorted(blocks) == [11, 12, 13, 14, 15]
+        assert listener.reconnects == 1
+        assert len(ws_node.sockets) == 2
+
+        await listener.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_core_listener_uses_ws_url(tmp_path):
+    """Core subscribes over a websocket only if the endpoint has a ws_url"""
+    core = TelliotCore(homedir=tmp_path, config=TelliotConfig(config_dir=tmp_path))
+    core._endpoint = RPCEndpoint(chain_id=80002, url="http://127.0.0.1:8545")
+    assert type(core.listener) is PollingListener
+
+    await core._session_manager.open()
+    try:
+        core._listener = None
+        core._endpoint = RPCEndpoint(chain_id=80002, url="http://127.0.0.1:8545", ws_url="ws://127.0.0.1:8546")
+        assert type(core.listener) is Listener
+        assert core.listener._url == "ws://127.0.0.1:8546"
+    finally:
+        await core._session_manager.close()
+
+
+@pytest.mark.asyncio
+async def test_backfill_requests_are_bounded():
+    """Backfilled blocks are fetched with a bounded number of requests in flight"""
+    listener = Listener(session=None, ws_url="ws://unused", max_backfill_requests=3)
+    in_flight, peak = 0, 0
+
+    async def request(method, params, request_id=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        return {"number": params[0]}
+
+    listener._request = request
+    blocks = await listener._get_blocks(range(20))
+
+    assert [b["number"] for b in blocks] == [hex(n) for n in range(20)]
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_policies():
+    release = asyncio.Event()
+    handled = []
+
+    async def handler(msg):
+        await release.wait()
+        handled.append(msg)
+
+    for policy, expected in (("drop", [0, 1, 2]), ("coalesce", [0, 3, 4])):
+        release.clear()
+        handled.clear()
+        dispatcher = Dispatcher(handler, lambda x: x, max_queue=2, workers=1, policy=policy)
+
+        for i in range(5):
+            await dispatcher.put(i)
+            await asyncio.sleep(0)
+
+        # One message is being handled, two are queued
+        assert dispatcher.depth == 2
+        assert dispatcher.dropped == 2
+
+        release.set()
+        await wait_for(lambda: dispatcher.processed == 3)
+        assert handled == expected
+        await dispatcher.stop()
+
+    # Block policy waits for room instead of dropping
+    release.clear()
+    handled.clear()
+    dispatcher = Dispatcher(handler, lambda x: x, max_queue=1, workers=1, policy="block")
+    await dispatcher.put(0)
+    await asyncio.sleep(0)
+    await dispatcher.put(1)
+    blocked = asyncio.create_task(dispatcher.put(2))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+
+    release.set()
+    await blocked
+    await wait_for(lambda: dispatcher.processed == 3)
+    assert handled == [0, 1, 2]
+    assert dispatcher.dropped == 0
+    await dispatcher.stop()
+
+
+def test_lazy_formatted_block():
+    raw = {
+        "number": "0x1b4",
+        "hash": "0x" + "ab" * 32,
+        "gasUsed": "0x5208",
+        "miner": "0x" + "11" * 20,
+        "transactions": ["0x" + "cd" * 32],
+    }
+    calls = []
+
+    def counting(key):
+        def formatter(value):
+            calls.append(key)
+            return BLOCK_FORMATTERS[key](value)
+
+        return formatter
+
+    block = lazy_formatter({key: counting(key) for key in BLOCK_FORMATTERS})(raw)
+    assert isinstance(block, LazyFormattedDict)
+
+    assert block["number"] == 436
+    assert block.number == 436
+    assert calls == ["number"]
+
+    # Formatted like web3 once every field is read
+    assert dict(block) == block_formatter(raw)
+    assert sorted(calls) == sorted(raw)
+    assert block.raw is raw
+
+    with pytest.raises(AttributeError):
+        block.baseFeePerGas
+
+
+def test_lazy_formatted_dict_copy_and_pickle():
+    """Special attribute lookups do not recurse into the fields"""
+    block = lazy_formatter(BLOCK_FORMATTERS)({"number": "0x1b4"})
+    assert not hasattr(block, "__deepcopy__")
+
+    block_copy = copy.copy(block)
+    assert block_copy["number"] == 436
+    assert copy.deepcopy(block)["number"] == 436
+
+    plain = pickle.loads(pickle.dumps(LazyFormattedDict({"number": "0x1b4"}, {})))
+    assert plain["number"] == "0x1b4"
+
+
+TRANSFER_ABI = {
+    "anonymous": False,
+    "inputs": [
+        {"indexed": True, "name": "from", "type": "address"},
+        {"indexed": True, "name": "to", "type": "address"},
+        {"indexed": False, "name": "value", "type": "uint256"},
+    ],
+    "name": "Transfer",
+    "type": "event",
+}
+APPROVAL_ABI = dict(TRANSFER_ABI, name="Approval")
+
+
+@pytest.mark.asyncio
+async def test_subscribe_contract_events_by_name():
+    events = []
+
+    async def handler(event):
+        events.append(event)
+
+    async with fake_ws_node() as node, aiohttp.ClientSession() as session:
+        listener = Listener(session=session, ws_url=node.url)
+        address = "0x" + "aa" * 20
+        topic = "0x" + event_abi_to_log_topic(TRANSFER_ABI).hex()
+
+        with pytest.raises(ValueError):
+            await listener.subscribe_contract_events(handler, address, events=["Transfer"])
+        with pytest.raises(ValueError):
+            await listener.subscribe_contract_events(handler, address, events=["Mint"], abi=[TRANSFER_ABI])
+
+        abi = [TRANSFER_ABI, APPROVAL_ABI]
+        await listener.subscribe_contract_events(handler, address, events=["Transfer"], abi=abi)
+        await wait_for(lambda: node.subscriptions)
+        assert node.subscribe_params[0] == ["logs", {"address": address, "topics": [[topic]]}]
+
+        ws, sub_id, _ = node.subscriptions[0]
+        log = dict(
+            node.log(11),
+            topics=[topic, "0x" + "00" * 12 + "11" * 20, "0x" + "00" * 12 + "22" * 20],
+            data="0x" + encode_abi(["uint256"], [5]).hex(),
+        )
+        await ws.send_json({"method": "eth_subscription", "params": {"subscription": sub_id, "result": log}})
+        await wait_for(lambda: events)
+
+        assert events[0].event == "Transfer"
+        assert events[0].args.value == 5
+        assert events[0].args["from"] == "0x" + "11" * 20
+        assert events[0].blockNumber == 11
+
+        await listener.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_polling_listener(monkeypatch):
+    chain = FakeWebsocketNode()
+    requests = []
+
+    async def node_request(node, method, params, timeout=10.0):
+        requests.append(method)
+        if method == "eth_blockNumber":
+            return hex(chain.head)
+        if method == "eth_getBlockByNumber":
+            return chain.block(int(params[0], 16))
+        start, end = int(params[0]["fromBlock"], 16), int(params[0]["toBlock"], 16)
+        return [chain.log(n) for n in range(start, end + 1)]
+
+    monkeypatch.setattr(listener_module, "node_request", node_request)
+
+    blocks, logs = [], []
+
+    async def on_block(block):
+        blocks.append(block["number"])
+
+    async def on_log(log):
+        logs.append(log["blockNumber"])
+
+    listener = PollingListener(RPCEndpoint(chain_id=1, url="http://fake"), poll_interval=60)
+    await listener.subscribe_new_blocks(on_block)
+    await listener.subscribe_contract_events(on_log, address=chain.log(0)["address"])
+    await listener.subscribe_contract_events(on_log, address=chain.log(0)["address"])
+    with pytest.raises(ValueError):
+        await listener.subscribe_syncing(on_block)
+
+    # The first poll only finds the current head
+    await wait_for(lambda: listener.polls == 1)
+    assert listener.connected
+    assert blocks == [] and logs == []
+
+    chain.head += 3
+    requests.clear()
+    assert await listener._poll() == 3
+    await wait_for(lambda: len(logs) == 6)
+
+    assert sorted(blocks) == [11, 12, 13]
+    assert sorted(logs) == [11, 11, 12, 12, 13, 13]
+    # One request per block and a single eth_getLogs shared by both log subscriptions
+    assert requests.count("eth_getBlockByNumber") == 3
+    assert requests.count("eth_getLogs") == 1
+
+    # Nothing new
+    assert await listener._poll() == 0
+    await listener.shutdown()
+    assert not listener.connected
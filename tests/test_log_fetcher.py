@@ -0,0 +1,80 @@
+"""
+Tests covering adaptive eth_getLogs range splitting
+"""
+import asyncio
+
+import pytest
+
+from telliot_core.contract import log_fetcher
+from telliot_core.contract.log_fetcher import is_range_error
+from telliot_core.contract.log_fetcher import LogFetcher
+from telliot_core.model.endpoints import RPCEndpoint
+
+
+def fake_log(block_number):
+    return {
+        "address": "0x" + "aa" * 20,
+        "topics": [],
+        "data": "0x",
+        "blockNumber": hex(block_number),
+        "blockHash": "0x" + "00" * 32,
+        "transactionHash": "0x" + "00" * 32,
+        "transactionIndex": "0x0",
+        "logIndex": "0x0",
+        "removed": False,
+    }
+
+
+@pytest.fixture
+def fake_provider(monkeypatch):
+    """Provider returning one log per block and rejecting ranges over 100 blocks"""
+    requests = []
+
+    async def node_request(node, method, params, timeout=10.0):
+        start, end = int(params[0]["fromBlock"], 16), int(params[0]["toBlock"], 16)
+        requests.append((start, end))
+        await asyncio.sleep(0.001 * (end % 3))  # finish out of order
+        if end - start + 1 > 100:
+            raise ValueError({"code": -32005, "message": "query returned more than 10000 results"})
+        if start <= 6666 <= end:
+            raise ValueError({"code": -32000, "message": "internal error"})
+        return [fake_log(b) for b in range(start, end + 1)]
+
+    monkeypatch.setattr(log_fetcher, "node_request", node_request)
+    return requests
+
+
+def test_is_range_error():
+    assert is_range_error(ValueError({"message": "Log response size exceeded."}))
+    assert is_range_error(asyncio.TimeoutError())
+    assert not is_range_error(ValueError({"message": "execution reverted"}))
+
+
+@pytest.mark.asyncio
+async def test_logs_in_block_order(fake_provider):
+    fetcher = LogFetcher(RPCEndpoint(chain_id=1, url="http://fake"), span=400, max_concurrency=3)
+
+    blocks = [log["blockNumber"] async for log in fetcher.fetch(1, 2000)]
+    assert blocks == list(range(1, 2001))
+
+    # Oversized ranges were halved and the span settled below the provider limit
+    assert fetcher.splits > 0
+    assert fetcher.span <= 150
+    assert all(end - start < 100 for start, end in fake_provider[-5:])
+
+
+@pytest.mark.asyncio
+async def test_span_grows_after_success(fake_provider):
+    fetcher = LogFetcher(RPCEndpoint(chain_id=1, url="http://fake"), span=10, max_concurrency=1)
+
+    chunks = [chunk async for chunk in fetcher.chunks(1, 60)]
+    assert [(c.from_block, c.to_block) for c in chunks] == [(1, 10), (11, 25), (26, 47), (48, 60)]
+
+
+@pytest.mark.asyncio
+async def test_other_errors_are_raised(fake_provider):
+    fetcher = LogFetcher(RPCEndpoint(chain_id=1, url="http://fake"), span=10)
+
+    with pytest.raises(ValueError, match="internal error"):
+        async for _ in fetcher.fetch(6600, 6700):
+            pass
@@ -0,0 +1,208 @@
+"""
+Tests covering batched contract reads with Multicall3
+"""
+import pytest
+from eth_abi import decode_abi
+from eth_abi import encode_abi
+from hexbytes import HexBytes
+from web3 import Web3
+from web3._utils.abi import get_abi_output_types
+
+from telliot_core.apps.core import TelliotCore
+from telliot_core.contract.multicall import decode_revert_reason
+from telliot_core.contract.multicall import encode_aggregate3
+from telliot_core.contract.multicall import ERROR_STRING_SELECTOR
+from telliot_core.contract.multicall import Multicall
+from telliot_core.contract.multicall import MULTICALL3_ADDRESS
+from telliot_core.model.endpoints import RPCEndpoint
+from telliot_core.tellor.tellor360.oracle import Tellor360OracleContract
+
+REPORTER = "0x000000000000000000000000000000000000bEEF"
+
+
+class FakeOraclePool:
+    """Endpoint pool answering aggregate3 calls to a Tellor360 oracle"""
+
+    chain_id = 80002
+    async_enabled = True
+
+    def __init__(self, oracle):
+        self.oracle = oracle
+        self.batches = []
+
+    def answer(self, calldata):
+        function, kwargs = self.oracle.contract.decode_function_input(calldata)
+        if function.fn_name == "getTimestampbyQueryIdandIndex":
+            output = [1000 + kwargs["_index"]]
+        elif function.fn_name == "retrieveData":
+            output = [kwargs["_timestamp"].to_bytes(32, "big")]
+        else:
+            output = [REPORTER, kwargs["_timestamp"] % 2 == 1]
+        return encode_abi(get_abi_output_types(function.abi), output)
+
+    async def request(self, method, params):
+        assert method == "eth_call"
+        tx, _ = params
+        (calls,) = decode_abi(["(address,bool,bytes)[]"], HexBytes(tx["data"])[4:])
+        self.batches.append(len(calls))
+        results = [(True, self.answer(calldata)) for _, _, calldata in calls]
+        return encode_abi(["(bool,bytes)[]"], [results])
+
+
+class StubNode(RPCEndpoint):
+    """Endpoint answering eth_call with canned aggregate3 and individual responses"""
+
+    async_enabled = True
+
+    def __init__(self, aggregate3, single=None):
+        super().__init__(chain_id=80002, url="http://127.0.0.1:8545")
+        self._web3 = Web3()  # encoding only: every request goes to the stub
+        self.aggregate3 = aggregate3
+        self.single = single
+        self.calls = []
+
+    async def request(self, method, params):
+        assert method == "eth_call"
+        tx, _ = params
+        self.calls.append(tx["to"])
+        response = self.aggregate3 if tx["to"] == MULTICALL3_ADDRESS else self.single
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def stub_oracle(aggregate3, single=None):
+    node = StubNode(aggregate3, single)
+    oracle = Tellor360OracleContract(node)
+    oracle.connect()
+
+    mc = Multicall(node)
+    mc.add(oracle, "getStakeAmount")
+    mc.add(oracle, "notAFunction")
+    mc.add(oracle, "getReportingLock")
+    return oracle, mc
+
+
+@pytest.mark.asyncio
+async def test_multicall_decodes_aggregate3_results():
+    """aggregate3 results are decoded per read, including failed calls"""
+    reverted = ERROR_STRING_SELECTOR + encode_abi(["string"], ["no stake"])
+    canned = encode_abi(["(bool,bytes)[]"], [[(True, encode_abi(["uint256"], [42])), (False, reverted)]])
+    oracle, mc = stub_oracle(canned)
+
+    (stake, status), (_, missing), (lock, failed) = await mc.execute()
+    assert oracle.node.calls == [MULTICALL3_ADDRESS]
+    assert status.ok and stake == 42
+    assert not missing.ok and "not found" in missing.error
+    assert lock is None and not failed.ok
+    assert str(failed.e) == "execution reverted: no stake"
+
+
+@pytest.mark.asyncio
+async def test_multicall_fallback():
+    """Reads are sent individually only if Multicall3 is missing or rejected"""
+    single = encode_abi(["uint256"], [7])
+
+    # No code at the Multicall3 address: eth_call returns empty data
+    oracle, mc = stub_oracle(b"", single)
+    results = await mc.execute()
+    assert [r[0] for r in results] == [7, None, 7]
+    assert oracle.node.calls == [MULTICALL3_ADDRESS, oracle.address, oracle.address]
+
+    oracle, mc = stub_oracle(ValueError({"code": -32601, "message": "method not supported"}), single)
+    assert [r[0] for r in await mc.execute()] == [7, None, 7]
+
+    # A failed request is reported, not retried read by read
+    oracle, mc = stub_oracle(ConnectionError("node unreachable"))
+    results = await mc.execute()
+    assert oracle.node.calls == [MULTICALL3_ADDRESS]
+    assert [status.ok for _, status in results] == [False, False, False]
+    assert isinstance(results[0][1].e, ConnectionError)
+    assert "not found" in results[1][1].error
+
+
+def test_decode_revert_reason():
+    """Revert reasons should be decoded from Error(string) payloads"""
+    data = ERROR_STRING_SELECTOR + encode_abi(["string"], ["no tips"])
+    assert decode_revert_reason(data) == "execution reverted: no tips"
+    assert decode_revert_reason(b"") == "execution reverted"
+
+
+def test_encode_aggregate3():
+    """Hand-rolled aggregate3 encoding should match eth_abi"""
+    calls = [
+        ("0x" + "11" * 20, True, b"\x01" * 36),
+        ("0x" + "22" * 20, False, b"\x02" * 4),
+    ]
+    assert encode_aggregate3(calls) == encode_abi(["(address,bool,bytes)[]"], [calls])
+
+    calls.append(("0x" + "33" * 20, True, b""))
+    (decoded,) = decode_abi(["(address,bool,bytes)[]"], encode_aggregate3(calls))
+    assert list(decoded) == calls
+
+
+@pytest.mark.asyncio
+async def test_multicall_matches_individual_reads(amoy_test_cfg, mock_flex_contract):
+    """Batched reads should return the same results as Contract.read()
+
+    Multicall3 is not deployed on the local test chain, so this covers the
+    fallback to individual reads.  See test_multicall_decodes_aggregate3_results.
+    """
+    async with TelliotCore(config=amoy_test_cfg) as core:
+        oracle = Tellor360OracleContract(core.endpoint, core.get_account())
+        oracle.address = mock_flex_contract.address
+        oracle.connect()
+
+        mc = Multicall(core.endpoint)
+        mc.add(oracle, "getStakeAmount")
+        mc.add(oracle, "getReportingLock")
+        mc.add(oracle, "notAFunction")
+
+        results = await mc.execute()
+        assert len(results) == 3
+
+        stake, status = results[0]
+        assert status.ok
+        assert stake == 42e18
+
+        lock, status = results[1]
+        assert status.ok
+        assert lock == 60 * 60
+
+        _, status = results[2]
+        assert not status.ok
+
+
+@pytest.mark.asyncio
+async def test_report_history_without_reports(amoy_test_cfg, mock_flex_contract):
+    """Bulk history of a query id without reports should be empty"""
+    async with TelliotCore(config=amoy_test_cfg) as core:
+        oracle = Tellor360OracleContract(core.endpoint, core.get_account())
+        oracle.address = mock_flex_contract.address
+        oracle.connect()
+
+        history, status = await oracle.get_report_history(b"\x01" * 32)
+        assert status.ok
+        assert len(history) == 0
+        assert history.columns()["timestamp"] == []
+
+
+@pytest.mark.asyncio
+async def test_report_history_batches():
+    """Bulk history is read in Multicall batches routed through the endpoint pool"""
+    node = RPCEndpoint(chain_id=80002, url="http://127.0.0.1:8545")
+    node._web3 = Web3()  # encoding only: every request goes to the pool
+    oracle = Tellor360OracleContract(node)
+    oracle.connect()
+    oracle.pool = FakeOraclePool(oracle)
+
+    history, status = await oracle.get_report_history(b"\x01" * 32, start=2, end=9, batch_size=3)
+    assert status.ok
+    assert history.indexes == list(range(2, 9))
+    assert history.timestamps == list(range(1002, 1009))
+    assert history.values == [t.to_bytes(32, "big") for t in history.timestamps]
+    assert history.reporters == [REPORTER] * 7
+    assert history.disputed == [t % 2 == 1 for t in history.timestamps]
+
+    # 7 timestamp reads, then 14 value and detail reads
+    assert oracle.pool.batches == [3, 3, 1, 3, 3, 3, 3, 2]
@@ -0,0 +1,59 @@
+"""
+Tests covering local nonce allocation
+"""
+import asyncio
+
+import pytest
+
+from telliot_core.contract.nonce_manager import NonceManager
+from telliot_core.model.endpoints import RPCEndpoint
+
+ADDRESS = "0x0000000000000000000000000000000000000123"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reservations():
+    """Concurrent reservations get consecutive nonces from one sync"""
+    manager = NonceManager()
+    fetches = []
+
+    async def fetch_nonce(node, address):
+        fetches.append(address)
+        await asyncio.sleep(0.01)
+        return 7
+
+    manager._fetch_nonce = fetch_nonce
+    node = RPCEndpoint(chain_id=80002, url="http://127.0.0.1:8545")
+
+    nonces = await asyncio.gather(*[manager.reserve(node, ADDRESS) for _ in range(5)])
+    assert sorted(nonces) == [7, 8, 9, 10, 11]
+    assert len(fetches) == 1
+
+    # Addresses are case-insensitive, chains are separate
+    assert await manager.reserve(node, ADDRESS.upper().replace("0X", "0x")) == 12
+    other_chain = RPCEndpoint(chain_id=11155111, url="http://127.0.0.1:8545")
+    assert await manager.reserve(other_chain, ADDRESS) == 7
+
+    # Reset forces a re-sync
+    manager.reset(80002, ADDRESS)
+    assert await manager.reserve(node, ADDRESS) == 7
+    assert len(fetches) == 3
+
+
+def test_reservations_across_event_loops():
+    """The shared manager keeps working when each run uses a new event loop"""
+    manager = NonceManager()
+
+    async def fetch_nonce(node, address):
+        await asyncio.sleep(0.01)
+        return 3
+
+    manager._fetch_nonce = fetch_nonce
+    node = RPCEndpoint(chain_id=80002, url="http://127.0.0.1:8545")
+
+    async def reserve_many():
+        return sorted(await asyncio.gather(*[manager.reserve(node, ADDRESS) for _ in range(3)]))
+
+    assert asyncio.run(reserve_many()) == [3, 4, 5]
+    manager.reset(80002, ADDRESS)
+    assert asyncio.run(reserve_many()) == [3, 4, 5]
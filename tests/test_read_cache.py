@@ -0,0 +1,121 @@
+"""
+Tests covering the block-scoped contract read cache
+"""
+import pytest
+from eth_abi import encode_abi
+from web3 import Web3
+
+from telliot_core.contract.contract import Contract
+from telliot_core.contract.read_cache import ReadCache
+from telliot_core.model.endpoints import RPCEndpoint
+from telliot_core.utils.response import ResponseStatus
+
+ADDRESS = "0x0000000000000000000000000000000000000123"
+
+ABI = [
+    {
+        "inputs": [],
+        "name": "getStakeAmount",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    }
+]
+
+
+def test_block_scoped_reads():
+    """Reads are cached per block and invalidated by new blocks"""
+    cache = ReadCache()
+
+    # Nothing is cached until the block number is known
+    cache.set(ADDRESS, "getStakeAmount", (), {}, 42, cache.block_number)
+    assert cache.get(ADDRESS, "getStakeAmount", (), {}) == (False, None)
+
+    cache.new_block(100)
+    cache.set(ADDRESS, "getStakeAmount", (), {}, 42, cache.block_number)
+    assert cache.get(ADDRESS.upper().replace("0X", "0x"), "getStakeAmount", (), {}) == (True, 42)
+
+    # Same block number does not invalidate
+    cache.new_block(100)
+    assert cache.get(ADDRESS, "getStakeAmount", (), {}) == (True, 42)
+
+    cache.new_block(101)
+    assert cache.get(ADDRESS, "getStakeAmount", (), {}) == (False, None)
+
+
+def test_args_are_part_of_key():
+    """Reads with different arguments are cached separately"""
+    cache = ReadCache()
+    cache.new_block(1)
+
+    cache.set(ADDRESS, "getCurrentTip", (), {"_queryId": b"\x01"}, 1, 1)
+    cache.set(ADDRESS, "getCurrentTip", (), {"_queryId": b"\x02"}, 2, 1)
+
+    assert cache.get(ADDRESS, "getCurrentTip", (), {"_queryId": b"\x01"}) == (True, 1)
+    assert cache.get(ADDRESS, "getCurrentTip", (), {"_queryId": b"\x02"}) == (True, 2)
+    assert cache.hits == 2
+
+
+def test_read_spanning_new_block_is_not_cached():
+    """A read sent before a new block arrived is not stored for the new block"""
+    cache = ReadCache()
+    cache.new_block(100)
+
+    block_number = cache.block_number  # read sent...
+    cache.new_block(101)  # ...new block arrives while it is in flight
+    cache.set(ADDRESS, "getStakeAmount", (), {}, 42, block_number)
+
+    assert cache.get(ADDRESS, "getStakeAmount", (), {}) == (False, None)
+
+    # Immutable reads are stored regardless
+    cache.set(ADDRESS, "getTokenAddress", (), {}, "0xabc", block_number)
+    assert cache.get(ADDRESS, "getTokenAddress", (), {}) == (True, "0xabc")
+
+
+@pytest.mark.asyncio
+async def test_immutable_reads_survive_new_blocks():
+    """Immutable getters stay cached across blocks"""
+    cache = ReadCache()
+
+    cache.set(ADDRESS, "getTokenAddress", (), {}, "0xabc", None)
+    await cache.on_new_block({"number": 5})
+    await cache.on_new_block({"number": 6})
+
+    assert cache.block_number == 6
+    assert cache.get(ADDRESS, "getTokenAddress", (), {}) == (True, "0xabc")
+
+
+def test_only_addresses_are_case_insensitive():
+    """Hex arguments other than addresses keep their case in the key"""
+    cache = ReadCache()
+    cache.new_block(1)
+
+    cache.set(ADDRESS, "getDataBefore", ("0xAB",), {}, 1, 1)
+    assert cache.get(ADDRESS, "getDataBefore", ("0xab",), {}) == (False, None)
+
+    cache.set(ADDRESS, "balanceOf", (ADDRESS.upper().replace("0X", "0x"),), {}, 2, 1)
+    assert cache.get(ADDRESS, "balanceOf", (ADDRESS,), {}) == (True, 2)
+
+
+@pytest.mark.asyncio
+async def test_cached_reads_are_pinned_to_block():
+    """Reads through a cache are sent for the cached block rather than latest"""
+    requests = []
+
+    class Node(RPCEndpoint):
+        async_enabled = True
+
+        async def request(self, method, params):
+            requests.append(params[1])
+            return encode_abi(["uint256"], [42])
+
+    node = Node(chain_id=80002, url="http://127.0.0.1:8545")
+    node._web3 = Web3()  # encoding only: every request goes to the stub
+    contract = Contract(ADDRESS, ABI, node, cache=ReadCache())
+    contract.connect()
+
+    assert await contract.read("getStakeAmount") == (42, ResponseStatus(ok=True))
+    contract.cache.new_block(100)
+    assert await contract.read("getStakeAmount") == (42, ResponseStatus(ok=True))
+    assert await contract.read("getStakeAmount") == (42, ResponseStatus(ok=True))
+    assert requests == ["latest", hex(100)]
@@ -0,0 +1,26 @@
+"""
+Tests covering background receipt polling
+"""
+import pytest
+from hexbytes import HexBytes
+from web3.exceptions import TimeExhausted
+
+from telliot_core.contract.receipt_poller import ReceiptPoller
+from telliot_core.model.endpoints import RPCEndpoint
+from telliot_core.utils.response import ResponseStatus
+
+
+@pytest.mark.asyncio
+async def test_timeout_reports_effective_value():
+    """A per-transaction timeout is the one reported when it expires"""
+    node = RPCEndpoint(chain_id=80002, url="http://127.0.0.1:8545")
+
+    async def batch_request(calls):
+        return [(None, ResponseStatus(ok=True)) for _ in calls]
+
+    node.batch_request = batch_request
+    poller = ReceiptPoller(node, interval=0.01, timeout=360)
+
+    with pytest.raises(TimeExhausted, match="after 0.02 seconds"):
+        await poller.track(HexBytes("0x" + "ab" * 32), timeout=0.02)
+    assert poller.num_pending == 0
@@ -1,7 +1,12 @@
 """
 Tests covering Pytelliot rpc connection  utils.
 """
+import asyncio
+from contextlib import asynccontextmanager
+
+import aiohttp
 import pytest
+from aiohttp import web
 from brownie import chain
 from requests.exceptions import ConnectionError
 from requests.exceptions import HTTPError
@@ -53,3 +58,94 @@ def test_endpoint_list():
     # print(json.dumps(sl.get_state(), indent=2))
     ep11155111 = sl.find(chain_id=11155111)[0]
     assert ep11155111.network == "sepolia"
+
+
+@pytest.mark.asyncio
+async def test_batch_request():
+    """RPCEndpoint sends JSON-RPC calls as one batch and matches the responses"""
+    url = "http://127.0.0.1:8545"  # local Ganache node
+    endpt = RPCEndpoint(network=network, provider=provider, url=url)
+    endpt.connect()
+    chain.mine(10)
+
+    address = "0x0000000000000000000000000000000000000000"
+    results = await endpt.batch_request(
+        [
+            ("eth_blockNumber", []),
+            ("eth_getBalance", [address, "latest"]),
+            ("eth_notAMethod", []),
+        ]
+    )
+    assert len(results) == 3
+
+    block_number, status = results[0]
+    assert status.ok
+    assert int(block_number, 16) == endpt.web3.eth.block_number
+
+    balance, status = results[1]
+    assert status.ok
+    assert int(balance, 16) == endpt.web3.eth.get_balance(address)
+
+    _, status = results[2]
+    assert not status.ok
+
+
+@asynccontextmanager
+async def fake_node(handler):
+    """Serve a JSON-RPC handler on a local aiohttp server and yield its url"""
+    app = web.Application()
+    app.router.add_post("/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    try:
+        yield f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/"
+    finally:
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_batch_request_over_session():
+    """Batches sent over the aiohttp session are matched to calls by ID"""
+
+    async def handle(request):
+        messages = await request.json()
+        responses = []
+        for message in messages:
+            if message["method"] == "eth_blockNumber":
+                responses.append({"jsonrpc": "2.0", "id": message["id"], "result": "0x10"})
+            elif message["method"] == "eth_chainId":
+                responses.append({"jsonrpc": "2.0", "id": message["id"], "result": "0x1"})
+            else:
+                error = {"code": -32601, "message": "method not found"}
+                responses.append({"jsonrpc": "2.0", "id": message["id"], "error": error})
+        return web.json_response(responses[::-1])
+
+    async with fake_node(handle) as url, aiohttp.ClientSession() as session:
+        endpt = RPCEndpoint(network=network, provider=provider, url=url)
+        endpt.set_session(session)
+        results = await endpt.batch_request([("eth_blockNumber", []), ("eth_notAMethod", []), ("eth_chainId", [])])
+
+    assert [r for r, _ in results] == ["0x10", None, "0x1"]
+    assert [status.ok for _, status in results] == [True, False, True]
+    assert "method not found" in str(results[1][1].e)
+
+
+@pytest.mark.asyncio
+async def test_request_timeout():
+    """Native async requests give up after the endpoint timeout"""
+
+    async def handle(request):
+        await asyncio.sleep(1)
+        return web.json_response({"jsonrpc": "2.0", "id": 1, "result": "0x10"})
+
+    async with fake_node(handle) as url, aiohttp.ClientSession() as session:
+        endpt = RPCEndpoint(network=network, provider=provider, url=url, timeout=0.1)
+        endpt.set_session(session)
+        with pytest.raises(asyncio.TimeoutError):
+            await endpt.request("eth_blockNumber", [])
+
+        results = await endpt.batch_request([("eth_blockNumber", [])])
+        assert not results[0][1].ok
+        assert isinstance(results[0][1].e, asyncio.TimeoutError)